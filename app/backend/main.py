@@ -26,7 +26,8 @@ pa_pipeline = PAProcessingPipeline(send_cloud_logs=True)
 async def lifespan(_application: FastAPI) -> AsyncGenerator:
     # startup
     await init_beanie(db, document_models=[User], skip_indexes=True)
-    yield
+    async with pa_pipeline:
+        yield
     # shutdown
 
 
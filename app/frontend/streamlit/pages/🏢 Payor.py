@@ -4,14 +4,14 @@ import os
 import shutil
 import tempfile
 import zipfile
-from typing import List
+from typing import List, Optional
 
 import dotenv
 import streamlit as st
 from azure.core.credentials import AzureKeyCredential
 from azure.search.documents import SearchClient
 
-from src.aoai.aoai_helper import AzureOpenAIManager
+from src.aoai.aoai_helper import AzureOpenAIManager, LLMResult
 from src.cosmosdb.cosmosmongodb_helper import CosmosDBMongoCoreManager
 from src.entraid.generate_id import generate_unique_id
 from src.pipeline.paprocessing.run import PAProcessingPipeline
@@ -320,7 +320,7 @@ async def generate_ai_response(
     image_paths: List[str],
     stream=False,
     response_format="json_object",
-) -> dict:
+) -> Optional[LLMResult]:
     try:
         logger.info("Generating AI response...")
         logger.info(f"User Prompt: {user_prompt}")
@@ -345,7 +345,7 @@ async def generate_ai_response(
 
     except Exception as e:
         logger.error(f"Error generating AI response: {e}")
-        return {}
+        return None
 
 
 async def run_pipeline_with_spinner(uploaded_files, use_o1):
@@ -354,11 +354,10 @@ async def run_pipeline_with_spinner(uploaded_files, use_o1):
         if use_o1:
             st.toast("Using the o1 model for final determination.", icon="🔥")
 
-        pa_processing = PAProcessingPipeline(send_cloud_logs=True)
-
-        await pa_processing.run(
-            uploaded_files, streamlit=True, caseId=caseID, use_o1=use_o1
-        )
+        async with PAProcessingPipeline(send_cloud_logs=True) as pa_processing:
+            await pa_processing.run(
+                uploaded_files, streamlit=True, caseId=caseID, use_o1=use_o1
+            )
 
     last_key = next(iter(pa_processing.results.keys()))
 
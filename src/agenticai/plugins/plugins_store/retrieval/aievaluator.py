@@ -174,7 +174,7 @@ class AIPolicyEvaluationPlugin:
                 max_tokens=3000,
                 temperature=0,
             )
-            raw_output = response["response"].strip()
+            raw_output = response.response.strip()
             self.logger.debug(f"Raw AI output: {raw_output}")
             self.logger.info("Search results evaluated successfully.")
             return raw_output
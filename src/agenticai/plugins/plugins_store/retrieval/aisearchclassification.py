@@ -135,7 +135,7 @@ class AIQueryClassificationPlugin:
                 max_tokens=10,
                 temperature=0,  # Ensuring deterministic responses
             )
-            classification = response["response"].strip().lower()
+            classification = response.response.strip().lower()
 
             if classification not in {"keyword", "semantic", "hybrid"}:
                 self.logger.warning(
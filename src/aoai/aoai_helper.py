@@ -2,23 +2,46 @@
 `azure_openai.py` is a module for managing interactions with the Azure OpenAI API within our application.
 
 """
+import asyncio
 import base64
+import importlib.util
 import json
 import mimetypes
 import os
 import time
 import traceback
+import weakref
+from dataclasses import dataclass, field
 from io import BytesIO
-from typing import Any, Dict, List, Literal, Optional, Union
-
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import httpx
 import matplotlib.image as mpimg
 import matplotlib.pyplot as plt
 import openai
 import requests
 from azure.identity import DefaultAzureCredential, get_bearer_token_provider
 from dotenv import load_dotenv
-from openai import AzureOpenAI
-
+from openai import AsyncAzureOpenAI, AzureOpenAI
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+from src.aoai.batch_helper import AzureOpenAIBatchQueue
 from src.aoai.tokenizer import AzureOpenAITokenizer
 from utils.ml_logging import get_logger
 
@@ -28,6 +51,307 @@ load_dotenv()
 # Set up logger
 logger = get_logger()
 
+# Initial and maximum number of chat completion requests in flight at once per deployment
+# (per event loop), shared by every AzureOpenAIManager. The limit adapts between 1 and the
+# maximum as the deployment accepts or throttles requests (see `AIMDLimiter`)
+PA_LLM_CONCURRENCY = int(os.getenv("PA_LLM_CONCURRENCY", "10"))
+PA_LLM_MAX_CONCURRENCY = int(os.getenv("PA_LLM_MAX_CONCURRENCY", "50"))
+# Connection pool size of the httpx client shared by every AzureOpenAIManager
+PA_HTTPX_MAX = int(os.getenv("PA_HTTPX_MAX", "2000"))
+# Idle seconds before a pooled connection is dropped; longer than httpx's 5s default so
+# connections survive the gaps between pipeline steps instead of paying TLS again
+PA_HTTPX_KEEPALIVE_EXPIRY = float(os.getenv("PA_HTTPX_KEEPALIVE_EXPIRY", "30"))
+# HTTP/2 multiplexes concurrent requests over a few connections; needs the `h2` package
+PA_HTTPX_HTTP2 = importlib.util.find_spec("h2") is not None
+# Upper bound in seconds on a single chat completion request, and retries after a timeout,
+# connection error, 429 or 5xx. Long generations (combined extraction, o1) need well over 20s
+PA_LLM_REQUEST_TIMEOUT = float(os.getenv("PA_LLM_REQUEST_TIMEOUT", "120"))
+PA_LLM_MAX_RETRIES = int(os.getenv("PA_LLM_MAX_RETRIES", "2"))
+# Comma-separated Azure OpenAI endpoints (e.g. one per region) serving the same deployment
+# names. Async chat requests are spread across them by free capacity
+PA_AOAI_ENDPOINTS = [
+    endpoint.strip()
+    for endpoint in os.getenv("PA_AOAI_ENDPOINTS", "").split(",")
+    if endpoint.strip()
+]
+# Comma-separated API keys of the PA_AOAI_ENDPOINTS, in the same order. Separate Azure
+# OpenAI resources have separate keys; leave unset for Entra ID auth or a shared gateway
+PA_AOAI_KEYS = [
+    key.strip() for key in os.getenv("PA_AOAI_KEYS", "").split(",") if key.strip()
+]
+# Seconds of idleness after which a deployment is pinged with a one-token completion, so
+# the next real request does not pay the cold-start penalty; 0 disables the pings.
+# Started by `AzureOpenAIManager.start_keepalive`
+PA_AOAI_KEEPALIVE_SECONDS = float(os.getenv("PA_AOAI_KEEPALIVE_SECONDS", "0"))
+
+# HTTP statuses Azure OpenAI returns when a deployment is over its RPM/TPM quota or overloaded
+_THROTTLE_STATUS_CODES = (429, 503)
+
+_LLM_LIMITERS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str], AIMDLimiter]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+_HTTP_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_shared_http_client() -> httpx.AsyncClient:
+    """
+    Return the httpx client shared by every AzureOpenAIManager on the running event loop.
+
+    One pool for all managers avoids each client queueing behind the stock 100-connection
+    limit. Pools hold loop-bound sockets, so one is kept per loop.
+    """
+    loop = asyncio.get_running_loop()
+    http_client = _HTTP_CLIENTS.get(loop)
+    if http_client is None or http_client.is_closed:
+        http_client = httpx.AsyncClient(
+            http2=PA_HTTPX_HTTP2,
+            limits=httpx.Limits(
+                max_connections=PA_HTTPX_MAX,
+                max_keepalive_connections=min(1500, PA_HTTPX_MAX),
+                keepalive_expiry=PA_HTTPX_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(120.0),
+        )
+        _HTTP_CLIENTS[loop] = http_client
+    return http_client
+
+
+async def aclose_shared_http_client() -> None:
+    """
+    Close the httpx client shared on the running event loop, if one was created.
+
+    Managers on the loop open a new pool on their next request.
+    """
+    http_client = _HTTP_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if http_client is not None:
+        await http_client.aclose()
+
+
+class AIMDLimiter:
+    """
+    Concurrency limiter that adapts to a deployment's quota with additive-increase /
+    multiplicative-decrease (AIMD).
+
+    Every successful request raises the budget by ``alpha / budget`` (about ``alpha`` per
+    full round of requests); every throttled request (HTTP 429/503) multiplies it by
+    ``beta``. When Azure reports ``x-ratelimit-remaining-requests``, the budget is also
+    capped at the requests left in the current window.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = PA_LLM_CONCURRENCY,
+        min_limit: int = 1,
+        max_limit: int = PA_LLM_MAX_CONCURRENCY,
+        alpha: float = 0.5,
+        beta: float = 0.5,
+    ):
+        """
+        :param initial_limit: Concurrency budget to start from.
+        :param min_limit: Lowest budget the limiter shrinks to.
+        :param max_limit: Highest budget the limiter grows to.
+        :param alpha: Additive increase per round of successful requests.
+        :param beta: Multiplicative decrease factor applied on throttling.
+        """
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.alpha = alpha
+        self.beta = beta
+        self._budget = float(min(max(initial_limit, min_limit), self.max_limit))
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+        # Monotonic time of the last request start, read by the keep-alive pings
+        self.last_acquired = 0.0
+
+    @property
+    def limit(self) -> int:
+        """
+        The number of requests currently allowed in flight.
+        """
+        return max(self.min_limit, int(self._budget))
+
+    @property
+    def in_flight(self) -> int:
+        """
+        The number of requests currently holding a slot.
+        """
+        return self._in_flight
+
+    @property
+    def headroom(self) -> int:
+        """
+        The number of request slots free right now (negative if the limit just shrank).
+        """
+        return self.limit - self._in_flight
+
+    async def acquire(self) -> None:
+        """
+        Wait until a request slot is free and take it.
+        """
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+            self.last_acquired = time.monotonic()
+
+    async def release(
+        self, ok: bool, headers: Optional[Mapping[str, str]] = None
+    ) -> None:
+        """
+        Return a request slot and adapt the budget to the outcome.
+
+        :param ok: False if the request was throttled (HTTP 429/503), True otherwise.
+        :param headers: Response headers, used to read ``x-ratelimit-remaining-requests``.
+        """
+        async with self._condition:
+            self._in_flight -= 1
+            if ok:
+                self._budget = min(
+                    self.max_limit, self._budget + self.alpha / self._budget
+                )
+            else:
+                self._budget = max(self.min_limit, self._budget * self.beta)
+                logger.warning(
+                    f"Azure OpenAI throttled the request; concurrency limit lowered to {self.limit}."
+                )
+            remaining = (headers or {}).get("x-ratelimit-remaining-requests")
+            if remaining is not None and remaining.isdigit():
+                self._budget = max(
+                    self.min_limit, min(self._budget, float(remaining) or 1.0)
+                )
+            self._condition.notify_all()
+
+
+def _is_retryable_llm_error(exception: BaseException) -> bool:
+    """
+    Return True for timeouts, connection errors, throttling (429) and server-side (5xx) errors.
+
+    Other status errors (e.g. 400 for an invalid or oversize request) fail fast.
+    """
+    if isinstance(exception, (asyncio.TimeoutError, openai.APIConnectionError)):
+        return True
+    return isinstance(exception, openai.APIStatusError) and (
+        exception.status_code == 429 or exception.status_code >= 500
+    )
+
+
+def _is_throttled(exception: BaseException) -> bool:
+    """
+    Return True if the request was rejected because the deployment is over quota.
+    """
+    return (
+        isinstance(exception, openai.APIStatusError)
+        and exception.status_code in _THROTTLE_STATUS_CODES
+    )
+
+
+def _get_llm_limiter(
+    deployment: Optional[str], endpoint: Optional[str] = None
+) -> AIMDLimiter:
+    """
+    Return the AIMD limiter of a deployment for the running event loop.
+
+    Each deployment has its own quota, so limiters are kept per endpoint and deployment
+    name. They wrap an ``asyncio.Condition``, which is bound to the loop it is first
+    awaited on, so one set is kept per loop to stay safe across repeated ``asyncio.run``
+    calls (e.g. Streamlit reruns).
+    """
+    loop = asyncio.get_running_loop()
+    limiters = _LLM_LIMITERS.setdefault(loop, {})
+    key = (endpoint or "", deployment or "")
+    limiter = limiters.get(key)
+    if limiter is None:
+        limiter = AIMDLimiter()
+        limiters[key] = limiter
+    return limiter
+
+
+class _LimitedStream:
+    """
+    A streamed chat completion that keeps its limiter slot until the stream ends.
+
+    The slot is released once the stream is exhausted, fails or is closed. Each chunk
+    must arrive within `timeout` seconds; a stalled stream raises ``asyncio.TimeoutError``
+    and counts against the limiter budget.
+    """
+
+    def __init__(
+        self,
+        stream: openai.AsyncStream,
+        limiter: AIMDLimiter,
+        headers: Optional[Mapping[str, str]],
+        timeout: float,
+    ):
+        self._stream = stream
+        self._iterator = stream.__aiter__()
+        self._limiter = limiter
+        self._headers = headers
+        self._timeout = timeout
+        self._released = False
+
+    def __aiter__(self) -> "_LimitedStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._released:
+            raise StopAsyncIteration
+        try:
+            return await asyncio.wait_for(
+                self._iterator.__anext__(), timeout=self._timeout
+            )
+        except StopAsyncIteration:
+            await self._release(True)
+            raise
+        except asyncio.TimeoutError:
+            await self.close(ok=False)
+            raise
+        except openai.APIStatusError as e:
+            await self.close(ok=not _is_throttled(e))
+            raise
+        except BaseException:
+            await self.close()
+            raise
+
+    async def __aenter__(self) -> "_LimitedStream":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self, ok: bool = True) -> None:
+        """
+        Close the underlying response and return the limiter slot, once.
+        """
+        if self._released:
+            return
+        try:
+            await self._stream.close()
+        finally:
+            await self._release(ok)
+
+    async def _release(self, ok: bool) -> None:
+        if not self._released:
+            self._released = True
+            await self._limiter.release(ok, self._headers)
+
+
+@dataclass(slots=True)
+class LLMResult:
+    """
+    Result of a chat completion made by `AzureOpenAIManager`.
+
+    `response` is the assistant text, or the parsed object when a JSON response was
+    requested and could be decoded. `usage` holds the token counts reported by the service;
+    it is empty for streamed responses.
+    """
+
+    response: Any
+    conversation_history: List[Dict[str, Any]]
+    usage: Dict[str, Any] = field(default_factory=dict)
+
 
 class AzureOpenAIManager:
     """
@@ -47,6 +371,11 @@ class AzureOpenAIManager:
         embedding_model_name: Optional[str] = None,
         dalle_model_name: Optional[str] = None,
         whisper_model_name: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        request_timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        azure_endpoints: Optional[List[str]] = None,
+        api_keys: Optional[List[str]] = None,
     ):
         """
         Initializes the Azure OpenAI Manager with necessary configurations.
@@ -58,6 +387,11 @@ class AzureOpenAIManager:
         :param chat_model_name: The Chat Model Name. If not provided, it will be fetched from the environment variable "AZURE_AOAI_CHAT_MODEL_NAME".
         :param embedding_model_name: The Embedding Model Deployment ID. If not provided, it will be fetched from the environment variable "AZURE_AOAI_EMBEDDING_DEPLOYMENT_ID".
         :param dalle_model_name: The DALL-E Model Deployment ID. If not provided, it will be fetched from the environment variable "AZURE_AOAI_DALLE_MODEL_DEPLOYMENT_ID".
+        :param http_client: httpx client for the async chat methods. Defaults to a connection pool shared by every manager on the running event loop.
+        :param request_timeout: Seconds after which an async chat request is abandoned and retried. Defaults to the "PA_LLM_REQUEST_TIMEOUT" environment variable (120).
+        :param max_retries: Retries of an async chat request after a timeout, connection error, 429 or 5xx. Defaults to the "PA_LLM_MAX_RETRIES" environment variable (2).
+        :param azure_endpoints: Endpoints the async chat methods balance requests across. Defaults to `azure_endpoint` if given, else the "PA_AOAI_ENDPOINTS" environment variable, else the single endpoint. Every endpoint must serve the same deployment names.
+        :param api_keys: API keys of `azure_endpoints`, in the same order. Defaults to the "PA_AOAI_KEYS" environment variable when the endpoints come from "PA_AOAI_ENDPOINTS"; without them every endpoint uses `api_key`, or Entra ID if there is none.
 
         """
         self.api_key = api_key or os.getenv("AZURE_OPENAI_KEY")
@@ -65,7 +399,28 @@ class AzureOpenAIManager:
         self.api_version = (
             api_version or os.getenv("AZURE_OPENAI_API_VERSION") or "2024-02-01"
         )
-        self.azure_endpoint = azure_endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
+        self.azure_endpoint = (
+            azure_endpoint
+            or os.getenv("AZURE_OPENAI_ENDPOINT")
+            or (azure_endpoints or PA_AOAI_ENDPOINTS or [None])[0]
+        )
+        self.azure_endpoints = (
+            azure_endpoints
+            or (None if azure_endpoint else PA_AOAI_ENDPOINTS)
+            or [self.azure_endpoint]
+        )
+        api_keys = api_keys or (
+            PA_AOAI_KEYS if self.azure_endpoints == PA_AOAI_ENDPOINTS else None
+        )
+        if api_keys and len(api_keys) != len(self.azure_endpoints):
+            raise ValueError(
+                f"Got {len(api_keys)} API keys for {len(self.azure_endpoints)} Azure OpenAI "
+                "endpoints; give one key per endpoint, in the same order."
+            )
+        self._endpoint_api_keys: Dict[str, str] = dict(
+            zip(self.azure_endpoints, api_keys or [])
+        )
+        self.api_key = self._endpoint_api_keys.get(self.azure_endpoint) or self.api_key
         self.completion_model_name = completion_model_name or os.getenv(
             "AZURE_AOAI_COMPLETION_MODEL_DEPLOYMENT_ID"
         )
@@ -88,17 +443,31 @@ class AzureOpenAIManager:
             token_provider = get_bearer_token_provider(
                 DefaultAzureCredential(), "https://cognitiveservices.azure.com/.default"
             )
-            self.openai_client = AzureOpenAI(
-                api_version=self.api_version,
-                azure_endpoint=self.azure_endpoint,
-                azure_ad_token_provider=token_provider,
-            )
+            self._client_kwargs = {"azure_ad_token_provider": token_provider}
         else:
-            self.openai_client = AzureOpenAI(
-                api_version=self.api_version,
-                azure_endpoint=self.azure_endpoint,
-                api_key=self.api_key,
-            )
+            self._client_kwargs = {"api_key": self.api_key}
+            if len(self.azure_endpoints) > 1 and not self._endpoint_api_keys:
+                logger.warning(
+                    f"All {len(self.azure_endpoints)} Azure OpenAI endpoints share one API key, "
+                    "which only works behind a shared gateway. Set PA_AOAI_KEYS, or unset "
+                    "AZURE_OPENAI_KEY to use Entra ID."
+                )
+        self.openai_client = AzureOpenAI(
+            api_version=self.api_version,
+            azure_endpoint=self.azure_endpoint,
+            **self._client_kwargs,
+        )
+
+        # The async client is built lazily, on first use inside an event loop
+        self.http_client = http_client
+        self.request_timeout = request_timeout or PA_LLM_REQUEST_TIMEOUT
+        self.max_retries = PA_LLM_MAX_RETRIES if max_retries is None else max_retries
+        self._async_openai_clients: Dict[Tuple[str, str], AsyncAzureOpenAI] = {}
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._endpoint_cursor = 0
+        # When set, async chat completions are queued for the Batch API instead of sent
+        self.batch_queue: Optional[AzureOpenAIBatchQueue] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
 
         self.tokenizer = AzureOpenAITokenizer()
 
@@ -115,6 +484,134 @@ class AzureOpenAIManager:
         """
         return self.openai_client
 
+    def get_async_azure_openai_client(
+        self, endpoint: Optional[str] = None, api_version: Optional[str] = None
+    ) -> AsyncAzureOpenAI:
+        """
+        Returns the async OpenAI client used by the chat methods, creating it on first use.
+
+        The clients are rebuilt if requested from a different event loop, since their
+        connection pool is tied to the loop it was created on, or after the pool has been
+        closed.
+
+        :param endpoint: The endpoint to connect to. Defaults to the first of `azure_endpoints`.
+        :param api_version: The API version to use. Defaults to `api_version`.
+        :return: The AsyncAzureOpenAI client.
+        """
+        endpoint = endpoint or self.azure_endpoints[0]
+        api_version = api_version or self.api_version
+        loop = asyncio.get_running_loop()
+        if self._async_client_loop is not loop:
+            self._async_openai_clients = {}
+            self._async_client_loop = loop
+        client = self._async_openai_clients.get((endpoint, api_version))
+        if client is None or client.is_closed():
+            client = AsyncAzureOpenAI(
+                api_version=api_version,
+                azure_endpoint=endpoint,
+                http_client=self.http_client or _get_shared_http_client(),
+                timeout=httpx.Timeout(self.request_timeout, connect=5.0),
+                # Retries are handled by `_create_chat_completion`, outside the limiter slot
+                max_retries=0,
+                **self._get_client_kwargs(endpoint),
+            )
+            self._async_openai_clients[endpoint, api_version] = client
+        return client
+
+    def _get_client_kwargs(self, endpoint: str) -> Dict[str, Any]:
+        """
+        Returns the credential arguments for a client of `endpoint`: its own API key if one
+        was given, else the manager's key or Entra ID token provider.
+        """
+        api_key = self._endpoint_api_keys.get(endpoint)
+        return {"api_key": api_key} if api_key else self._client_kwargs
+
+    def start_keepalive(
+        self,
+        interval: Optional[float] = None,
+        deployments: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Start pinging idle deployments in the background on the running event loop.
+
+        Does nothing if the pings are already running or the interval is 0.
+
+        :param interval: Idle seconds before a deployment is pinged. Defaults to the "PA_AOAI_KEEPALIVE_SECONDS" environment variable (0, disabled).
+        :param deployments: Deployments to keep warm on every endpoint. Defaults to the chat deployment.
+        """
+        interval = PA_AOAI_KEEPALIVE_SECONDS if interval is None else interval
+        if interval <= 0 or (
+            self._keepalive_task is not None and not self._keepalive_task.done()
+        ):
+            return
+        self._keepalive_task = asyncio.create_task(
+            self._keepalive(interval, deployments or [self.chat_model_name])
+        )
+
+    async def _keepalive(self, interval: float, deployments: List[str]) -> None:
+        """
+        Send a one-token completion to each endpoint and deployment that has been idle for
+        `interval` seconds.
+
+        Pings are sent one at a time, skip endpoints with requests in flight and bypass the
+        concurrency limiter, so they never hold a slot a real request could use.
+        """
+        while True:
+            await asyncio.sleep(interval / 2)
+            for deployment in deployments:
+                for endpoint in self.azure_endpoints:
+                    limiter = _get_llm_limiter(deployment, endpoint)
+                    if (
+                        limiter.in_flight
+                        or time.monotonic() - limiter.last_acquired < interval
+                    ):
+                        continue
+                    limiter.last_acquired = time.monotonic()
+                    client = self.get_async_azure_openai_client(endpoint)
+                    try:
+                        await asyncio.wait_for(
+                            client.chat.completions.create(
+                                model=deployment,
+                                messages=[{"role": "user", "content": "."}],
+                                max_tokens=1,
+                            ),
+                            timeout=self.request_timeout,
+                        )
+                    except Exception as e:
+                        logger.debug(f"Keep-alive ping to {deployment} failed: {e!r}")
+
+    async def aclose(self) -> None:
+        """
+        Stop the keep-alive pings, if running. The shared connection pool is closed
+        separately, by `aclose_shared_http_client`.
+        """
+        task, self._keepalive_task = self._keepalive_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def _select_endpoint(self, model: str, exclude: Optional[Set[str]] = None) -> str:
+        """
+        Pick the endpoint with the most free request slots for `model`, rotating between
+        endpoints that are equally free.
+
+        :param model: The deployment the request is for.
+        :param exclude: Endpoints to avoid, e.g. ones that just throttled this request. Ignored when it covers every endpoint.
+        :return: The endpoint to send the request to.
+        """
+        candidates = [e for e in self.azure_endpoints if e not in (exclude or ())]
+        candidates = candidates or self.azure_endpoints
+        if len(candidates) == 1:
+            return candidates[0]
+        self._endpoint_cursor = (self._endpoint_cursor + 1) % len(candidates)
+        rotated = (
+            candidates[self._endpoint_cursor :] + candidates[: self._endpoint_cursor]
+        )
+        return max(rotated, key=lambda e: _get_llm_limiter(model, e).headroom)
+
     def _validate_api_configurations(self):
         """
         Validates if all necessary configurations are set.
@@ -251,6 +748,98 @@ class AzureOpenAIManager:
             logger.error(f"Traceback: {traceback.format_exc()}")
             return None, None
 
+    async def _create_chat_completion(
+        self, model: str, max_retries: Optional[int] = None, **kwargs
+    ) -> Any:
+        """
+        Creates a chat completion, retrying timeouts, connection errors, 429s and 5xx errors
+        with exponential backoff and jitter.
+
+        Non-streaming requests go to `batch_queue` instead when it is set.
+
+        Each attempt goes to the endpoint with the most free capacity. A throttled request is
+        moved to another endpoint straight away, and only backs off once every endpoint has
+        throttled it.
+
+        :param model: The deployment to send the request to.
+        :param max_retries: Overrides `max_retries` for this request.
+        :param kwargs: Keyword arguments forwarded to ``chat.completions.create``.
+        :return: The parsed ChatCompletion, or a `_LimitedStream` when streaming.
+        """
+        if self.batch_queue is not None and not kwargs.get("stream"):
+            return await self.batch_queue.submit(model, **kwargs)
+
+        max_retries = self.max_retries if max_retries is None else max_retries
+        throttled: Set[str] = set()
+        backoff = wait_exponential_jitter(initial=1, max=30)
+
+        def wait(retry_state) -> float:
+            if len(throttled) < len(self.azure_endpoints) and _is_throttled(
+                retry_state.outcome.exception()
+            ):
+                return 0
+            return backoff(retry_state)
+
+        async for attempt in AsyncRetrying(
+            retry=retry_if_exception(_is_retryable_llm_error),
+            wait=wait,
+            stop=stop_after_attempt(max_retries + len(self.azure_endpoints)),
+            before_sleep=lambda retry_state: logger.warning(
+                f"Transient Azure OpenAI error, retrying (attempt {retry_state.attempt_number}): "
+                f"{retry_state.outcome.exception()!r}"
+            ),
+            reraise=True,
+        ):
+            with attempt:
+                endpoint = self._select_endpoint(model, exclude=throttled)
+                try:
+                    return await self._create_chat_completion_once(
+                        model, endpoint, **kwargs
+                    )
+                except openai.APIStatusError as e:
+                    if _is_throttled(e):
+                        throttled.add(endpoint)
+                    raise
+
+    async def _create_chat_completion_once(
+        self, model: str, endpoint: Optional[str] = None, **kwargs
+    ) -> Any:
+        """
+        Sends one chat completion request under the deployment's AIMD concurrency limit.
+
+        The request is bounded by `request_timeout`. The raw response headers feed the
+        limiter; throttled (HTTP 429/503) and timed-out requests shrink its budget.
+        A streamed response is returned as a `_LimitedStream`, which holds the slot until
+        the stream is consumed or closed and bounds the wait for each chunk the same way.
+        """
+        client = self.get_async_azure_openai_client(endpoint)
+        limiter = _get_llm_limiter(model, endpoint)
+        await limiter.acquire()
+        ok, headers, streaming = True, None, False
+        try:
+            raw_response = await asyncio.wait_for(
+                client.chat.completions.with_raw_response.create(model=model, **kwargs),
+                timeout=self.request_timeout,
+            )
+            headers = raw_response.headers
+            response = raw_response.parse()
+            if kwargs.get("stream"):
+                streaming = True
+                return _LimitedStream(
+                    response, limiter, headers, timeout=self.request_timeout
+                )
+            return response
+        except openai.APIStatusError as e:
+            ok = not _is_throttled(e)
+            headers = e.response.headers
+            raise
+        except asyncio.TimeoutError:
+            ok = False
+            raise
+        finally:
+            if not streaming:
+                await limiter.release(ok, headers)
+
     async def generate_chat_response_o1(
         self,
         query: str,
@@ -258,8 +847,11 @@ class AzureOpenAIManager:
         max_completion_tokens: int = 5000,
         stream: bool = False,
         model: str = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_01", "o1-preview"),
+        on_token: Optional[Callable[[str], Any]] = None,
+        raise_transient: bool = False,
+        max_retries: Optional[int] = None,
         **kwargs,
-    ) -> Optional[Union[str, Dict[str, Any]]]:
+    ) -> Optional[LLMResult]:
         """
         Generates a text response using the o1-preview or o1-mini models, considering the specific requirements and limitations of these models.
 
@@ -268,7 +860,11 @@ class AzureOpenAIManager:
         :param max_completion_tokens: Maximum number of tokens to generate. Defaults to 5000.
         :param stream: Whether to stream the response. Defaults to False.
         :param model: The model to use for generating the response. Defaults to "o1-preview".
-        :return: The generated text response as a string if response_format is "text", or a dictionary containing the response and conversation history if response_format is "json_object". Returns None if an error occurs.
+        :param on_token: Called with each content delta when streaming. Defaults to printing to stdout.
+        :param raise_transient: Re-raise timeouts, connection errors, 429s and 5xx errors once the per-request retries are used up, so the caller can retry the whole call. Defaults to False.
+        :param max_retries: Overrides the manager's `max_retries` for this call, e.g. 0 when the caller retries the call itself. Defaults to None.
+        :return: An LLMResult with the response text, the conversation history and the token usage. Returns None if an error occurs.
+        :raises openai.BadRequestError: If the prompt exceeds the model's context length.
         """
         start_time = time.time()
         logger.info(
@@ -283,7 +879,8 @@ class AzureOpenAIManager:
                 f"Sending request to Azure OpenAI at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(time.time()))}"
             )
 
-            response = self.openai_client.chat.completions.create(
+            response = await self._create_chat_completion(
+                max_retries=max_retries,
                 model=model,
                 messages=messages_for_api,
                 # max_completion_tokens=max_completion_tokens,
@@ -291,19 +888,24 @@ class AzureOpenAIManager:
                 **kwargs,
             )
 
+            usage = {}
             if stream:
                 response_content = ""
-                for event in response:
-                    if event.choices:
-                        event_text = event.choices[0].delta
-                        if event_text is None or event_text.content is None:
-                            continue
-                        print(event_text.content, end="", flush=True)
-                        response_content += event_text.content
-                        time.sleep(0.001)  # Maintain minimal sleep to reduce latency
+                async with response:
+                    async for event in response:
+                        if event.choices:
+                            event_text = event.choices[0].delta
+                            if event_text is None or event_text.content is None:
+                                continue
+                            if on_token is None:
+                                print(event_text.content, end="", flush=True)
+                            else:
+                                on_token(event_text.content)
+                            response_content += event_text.content
             else:
                 response_content = response.choices[0].message.content
                 logger.info(f"Model_used: {response.model}")
+                usage = response.usage.model_dump() if response.usage else {}
 
             conversation_history.append(user_message)
             conversation_history.append(
@@ -316,24 +918,26 @@ class AzureOpenAIManager:
                 f"Function generate_chat_response_o1 finished at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(end_time))} (Duration: {duration:.2f} seconds)"
             )
 
-            return {
-                "response": response_content,
-                "conversation_history": conversation_history,
-            }
+            return LLMResult(response_content, conversation_history, usage)
 
         except openai.APIConnectionError as e:
             logger.error("API Connection Error: The server could not be reached.")
             logger.error(f"Error details: {e}")
+            if raise_transient:
+                raise
             logger.error(f"Traceback: {traceback.format_exc()}")
             return None
         except Exception as e:
-            error_message = str(e)
-            if "maximum context length" in error_message:
-                logger.warning(
-                    "Context length exceeded, reducing conversation history and retrying."
-                )
-                logger.warning(f"Error details: {e}")
-                return "maximum context length"
+            if (
+                isinstance(e, openai.BadRequestError)
+                and e.code == "context_length_exceeded"
+            ):
+                # The caller is expected to shorten the prompt and retry
+                logger.warning(f"Context length exceeded: {e}")
+                raise
+            if raise_transient and _is_retryable_llm_error(e):
+                logger.warning(f"Transient Azure OpenAI error: {e!r}")
+                raise
             logger.error(
                 "Unexpected Error: An unexpected error occurred during contextual response generation."
             )
@@ -356,8 +960,11 @@ class AzureOpenAIManager:
         tools: List[Dict[str, Any]] = None,
         tool_choice: Union[str, Dict[str, Any]] = None,
         response_format: Union[str, Dict[str, Any]] = "text",
+        on_token: Optional[Callable[[str], Any]] = None,
+        raise_transient: bool = False,
+        max_retries: Optional[int] = None,
         **kwargs,
-    ) -> Optional[Union[str, Dict[str, Any]]]:
+    ) -> Optional[LLMResult]:
         """
         Generates a text response considering the conversation history.
 
@@ -376,7 +983,11 @@ class AzureOpenAIManager:
         :param response_format: Specifies the format of the response. Can be:
             - A string: "text" or "json_object".
             - A dictionary specifying a custom response format, including a JSON schema when needed.
-        :return: The generated text response as a string if response_format is "text", or a dictionary containing the response and conversation history if response_format is "json_object". Returns None if an error occurs.
+        :param on_token: Called with each content delta when streaming. Defaults to printing to stdout.
+        :param raise_transient: Re-raise timeouts, connection errors, 429s and 5xx errors once the per-request retries are used up, so the caller can retry the whole call. Defaults to False.
+        :param max_retries: Overrides the manager's `max_retries` for this call, e.g. 0 when the caller retries the call itself. Defaults to None.
+        :return: An LLMResult with the response (parsed if response_format is "json_object"), the conversation history and the token usage. Returns None if an error occurs.
+        :raises openai.BadRequestError: If the prompt exceeds the model's context length.
         """
         start_time = time.time()
         logger.info(
@@ -456,7 +1067,8 @@ class AzureOpenAIManager:
                     "Invalid response_format. Must be a string or a dictionary."
                 )
 
-            response = self.openai_client.chat.completions.create(
+            response = await self._create_chat_completion(
+                max_retries=max_retries,
                 model=self.chat_model_name,
                 messages=messages_for_api,
                 temperature=temperature,
@@ -470,18 +1082,23 @@ class AzureOpenAIManager:
                 **kwargs,
             )
 
+            usage = {}
             if stream:
                 response_content = ""
-                for event in response:
-                    if event.choices:
-                        event_text = event.choices[0].delta
-                        if event_text is None or event_text.content is None:
-                            continue
-                        print(event_text.content, end="", flush=True)
-                        response_content += event_text.content
-                        time.sleep(0.001)  # Maintain minimal sleep to reduce latency
+                async with response:
+                    async for event in response:
+                        if event.choices:
+                            event_text = event.choices[0].delta
+                            if event_text is None or event_text.content is None:
+                                continue
+                            if on_token is None:
+                                print(event_text.content, end="", flush=True)
+                            else:
+                                on_token(event_text.content)
+                            response_content += event_text.content
             else:
                 response_content = response.choices[0].message.content
+                usage = response.usage.model_dump() if response.usage else {}
 
             conversation_history.append(user_message)
             conversation_history.append(
@@ -497,35 +1114,29 @@ class AzureOpenAIManager:
             if isinstance(response_format, str) and response_format == "json_object":
                 try:
                     parsed_response = json.loads(response_content)
-                    return {
-                        "response": parsed_response,
-                        "conversation_history": conversation_history,
-                    }
+                    return LLMResult(parsed_response, conversation_history, usage)
                 except json.JSONDecodeError as e:
                     logger.error(f"Failed to parse assistant's response as JSON: {e}")
-                    return {
-                        "response": response_content,
-                        "conversation_history": conversation_history,
-                    }
-            else:
-                return {
-                    "response": response_content,
-                    "conversation_history": conversation_history,
-                }
+            return LLMResult(response_content, conversation_history, usage)
 
         except openai.APIConnectionError as e:
             logger.error("API Connection Error: The server could not be reached.")
             logger.error(f"Error details: {e}")
+            if raise_transient:
+                raise
             logger.error(f"Traceback: {traceback.format_exc()}")
             return None
         except Exception as e:
-            error_message = str(e)
-            if "maximum context length" in error_message:
-                logger.warning(
-                    "Context length exceeded, reducing conversation history and retrying."
-                )
-                logger.warning(f"Error details: {e}")
-                return "maximum context length"
+            if (
+                isinstance(e, openai.BadRequestError)
+                and e.code == "context_length_exceeded"
+            ):
+                # The caller is expected to shorten the prompt and retry
+                logger.warning(f"Context length exceeded: {e}")
+                raise
+            if raise_transient and _is_retryable_llm_error(e):
+                logger.warning(f"Transient Azure OpenAI error: {e!r}")
+                raise
             logger.error(
                 "Unexpected Error: An unexpected error occurred during contextual response generation."
             )
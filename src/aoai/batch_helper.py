@@ -0,0 +1,187 @@
+"""
+`batch_helper.py` is a module that collects chat completion requests and sends them through the Azure OpenAI Batch API.
+"""
+
+import asyncio
+import json
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from openai import AsyncAzureOpenAI
+from openai.types.chat import ChatCompletion
+
+from utils.ml_logging import get_logger
+
+# Set up logger
+logger = get_logger()
+
+# Batch statuses after which no more results will be written
+_TERMINAL_BATCH_STATUSES = ("completed", "failed", "expired", "cancelled")
+# Statuses whose output and error files hold per-request results (expired jobs keep the
+# requests that finished inside the completion window)
+_RESULT_BATCH_STATUSES = ("completed", "expired")
+
+
+class AzureOpenAIBatchQueue:
+    """
+    Collects chat completion requests and submits them together as Azure OpenAI Batch jobs.
+
+    Each `submit` call waits until its result is available. Requests arriving within `window`
+    seconds of each other go into the same job, so concurrently processed cases share one
+    job per pipeline stage. Batch jobs need a Global Batch deployment and API version
+    2024-07-01-preview or later.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], AsyncAzureOpenAI],
+        deployment: Optional[str] = None,
+        window: float = 10.0,
+        max_requests: int = 50000,
+        poll_initial: float = 30.0,
+        poll_max: float = 600.0,
+    ):
+        """
+        :param client_factory: Returns the async client used to upload files and manage jobs.
+        :param deployment: Global Batch deployment to run the requests on. Defaults to the model of each request.
+        :param window: Seconds without a new request after which the queued requests are submitted.
+        :param max_requests: Queued requests that trigger a submission without waiting for the window.
+        :param poll_initial: Seconds before the first status check; the interval doubles up to `poll_max`.
+        :param poll_max: Longest interval between status checks.
+        """
+        self.client_factory = client_factory
+        self.deployment = deployment
+        self.window = window
+        self.max_requests = max_requests
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self._pending: List[Tuple[str, Dict[str, Any], asyncio.Future]] = []
+        self._last_submit = 0.0
+        self._flush_task: Optional[asyncio.Task] = None
+        self._jobs: set = set()
+
+    async def submit(self, model: str, **kwargs) -> ChatCompletion:
+        """
+        Queue a chat completion request and wait for its result.
+
+        :param model: The deployment the request would be sent to interactively.
+        :param kwargs: Keyword arguments of ``chat.completions.create``. None values are dropped.
+        :return: The ChatCompletion produced by the batch job.
+        :raises RuntimeError: If the job or this request failed.
+        """
+        loop = asyncio.get_running_loop()
+        body = {key: value for key, value in kwargs.items() if value is not None}
+        body.pop("stream", None)
+        body["model"] = self.deployment or model
+        future = loop.create_future()
+        self._pending.append((uuid.uuid4().hex, body, future))
+        self._last_submit = loop.time()
+        if len(self._pending) >= self.max_requests:
+            self._start_job()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self) -> None:
+        """
+        Submit the queued requests once no new request has arrived for `window` seconds.
+        """
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            delay = self._last_submit + self.window - loop.time()
+            if delay <= 0:
+                self._start_job()
+                break
+            await asyncio.sleep(delay)
+        self._flush_task = None
+
+    def _start_job(self) -> None:
+        """
+        Move the queued requests into a new batch job running in the background.
+        """
+        requests, self._pending = self._pending, []
+        if not requests:
+            return
+        job = asyncio.create_task(self._run_job(requests))
+        self._jobs.add(job)
+        job.add_done_callback(self._jobs.discard)
+
+    async def _run_job(
+        self, requests: List[Tuple[str, Dict[str, Any], asyncio.Future]]
+    ) -> None:
+        """
+        Run one batch job and resolve the future of every request in it.
+        """
+        try:
+            results = await self._execute(requests)
+        except Exception as e:
+            logger.error(f"Batch job of {len(requests)} requests failed: {e}")
+            for _, _, future in requests:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for custom_id, _, future in requests:
+            if future.done():
+                continue
+            record = results.get(custom_id)
+            response = (record or {}).get("response") or {}
+            if response.get("status_code") == 200:
+                future.set_result(ChatCompletion.model_validate(response["body"]))
+            else:
+                error = (record or {}).get("error") or response.get("body")
+                future.set_exception(
+                    RuntimeError(f"Batch request {custom_id} failed: {error}")
+                )
+
+    async def _execute(
+        self, requests: List[Tuple[str, Dict[str, Any], asyncio.Future]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Upload the requests as JSONL, create a batch job and poll it until it finishes.
+
+        :return: The output and error records of the job, keyed by custom_id.
+        """
+        client = self.client_factory()
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/chat/completions",
+                    "body": body,
+                }
+            )
+            for custom_id, body, _ in requests
+        ]
+        input_file = await client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/chat/completions",
+            completion_window="24h",
+        )
+        logger.info(f"Submitted batch job {batch.id} with {len(requests)} requests")
+
+        delay = self.poll_initial
+        while batch.status not in _TERMINAL_BATCH_STATUSES:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.poll_max)
+            batch = await client.batches.retrieve(batch.id)
+        logger.info(f"Batch job {batch.id} finished with status {batch.status}")
+        if batch.status not in _RESULT_BATCH_STATUSES:
+            raise RuntimeError(
+                f"Batch job {batch.id} ended with status {batch.status}: {batch.errors}"
+            )
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await client.files.content(file_id)
+            for line in content.text.splitlines():
+                if line.strip():
+                    record = json.loads(line)
+                    results[record["custom_id"]] = record
+        return results
@@ -3,6 +3,7 @@
 """
 
 import io
+from functools import lru_cache
 from typing import Dict, List, Optional, Union
 
 import tiktoken
@@ -19,6 +20,32 @@ logger = get_logger()
 load_dotenv()
 
 
+@lru_cache(maxsize=None)
+def get_encoding(model: Optional[str] = None) -> tiktoken.Encoding:
+    """
+    Return the tiktoken encoding for a model, built once per model name.
+
+    :param model: The model name. Unknown models fall back to the cl100k_base encoding.
+    :return: The tiktoken Encoding.
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        logger.warning(f"Model {model} not found. Using cl100k_base encoding.")
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Count the tokens of a text string for a specific OpenAI model.
+
+    :param text: The text to count tokens for.
+    :param model: The model name, which determines the encoding.
+    :return: The number of tokens in `text`.
+    """
+    return len(get_encoding(model).encode(text, disallowed_special=()))
+
+
 class AzureOpenAITokenizer:
     """
     This class is a tokenizer for Azure OpenAI. It provides methods to call the Azure OpenAI API
@@ -65,11 +92,7 @@ class AzureOpenAITokenizer:
 
         :return (int): The estimated number of tokens for the provided messages.
         """
-        try:
-            encoding = tiktoken.encoding_for_model(model)
-        except KeyError:
-            logger.warning(f"Model {model} not found. Using cl100k_base encoding.")
-            encoding = tiktoken.get_encoding("cl100k_base")
+        encoding = get_encoding(model)
 
         tokens_per_message = self.TOKENS_PER_MESSAGE.get(model, 3)
         tokens_per_name = self.TOKENS_PER_NAME.get(model, 1)
@@ -105,15 +128,7 @@ class AzureOpenAITokenizer:
 
         :return (int): The estimated number of tokens for the provided text.
         """
-        try:
-            encoding = tiktoken.encoding_for_model(model)
-        except KeyError:
-            logger.warning(f"Model {model} not found. Using cl100k_base encoding.")
-            encoding = tiktoken.get_encoding("cl100k_base")
-
-        num_tokens = len(encoding.encode(response))
-
-        return num_tokens
+        return count_tokens(response, model)
 
     # This function is derived from the official documentation and provides a best-effort estimation.
     # For more information, visit: https://platform.openai.com/docs/guides/vision
@@ -1,10 +1,11 @@
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import pymongo
 from dotenv import load_dotenv
-from pymongo.errors import DuplicateKeyError, PyMongoError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
 
 # Initialize logging
 logger = logging.getLogger(__name__)
@@ -77,14 +78,45 @@ class CosmosDBMongoCoreManager:
             logger.error(f"Failed to upsert document: {e}")
             return None
 
-    def read_document(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def bulk_upsert_documents(
+        self, operations: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+    ) -> int:
+        """
+        Upsert many documents in a single unordered bulk write.
+        :param operations: (document, query) pairs, each applied like `upsert_document`.
+        :return: The number of documents inserted or modified, or 0 if an error occurred.
+        """
+        if not operations:
+            return 0
+        requests = [
+            UpdateOne(query, {"$set": document}, upsert=True)
+            for document, query in operations
+        ]
+        try:
+            result = self.collection.bulk_write(requests, ordered=False)
+            written = result.upserted_count + result.modified_count
+            logger.info(f"Bulk upserted {written} of {len(requests)} documents.")
+            return written
+        except BulkWriteError as e:
+            logger.error(
+                f"Bulk upsert partially failed with {len(e.details.get('writeErrors', []))} errors: {e}"
+            )
+            return e.details.get("nUpserted", 0) + e.details.get("nModified", 0)
+        except PyMongoError as e:
+            logger.error(f"Failed to bulk upsert documents: {e}")
+            return 0
+
+    def read_document(
+        self, query: Dict[str, Any], projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Read a document from the collection based on a query.
         :param query: The query to match the document.
+        :param projection: Optional fields to include or exclude, e.g. {"_id": 0}.
         :return: The matched document or None if not found.
         """
         try:
-            document = self.collection.find_one(query)
+            document = self.collection.find_one(query, projection)
             if document:
                 logger.info(f"Found document: {document}")
             else:
@@ -94,14 +126,17 @@ class CosmosDBMongoCoreManager:
             logger.error(f"Failed to read document: {e}")
             return None
 
-    def query_documents(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def query_documents(
+        self, query: Dict[str, Any], projection: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Query multiple documents from the collection based on a query.
         :param query: The query to match documents.
+        :param projection: Optional fields to include or exclude, e.g. {"_id": 0}.
         :return: A list of matching documents.
         """
         try:
-            documents = list(self.collection.find(query))
+            documents = list(self.collection.find(query, projection))
             logger.info(f"Found {len(documents)} documents matching the query.")
             return documents
         except PyMongoError as e:
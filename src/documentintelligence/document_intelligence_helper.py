@@ -1,16 +1,53 @@
-import base64
+import asyncio
+import hashlib
+import io
 import os
-from typing import Any, Dict, Iterator, List, Optional, Union
+import tempfile
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from dataclasses import fields as dataclass_fields
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
+from typing import (
+    Any,
+    AsyncIterable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import SplitResult, urlsplit
 
+import ijson
+import orjson
+import requests
 from azure.ai.documentintelligence import DocumentIntelligenceClient, models
+from azure.ai.documentintelligence.aio import (
+    DocumentIntelligenceClient as AsyncDocumentIntelligenceClient,
+)
 from azure.ai.documentintelligence.models import AnalyzeDocumentRequest, Document
 from azure.core.credentials import AzureKeyCredential
+from azure.core.exceptions import HttpResponseError
+from azure.core.pipeline.transport import RequestsTransport
 from azure.core.polling import LROPoller
-
-# from azure.ai.formrecognizer import DocumentAnalysisClient
-from azure.identity import DefaultAzureCredential
 from dotenv import load_dotenv
 from langchain_core.documents import Document as LangchainDocument
+from PyPDF2 import PdfReader
+from PyPDF2.errors import PdfReadError
+from requests.adapters import HTTPAdapter
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
 from src.storage.blob_helper import AzureBlobManager
 from utils.ml_logging import get_logger
@@ -18,6 +55,285 @@ from utils.ml_logging import get_logger
 # Initialize logging
 logger = get_logger()
 
+# Read .env once at import so the module-level settings below and every manager see it
+load_dotenv()
+
+# Maximum number of Document Intelligence analyses in flight at once (per event loop)
+DI_CONCURRENCY = int(os.getenv("DI_CONCURRENCY", "8"))
+# Sockets kept per host by the shared sync client, sized for many concurrent pollers
+DI_CONNECTION_POOL_MAXSIZE = int(os.getenv("DI_CONNECTION_POOL_MAXSIZE", "32"))
+# Pages per sub-request when large PDFs are partitioned by `analyze_large_document_async`
+DI_PAGES_PER_SLICE = int(os.getenv("DI_PAGES_PER_SLICE", "50"))
+# Longest time `analyze_document_streaming` polls an operation before giving up
+DI_MAX_WAIT_SECONDS = float(os.getenv("DI_MAX_WAIT_SECONDS", "600"))
+
+_SEMAPHORES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """
+    Return the concurrency gate for the running event loop.
+
+    Semaphores are bound to the loop they are first awaited on, so one is kept per loop
+    to stay safe across repeated ``asyncio.run`` calls (e.g. Streamlit reruns).
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _SEMAPHORES.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(DI_CONCURRENCY)
+        _SEMAPHORES[loop] = semaphore
+    return semaphore
+
+
+# Feature names accepted by `analyze_document`, resolved once at import
+_FEATURE_MAP: Dict[str, models.DocumentAnalysisFeature] = {
+    feature.name: feature for feature in models.DocumentAnalysisFeature
+}
+
+
+def _to_analysis_features(
+    features: Optional[List[str]],
+) -> Optional[List[models.DocumentAnalysisFeature]]:
+    """
+    Convert feature names (e.g. "BARCODES") into DocumentAnalysisFeature values.
+
+    :raises ValueError: If a feature name is not a known DocumentAnalysisFeature.
+    """
+    if features is None:
+        return None
+    try:
+        return [_FEATURE_MAP[feature.upper()] for feature in features]
+    except KeyError as e:
+        raise ValueError(
+            f"Unknown Document Intelligence feature {e}. Valid options: {', '.join(_FEATURE_MAP)}"
+        ) from e
+
+
+def _split_https_url(document_input: Union[str, bytes]) -> Optional[SplitResult]:
+    """
+    Split `document_input` if it is an HTTPS URL; returns None for raw bytes and file paths.
+
+    :raises ValueError: If `document_input` is a plain HTTP URL.
+    """
+    if isinstance(document_input, bytes):
+        return None
+    parts = urlsplit(document_input)
+    if parts.scheme == "https":
+        return parts
+    if parts.scheme == "http":
+        raise ValueError("HTTP URLs are not supported. Please use HTTPS.")
+    return None
+
+
+def _is_transient_error(exception: BaseException) -> bool:
+    """
+    Return True for throttling (429) and server-side (5xx) Document Intelligence errors.
+    """
+    return isinstance(exception, HttpResponseError) and (
+        exception.status_code == 429 or (exception.status_code or 0) >= 500
+    )
+
+
+_exponential_jitter = wait_exponential_jitter(initial=1, max=30)
+
+
+def _wait_retry_after(retry_state: RetryCallState) -> float:
+    """
+    Wait for the server's `Retry-After` seconds if given, else back off exponentially with jitter.
+    """
+    exception = retry_state.outcome.exception()
+    response = getattr(exception, "response", None)
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    try:
+        return min(float(retry_after), 60.0)
+    except (TypeError, ValueError):
+        return _exponential_jitter(retry_state)
+
+
+# Retries a whole begin/poll cycle on transient failures; works on sync and async callables
+_retry_transient = retry(
+    retry=retry_if_exception(_is_transient_error),
+    wait=_wait_retry_after,
+    stop=stop_after_attempt(5),
+    before_sleep=lambda retry_state: logger.warning(
+        f"Transient Document Intelligence error, retrying (attempt {retry_state.attempt_number}): "
+        f"{retry_state.outcome.exception()}"
+    ),
+    reraise=True,
+)
+
+
+def _pdf_page_count(content_bytes: bytes) -> Optional[int]:
+    """
+    Return the number of pages of a PDF, or None if the bytes are not a readable PDF.
+    """
+    try:
+        return len(PdfReader(io.BytesIO(content_bytes)).pages)
+    except (PdfReadError, ValueError) as e:
+        logger.debug(f"Could not read PDF page count: {e}")
+        return None
+
+
+def _page_ranges(page_count: int, pages_per_slice: int) -> List[str]:
+    """
+    Split `page_count` pages into 1-based `pages=` ranges, e.g. ["1-50", "51-100", "101"].
+    """
+    ranges = []
+    for start in range(1, page_count + 1, pages_per_slice):
+        end = min(start + pages_per_slice - 1, page_count)
+        ranges.append(f"{start}-{end}" if end > start else str(start))
+    return ranges
+
+
+async def _spool_to_temp_file(chunks: AsyncIterable[bytes]) -> str:
+    """
+    Write a byte stream to a temporary file chunk by chunk and return its path.
+
+    The caller owns the file and must delete it.
+    """
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as spool:
+        async for chunk in chunks:
+            await asyncio.to_thread(spool.write, chunk)
+    return spool.name
+
+
+def _merge_results(results: List[models.AnalyzeResult]) -> models.AnalyzeResult:
+    """
+    Merge per-slice AnalyzeResults into the first one.
+
+    `content` is joined with newlines and `pages`, `paragraphs` and `tables` are concatenated.
+    Spans and offsets stay relative to their own slice's content.
+    """
+    merged = results[0]
+    merged.content = "\n".join(result.content or "" for result in results)
+    for attr in ("pages", "paragraphs", "tables"):
+        items = [item for result in results for item in getattr(result, attr) or []]
+        if items:
+            setattr(merged, attr, items)
+    return merged
+
+
+_FIELDS_PREFIX = "analyzeResult.documents.item.fields"
+
+# Shared read-only placeholder for fields missing from a result
+_EMPTY_FIELD: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(slots=True)
+class FieldValue:
+    """
+    Content and confidence of a single extracted field.
+    """
+
+    content: Optional[str] = None
+    confidence: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"content": self.content, "confidence": self.confidence}
+
+
+@dataclass(slots=True)
+class InvoiceItem:
+    """
+    Line item of a prebuilt-invoice result.
+    """
+
+    Description: FieldValue = field(default_factory=FieldValue)
+    Quantity: FieldValue = field(default_factory=FieldValue)
+    Unit: FieldValue = field(default_factory=FieldValue)
+    UnitPrice: FieldValue = field(default_factory=FieldValue)
+    ProductCode: FieldValue = field(default_factory=FieldValue)
+    Date: FieldValue = field(default_factory=FieldValue)
+    Tax: FieldValue = field(default_factory=FieldValue)
+    Amount: FieldValue = field(default_factory=FieldValue)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {name: getattr(self, name).to_dict() for name in _ITEM_FIELDS}
+
+
+@dataclass(slots=True)
+class InvoiceRecord:
+    """
+    Fields extracted by `process_invoice` from a prebuilt-invoice result.
+    """
+
+    VendorName: FieldValue = field(default_factory=FieldValue)
+    VendorAddress: FieldValue = field(default_factory=FieldValue)
+    VendorAddressRecipient: FieldValue = field(default_factory=FieldValue)
+    CustomerName: FieldValue = field(default_factory=FieldValue)
+    CustomerId: FieldValue = field(default_factory=FieldValue)
+    CustomerAddress: FieldValue = field(default_factory=FieldValue)
+    CustomerAddressRecipient: FieldValue = field(default_factory=FieldValue)
+    InvoiceId: FieldValue = field(default_factory=FieldValue)
+    InvoiceDate: FieldValue = field(default_factory=FieldValue)
+    InvoiceTotal: FieldValue = field(default_factory=FieldValue)
+    DueDate: FieldValue = field(default_factory=FieldValue)
+    PurchaseOrder: FieldValue = field(default_factory=FieldValue)
+    BillingAddress: FieldValue = field(default_factory=FieldValue)
+    BillingAddressRecipient: FieldValue = field(default_factory=FieldValue)
+    ShippingAddress: FieldValue = field(default_factory=FieldValue)
+    ShippingAddressRecipient: FieldValue = field(default_factory=FieldValue)
+    SubTotal: FieldValue = field(default_factory=FieldValue)
+    TotalTax: FieldValue = field(default_factory=FieldValue)
+    PreviousUnpaidBalance: FieldValue = field(default_factory=FieldValue)
+    AmountDue: FieldValue = field(default_factory=FieldValue)
+    ServiceStartDate: FieldValue = field(default_factory=FieldValue)
+    ServiceEndDate: FieldValue = field(default_factory=FieldValue)
+    ServiceAddress: FieldValue = field(default_factory=FieldValue)
+    ServiceAddressRecipient: FieldValue = field(default_factory=FieldValue)
+    RemittanceAddress: FieldValue = field(default_factory=FieldValue)
+    RemittanceAddressRecipient: FieldValue = field(default_factory=FieldValue)
+    Items: List[InvoiceItem] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the nested-dict form, e.g. for JSON serialization.
+        """
+        record = {name: getattr(self, name).to_dict() for name in _INVOICE_FIELDS}
+        record["Items"] = [item.to_dict() for item in self.Items]
+        return record
+
+
+_INVOICE_FIELDS = tuple(
+    f.name for f in dataclass_fields(InvoiceRecord) if f.name != "Items"
+)
+_ITEM_FIELDS = tuple(f.name for f in dataclass_fields(InvoiceItem))
+
+
+def _parse_analyze_result_stream(
+    stream: Any,
+) -> Tuple[Optional[str], Optional[str], List[Dict[str, Any]]]:
+    """
+    Incrementally parse an analyze-result JSON body, keeping only the parts we consume.
+
+    Only `analyzeResult.content` and each `analyzeResult.documents[].fields` map are
+    materialized; pages, words, spans, etc. are skipped as they stream past.
+
+    :param stream: File-like object with the raw JSON body.
+    :return: A tuple of (status, content, list of per-document field maps). Parsing stops early
+        if the operation has not succeeded yet.
+    """
+    status, content = None, None
+    documents_fields: List[Dict[str, Any]] = []
+    builder = None
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if prefix == "status":
+            status = value
+            if status != "succeeded":
+                break
+        elif prefix == "analyzeResult.content":
+            content = value
+        elif prefix == _FIELDS_PREFIX or prefix.startswith(_FIELDS_PREFIX + "."):
+            if prefix == _FIELDS_PREFIX and event == "start_map":
+                builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            if prefix == _FIELDS_PREFIX and event == "end_map":
+                documents_fields.append(builder.value)
+                builder = None
+    return status, content, documents_fields
+
 
 class AzureDocumentIntelligenceManager:
     """
@@ -36,6 +352,10 @@ class AzureDocumentIntelligenceManager:
         storage_account_name: Optional[str] = None,
         container_name: Optional[str] = None,
         account_key: Optional[str] = None,
+        polling_interval: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        prefer_server_side_fetch: bool = True,
+        storage_managed_identity: Optional[bool] = None,
     ):
         """
         Initialize the class with configurations for Azure's Document Analysis Client.
@@ -46,44 +366,222 @@ class AzureDocumentIntelligenceManager:
             storage_account_name (Optional[str]): Name of the Azure Storage account.
             container_name (Optional[str]): Name of the blob container.
             account_key (Optional[str]): Storage account key for authentication.
+            polling_interval (Optional[int]): Seconds between LRO status polls. Defaults to the
+                `AZURE_DI_POLL_INTERVAL` environment variable, or 5.
+            cache_dir (Optional[str]): Directory where analysis results are cached, keyed on the document
+                content hash. Defaults to the `AZURE_DI_CACHE_DIR` environment variable; caching is
+                disabled when neither is set.
+            prefer_server_side_fetch (bool): Let Document Intelligence fetch blob URLs itself when it
+                can access them (SAS URL or managed identity), instead of downloading and re-uploading
+                the bytes. Defaults to True.
+            storage_managed_identity (Optional[bool]): Whether the Document Intelligence resource has
+                managed-identity read access to the storage account. Defaults to the
+                `AZURE_DI_STORAGE_MANAGED_IDENTITY` environment variable, or False.
         """
-        # Load environment variables if not provided
-        load_dotenv()
         self.azure_endpoint = azure_endpoint or os.getenv(
             "AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT"
         )
         self.azure_key = azure_key or os.getenv("AZURE_DOCUMENT_INTELLIGENCE_KEY")
 
+        self.polling_interval = (
+            int(os.getenv("AZURE_DI_POLL_INTERVAL", "5"))
+            if polling_interval is None
+            else polling_interval
+        )
+        self.cache_dir = cache_dir or os.getenv("AZURE_DI_CACHE_DIR")
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        self.prefer_server_side_fetch = prefer_server_side_fetch
+        if storage_managed_identity is None:
+            storage_managed_identity = (
+                os.getenv("AZURE_DI_STORAGE_MANAGED_IDENTITY", "false").lower()
+                == "true"
+            )
+        self.storage_managed_identity = storage_managed_identity
+
         # Validate required configurations for Document Analysis Client
         if not self.azure_endpoint:
             raise ValueError(
                 "Azure endpoint and key must be provided either as parameters or in environment variables."
             )
 
-        # credential = DefaultAzureCredential()
-        # if self.azure_key:
-        #   credential = AzureKeyCredential(self.azure_key)
-
-        self.document_analysis_client = DocumentIntelligenceClient(
-            endpoint=self.azure_endpoint,
-            credential=AzureKeyCredential(self.azure_key),
-            api_version="2024-11-30",
-            headers={"x-ms-useragent": "langchain-parser/1.0.0"},
-            polling_interval=30,
+        self.document_analysis_client = self._get_client(
+            self.azure_endpoint, self.azure_key, self.polling_interval
+        )
+        # Async clients are built lazily, one per event loop they are used on
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncDocumentIntelligenceClient]" = (
+            weakref.WeakKeyDictionary()
         )
 
         # Initialize AzureBlobManager only if all required parameters are provided
         if storage_account_name and container_name and account_key:
-            self.blob_manager = AzureBlobManager(
-                storage_account_name=storage_account_name,
-                container_name=container_name,
-                account_key=account_key,
+            self.blob_manager = self._get_blob_manager(
+                storage_account_name, container_name, account_key
             )
         else:
             # self.blob_manager = None
-            self.blob_manager = AzureBlobManager(
-                storage_account_name=storage_account_name, container_name=container_name
+            self.blob_manager = self._get_blob_manager(
+                storage_account_name, container_name
+            )
+
+    @classmethod
+    @lru_cache(maxsize=4)
+    def _get_client(
+        cls, endpoint: str, key: str, polling_interval: int
+    ) -> DocumentIntelligenceClient:
+        """
+        Returns a Document Intelligence client shared by every manager with the same settings.
+
+        Reusing the client keeps its HTTP connection pool (and TLS sessions) alive across
+        manager instances instead of rebuilding it per instance.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=DI_CONNECTION_POOL_MAXSIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return DocumentIntelligenceClient(
+            endpoint=endpoint,
+            credential=AzureKeyCredential(key),
+            api_version="2024-11-30",
+            headers={"x-ms-useragent": "langchain-parser/1.0.0"},
+            polling_interval=polling_interval,
+            transport=RequestsTransport(session=session, session_owner=False),
+        )
+
+    @classmethod
+    @lru_cache(maxsize=4)
+    def _get_blob_manager(
+        cls,
+        storage_account_name: Optional[str],
+        container_name: Optional[str],
+        account_key: Optional[str] = None,
+    ) -> AzureBlobManager:
+        """
+        Returns an AzureBlobManager shared by every manager with the same storage settings.
+        """
+        return AzureBlobManager(
+            storage_account_name=storage_account_name,
+            container_name=container_name,
+            account_key=account_key,
+        )
+
+    def _needs_blob_download(self, url: SplitResult) -> bool:
+        """
+        Returns True if a URL is a blob the service cannot fetch itself, so its bytes must be sent.
+
+        SAS URLs, and any blob when the service has managed-identity access to the storage
+        account, are passed as `url_source` unless `prefer_server_side_fetch` is disabled.
+        """
+        if not url.netloc.endswith("blob.core.windows.net"):
+            return False
+        if not self.prefer_server_side_fetch:
+            return True
+        return not ("sig=" in url.query or self.storage_managed_identity)
+
+    def _cache_key(
+        self,
+        file_content: bytes,
+        model_type: str,
+        features: Optional[List[str]],
+        pages: Optional[str],
+        output_format: Optional[Union[str, models.ContentFormat]],
+        locale: Optional[str] = None,
+        string_index_type: Optional[Union[str, models.StringIndexType]] = None,
+        query_fields: Optional[List[str]] = None,
+        extra_options: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        """
+        Builds the cache key for a document: its SHA-256 digest plus the analysis options.
+
+        Options that are rarely set (locale, string index type, query fields and any extra
+        keyword arguments) are folded into a digest so the key stays a valid file name.
+
+        :return: The cache key, or None if caching is disabled.
+        """
+        if not self.cache_dir:
+            return None
+        output_format = getattr(output_format, "value", output_format) or "text"
+        parts = [
+            hashlib.sha256(file_content).hexdigest(),
+            model_type,
+            "-".join(features or []),
+            pages or "all",
+            output_format,
+        ]
+        options = {
+            "locale": locale,
+            "string_index_type": getattr(string_index_type, "value", string_index_type),
+            "query_fields": sorted(query_fields) if query_fields else None,
+            **(extra_options or {}),
+        }
+        options = {name: value for name, value in options.items() if value is not None}
+        if options:
+            parts.append(
+                hashlib.sha256(
+                    orjson.dumps(options, option=orjson.OPT_SORT_KEYS, default=str)
+                ).hexdigest()[:16]
             )
+        return "_".join(parts)
+
+    def _read_cache(self, cache_key: Optional[str]) -> Optional[models.AnalyzeResult]:
+        """
+        Returns the cached AnalyzeResult for `cache_key`, or None on a miss.
+        """
+        if cache_key is None:
+            return None
+        cache_path = Path(self.cache_dir, cache_key + ".json")
+        if not cache_path.exists():
+            return None
+        try:
+            result = models.AnalyzeResult(orjson.loads(cache_path.read_bytes()))
+            logger.info(f"Document Intelligence cache hit: {cache_key}")
+            return result
+        except Exception as e:
+            logger.warning(f"Failed to read cached analysis '{cache_path}': {e}")
+            return None
+
+    def _write_cache(
+        self, cache_key: Optional[str], result: models.AnalyzeResult
+    ) -> None:
+        """
+        Stores the raw JSON of `result` under `cache_key`.
+        """
+        if cache_key is None:
+            return
+        cache_path = Path(self.cache_dir, cache_key + ".json")
+        try:
+            cache_path.write_bytes(
+                orjson.dumps(result.as_dict(), option=orjson.OPT_NON_STR_KEYS)
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache analysis '{cache_path}': {e}")
+
+    @_retry_transient
+    def _begin_and_wait(
+        self, analyze_request: AnalyzeDocumentRequest, analyze_kwargs: Dict[str, Any]
+    ) -> models.AnalyzeResult:
+        """
+        Starts the analysis and waits for its result, retrying throttled or failed attempts.
+        """
+        poller = self.document_analysis_client.begin_analyze_document(
+            analyze_request=analyze_request, **analyze_kwargs
+        )
+        return poller.result()
+
+    @_retry_transient
+    async def _begin_and_wait_async(
+        self,
+        client: AsyncDocumentIntelligenceClient,
+        analyze_request: AnalyzeDocumentRequest,
+        analyze_kwargs: Dict[str, Any],
+    ) -> models.AnalyzeResult:
+        """
+        Asynchronous counterpart of `_begin_and_wait`.
+        """
+        poller = await client.begin_analyze_document(
+            analyze_request=analyze_request, **analyze_kwargs
+        )
+        return await poller.result()
 
     def analyze_document(
         self,
@@ -96,6 +594,8 @@ class AzureDocumentIntelligenceManager:
         query_fields: Optional[List[str]] = None,
         output_format: Optional[Union[str, models.ContentFormat]] = None,
         content_type: str = "application/json",
+        polling_interval: Optional[int] = None,
+        text_only: bool = False,
         **kwargs: Any,
     ) -> LROPoller:
         """
@@ -133,160 +633,453 @@ class AzureDocumentIntelligenceManager:
         :param query_fields: List of additional fields to extract.
         :param output_content_format: Format of the analyze result top-level content.
         :param content_type: Body Parameter content-type. Content type parameter for JSON body.
+        :param polling_interval: Seconds between LRO status polls. Defaults to the manager's polling interval.
+        :param text_only: Set when only `result.content` is consumed. Forces the faster, cheaper
+            'prebuilt-read' model with plain-text output, overriding `model_type` and `output_format`.
         :param kwargs: Additional keyword arguments to pass to the analysis method.
         :return: An instance of LROPoller that returns AnalyzeResult.
         """
+        if polling_interval is None:
+            polling_interval = self.polling_interval
+        if text_only:
+            model_type, output_format = "prebuilt-read", "text"
+
+        cache_key = None
+        feature_names = features
+
         # Convert feature strings into DocumentAnalysisFeature objects
-        if features is not None:
-            features = [
-                getattr(models.DocumentAnalysisFeature, feature) for feature in features
-            ]
-
-        # Check if the document_input is a URL
-        if isinstance(document_input, bytes):
-            poller = self.document_analysis_client.begin_analyze_document(
-                model_id=model_type,
-                analyze_request=AnalyzeDocumentRequest(bytes_source=document_input),
-                pages=pages,
+        features = _to_analysis_features(features)
+
+        analyze_kwargs = dict(
+            model_id=model_type,
+            pages=pages,
+            locale=locale,
+            string_index_type=string_index_type,
+            features=features,
+            query_fields=query_fields,
+            output_content_format=output_format if output_format else "text",
+            content_type=content_type,
+            polling_interval=polling_interval,
+            **kwargs,
+        )
+
+        # Resolve the document source; HTTPS URLs the service can reach are fetched server-side
+        analyze_request = None
+        url = _split_https_url(document_input)
+        if url is None:
+            if isinstance(document_input, bytes):
+                content_bytes = document_input
+            else:
+                with open(document_input, "rb") as f:
+                    content_bytes = f.read()
+        elif self._needs_blob_download(url):
+            logger.info("Private blob URL detected. Extracting content.")
+            content_bytes = self.blob_manager.download_blob_to_bytes(document_input)
+        else:
+            analyze_request = AnalyzeDocumentRequest(url_source=document_input)
+
+        if analyze_request is None:
+            cache_key = self._cache_key(
+                content_bytes,
+                model_type,
+                feature_names,
+                pages,
+                output_format,
                 locale=locale,
                 string_index_type=string_index_type,
-                features=features,
                 query_fields=query_fields,
-                output_content_format=output_format if output_format else "text",
-                content_type=content_type,
-                **kwargs,
+                extra_options=kwargs,
+            )
+            cached = self._read_cache(cache_key)
+            if cached is not None:
+                return cached
+            analyze_request = AnalyzeDocumentRequest(bytes_source=content_bytes)
+
+        try:
+            result = self._begin_and_wait(analyze_request, analyze_kwargs)
+        except Exception as e:
+            logger.error(f"Error analyzing document: {e}")
+            raise
+        self._write_cache(cache_key, result)
+        return result
+
+    def analyze_document_streaming(
+        self,
+        document_input: Union[str, bytes],
+        model_type: str = "prebuilt-layout",
+        pages: Optional[str] = None,
+        output_format: Optional[Union[str, models.ContentFormat]] = None,
+        polling_interval: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        **kwargs: Any,
+    ) -> SimpleNamespace:
+        """
+        Analyzes a document and stream-parses the raw result instead of hydrating an AnalyzeResult.
+
+        The operation is started through the SDK, but its result is fetched directly from the
+        `Operation-Location` URL and parsed with `ijson`, so only `content` and the document
+        fields are held in memory. Useful for large PDFs where the full AnalyzeResult is huge.
+
+        :param document_input: URL, file path or raw bytes of the document to analyze.
+        :param model_type: Type of pre-trained model to use for analysis. Defaults to 'prebuilt-layout'.
+        :param pages: List of 1-based page numbers to analyze.  Ex. "1-3,5,7-9".
+        :param output_format: Format of the analyze result top-level content.
+        :param polling_interval: Seconds between status polls. Defaults to the manager's polling interval.
+        :param max_wait: Seconds to wait for the operation to finish. Defaults to `DI_MAX_WAIT_SECONDS` (600).
+        :param kwargs: Additional keyword arguments to pass to the analysis method.
+        :return: A SimpleNamespace with `content`, `fields` (fields of the first document, so it can be
+            passed to `process_invoice`) and `documents` (one namespace with `fields` per document).
+        :raises TimeoutError: If the operation has not finished after `max_wait` seconds.
+        """
+        if polling_interval is None:
+            polling_interval = self.polling_interval
+        max_wait = max_wait or DI_MAX_WAIT_SECONDS
+        deadline = time.monotonic() + max_wait
+
+        url = _split_https_url(document_input)
+        if url is None:
+            if isinstance(document_input, bytes):
+                analyze_request = AnalyzeDocumentRequest(bytes_source=document_input)
+            else:
+                with open(document_input, "rb") as f:
+                    analyze_request = AnalyzeDocumentRequest(bytes_source=f.read())
+        elif self._needs_blob_download(url):
+            analyze_request = AnalyzeDocumentRequest(
+                bytes_source=self.blob_manager.download_blob_to_bytes(document_input)
             )
-        elif document_input.startswith(("http://", "https://")):
-            # If it's an HTTP URL, raise an error
-            if document_input.startswith("http://"):
-                raise ValueError("HTTP URLs are not supported. Please use HTTPS.")
-            # If it's an HTTPS URL but contains "blob.core.windows.net", process it as a blob
-            elif "blob.core.windows.net" in document_input:
-                logger.info("Blob URL detected. Extracting content.")
-                content_bytes = self.blob_manager.download_blob_to_bytes(document_input)
+        else:
+            analyze_request = AnalyzeDocumentRequest(url_source=document_input)
+
+        # Start the operation without SDK polling and capture the Operation-Location header
+        initial_response: Dict[str, Any] = {}
+        self.document_analysis_client.begin_analyze_document(
+            model_id=model_type,
+            analyze_request=analyze_request,
+            pages=pages,
+            output_content_format=output_format if output_format else "text",
+            polling=False,
+            raw_response_hook=lambda response: initial_response.setdefault(
+                "headers", response.http_response.headers
+            ),
+            **kwargs,
+        )
+        operation_location = initial_response["headers"]["Operation-Location"]
+
+        with requests.Session() as session:
+            session.headers["Ocp-Apim-Subscription-Key"] = self.azure_key
+            while True:
+                with session.get(
+                    operation_location,
+                    stream=True,
+                    timeout=max(deadline - time.monotonic(), 1.0),
+                ) as response:
+                    response.raise_for_status()
+                    response.raw.decode_content = True
+                    status, content, documents_fields = _parse_analyze_result_stream(
+                        response.raw
+                    )
+                    retry_after = response.headers.get("Retry-After")
+
+                if status == "succeeded":
+                    break
+                if status not in ("notStarted", "running"):
+                    raise RuntimeError(
+                        f"Document analysis ended with status '{status}' for operation {operation_location}"
+                    )
                 try:
-                    analyze_request = AnalyzeDocumentRequest(bytes_source=content_bytes)
-                    poller = self.document_analysis_client.begin_analyze_document(
-                        model_id=model_type,
-                        analyze_request=analyze_request,
-                        pages=pages,
-                        locale=locale,
-                        string_index_type=string_index_type,
-                        features=features,
-                        query_fields=query_fields,
-                        output_content_format=output_format
-                        if output_format
-                        else "text",
-                        content_type=content_type,
-                        **kwargs,
+                    delay = float(retry_after)
+                except (TypeError, ValueError):
+                    delay = polling_interval
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"Document analysis still '{status}' after {max_wait:.0f}s for operation {operation_location}"
                     )
-                except Exception as e:
-                    logger.error(f"Error analyzing document from blob URL: {e}")
-                    raise
+                time.sleep(min(delay, remaining))
+
+        documents = [SimpleNamespace(fields=fields) for fields in documents_fields]
+        return SimpleNamespace(
+            content=content,
+            fields=documents_fields[0] if documents_fields else {},
+            documents=documents,
+        )
+
+    def _get_async_client(self) -> AsyncDocumentIntelligenceClient:
+        """
+        Returns the async Document Intelligence client of the running event loop, creating
+        it on first use.
+
+        The underlying aiohttp session is tied to the event loop it was created on, so one
+        client is kept per loop, and `close` closes the one of the loop it is awaited on.
+        The session holds a reference to its loop, so clients of loops that have since
+        closed (e.g. earlier ``asyncio.run`` calls) are dropped here rather than kept alive.
+        """
+        loop = asyncio.get_running_loop()
+        for stale_loop in [other for other in self._async_clients if other.is_closed()]:
+            del self._async_clients[stale_loop]
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = AsyncDocumentIntelligenceClient(
+                endpoint=self.azure_endpoint,
+                credential=AzureKeyCredential(self.azure_key),
+                api_version="2024-11-30",
+                headers={"x-ms-useragent": "langchain-parser/1.0.0"},
+                polling_interval=self.polling_interval,
+            )
+            self._async_clients[loop] = client
+        return client
+
+    async def analyze_document_async(
+        self,
+        document_input: Union[str, bytes],
+        model_type: str = "prebuilt-layout",
+        pages: Optional[str] = None,
+        locale: Optional[str] = None,
+        string_index_type: Optional[Union[str, models.StringIndexType]] = None,
+        features: Optional[List[str]] = None,
+        query_fields: Optional[List[str]] = None,
+        output_format: Optional[Union[str, models.ContentFormat]] = None,
+        content_type: str = "application/json",
+        polling_interval: Optional[int] = None,
+        text_only: bool = False,
+        **kwargs: Any,
+    ) -> models.AnalyzeResult:
+        """
+        Asynchronous counterpart of `analyze_document`.
+
+        Accepts the same inputs and returns the same AnalyzeResult, but awaits the long-running
+        operation instead of blocking on it. Concurrent calls are gated by a semaphore sized by
+        the `DI_CONCURRENCY` environment variable (default 8).
+
+        :param document_input: URL, file path or raw bytes of the document to analyze.
+        :param model_type: Type of pre-trained model to use for analysis. Defaults to 'prebuilt-layout'.
+        :param pages: List of 1-based page numbers to analyze.  Ex. "1-3,5,7-9".
+        :param locale: Locale hint for text recognition and document analysis.
+        :param string_index_type: Method used to compute string offset and length.
+        :param features: List of optional analysis features.
+        :param query_fields: List of additional fields to extract.
+        :param output_format: Format of the analyze result top-level content.
+        :param content_type: Body Parameter content-type. Content type parameter for JSON body.
+        :param polling_interval: Seconds between LRO status polls. Defaults to the manager's polling interval.
+        :param text_only: Set when only `result.content` is consumed. Forces the faster, cheaper
+            'prebuilt-read' model with plain-text output, overriding `model_type` and `output_format`.
+        :param kwargs: Additional keyword arguments to pass to the analysis method.
+        :return: The AnalyzeResult of the operation.
+        """
+        if polling_interval is None:
+            polling_interval = self.polling_interval
+        if text_only:
+            model_type, output_format = "prebuilt-read", "text"
+
+        cache_key = None
+        feature_names = features
+
+        features = _to_analysis_features(features)
+
+        client = self._get_async_client()
+
+        analyze_kwargs = dict(
+            model_id=model_type,
+            pages=pages,
+            locale=locale,
+            string_index_type=string_index_type,
+            features=features,
+            query_fields=query_fields,
+            output_content_format=output_format if output_format else "text",
+            content_type=content_type,
+            polling_interval=polling_interval,
+            **kwargs,
+        )
+
+        async with _get_semaphore():
+            # Blob downloads and disk reads run off the event loop so IO overlaps
+            # with in-flight analyses
+            analyze_request = None
+            url = _split_https_url(document_input)
+            if url is None:
+                if isinstance(document_input, bytes):
+                    content_bytes = document_input
+                else:
+                    content_bytes = await asyncio.to_thread(
+                        Path(document_input).read_bytes
+                    )
+            elif self._needs_blob_download(url):
+                logger.info("Private blob URL detected. Extracting content.")
+                content_bytes = await asyncio.to_thread(
+                    self.blob_manager.download_blob_to_bytes, document_input
+                )
             else:
-                poller = self.document_analysis_client.begin_analyze_document(
-                    model_id=model_type,
-                    analyze_request=AnalyzeDocumentRequest(url_source=document_input),
-                    pages=pages,
+                analyze_request = AnalyzeDocumentRequest(url_source=document_input)
+
+            if analyze_request is None:
+                cache_key = self._cache_key(
+                    content_bytes,
+                    model_type,
+                    feature_names,
+                    pages,
+                    output_format,
                     locale=locale,
                     string_index_type=string_index_type,
-                    features=features,
                     query_fields=query_fields,
-                    output_content_format=output_format if output_format else "text",
-                    content_type=content_type,
-                    **kwargs,
+                    extra_options=kwargs,
                 )
-        else:
-            with open(document_input, "rb") as f:
-                file_content = f.read()
-                poller = self.document_analysis_client.begin_analyze_document(
-                    model_id=model_type,
-                    analyze_request=AnalyzeDocumentRequest(bytes_source=file_content),
-                    pages=pages,
-                    locale=locale,
-                    string_index_type=string_index_type,
-                    features=features,
-                    query_fields=query_fields,
-                    output_content_format=output_format if output_format else "text",
-                    content_type=content_type,
-                    **kwargs,
+                # Cache files can be large; read and parse them off the event loop
+                if cache_key is not None:
+                    cached = await asyncio.to_thread(self._read_cache, cache_key)
+                    if cached is not None:
+                        return cached
+                analyze_request = AnalyzeDocumentRequest(bytes_source=content_bytes)
+
+            try:
+                result = await self._begin_and_wait_async(
+                    client, analyze_request, analyze_kwargs
                 )
-        return poller.result()
+            except Exception as e:
+                logger.error(f"Error analyzing document: {e}")
+                raise
+        if cache_key is not None:
+            await asyncio.to_thread(self._write_cache, cache_key, result)
+        return result
 
-    def process_invoice(self, invoice: Document) -> Dict:
+    async def analyze_many(
+        self, document_inputs: List[Union[str, bytes]], **kwargs: Any
+    ) -> List[models.AnalyzeResult]:
         """
-        Processes a single invoice and returns a dictionary with the data.
+        Analyzes several documents concurrently.
 
-        :param invoice: The invoice to process.
-        :return: A dictionary with the processed data.
-        """
-        invoice_data = {}
-        fields = [
-            "VendorName",
-            "VendorAddress",
-            "VendorAddressRecipient",
-            "CustomerName",
-            "CustomerId",
-            "CustomerAddress",
-            "CustomerAddressRecipient",
-            "InvoiceId",
-            "InvoiceDate",
-            "InvoiceTotal",
-            "DueDate",
-            "PurchaseOrder",
-            "BillingAddress",
-            "BillingAddressRecipient",
-            "ShippingAddress",
-            "ShippingAddressRecipient",
-            "SubTotal",
-            "TotalTax",
-            "PreviousUnpaidBalance",
-            "AmountDue",
-            "ServiceStartDate",
-            "ServiceEndDate",
-            "ServiceAddress",
-            "ServiceAddressRecipient",
-            "RemittanceAddress",
-            "RemittanceAddressRecipient",
-        ]
-        for field in fields:
-            field_data = invoice.fields.get(
-                field, {"content": None, "confidence": None}
+        :param document_inputs: URLs, file paths or raw bytes of the documents to analyze.
+        :param kwargs: Keyword arguments forwarded to `analyze_document_async` for every document.
+        :return: The AnalyzeResults, in the same order as `document_inputs`.
+        """
+        return await asyncio.gather(
+            *(
+                self.analyze_document_async(document_input, **kwargs)
+                for document_input in document_inputs
             )
-            invoice_data[field] = {
-                "content": field_data.get("content"),
-                "confidence": field_data.get("confidence"),
-            }
-        items = []
-        for idx, item in enumerate(
-            invoice.fields.get("Items", {"valueArray": []}).get("valueArray")
-        ):
-            item_data = {}
-            item_fields = [
-                "Description",
-                "Quantity",
-                "Unit",
-                "UnitPrice",
-                "ProductCode",
-                "Date",
-                "Tax",
-                "Amount",
-            ]
-            for item_field in item_fields:
-                item_field_data = item.get("valueObject").get(
-                    item_field, {"content": None, "confidence": None}
+        )
+
+    async def analyze_large_document_async(
+        self,
+        document_input: Union[str, bytes, AsyncIterable[bytes]],
+        pages_per_slice: int = DI_PAGES_PER_SLICE,
+        **kwargs: Any,
+    ) -> models.AnalyzeResult:
+        """
+        Analyzes a PDF by partitioning it into page-range sub-requests that run concurrently.
+
+        Documents with more than `pages_per_slice` pages are split into ranges ("1-50",
+        "51-100", ...) analyzed in parallel, and the slice results are merged: `content` is
+        joined with newlines and `pages`, `paragraphs` and `tables` are concatenated. Smaller
+        documents, non-PDF inputs and URLs fall through to a single `analyze_document_async`.
+
+        :param document_input: File path, raw bytes or an async stream of byte chunks (e.g.
+            `AzureBlobManager.download_blob_to_stream`) of the document to analyze. Streams are
+            spooled to a temporary file instead of being buffered. URLs are analyzed without
+            partitioning.
+        :param pages_per_slice: Maximum pages per sub-request. Defaults to `DI_PAGES_PER_SLICE` (50).
+        :param kwargs: Keyword arguments forwarded to `analyze_document_async` for every slice.
+        :return: The merged AnalyzeResult.
+        """
+        if not isinstance(document_input, (str, bytes)):
+            spool_path = await _spool_to_temp_file(document_input)
+            try:
+                return await self.analyze_large_document_async(
+                    spool_path, pages_per_slice=pages_per_slice, **kwargs
+                )
+            finally:
+                os.remove(spool_path)
+
+        if kwargs.get("pages") is not None or _split_https_url(document_input):
+            return await self.analyze_document_async(document_input, **kwargs)
+
+        if isinstance(document_input, str):
+            document_input = await asyncio.to_thread(Path(document_input).read_bytes)
+
+        page_count = _pdf_page_count(document_input)
+        if page_count is None or page_count <= pages_per_slice:
+            return await self.analyze_document_async(document_input, **kwargs)
+
+        ranges = _page_ranges(page_count, pages_per_slice)
+        logger.info(
+            f"Partitioning {page_count}-page document into {len(ranges)} slices."
+        )
+        results = await asyncio.gather(
+            *(
+                self.analyze_document_async(document_input, pages=page_range, **kwargs)
+                for page_range in ranges
+            )
+        )
+        return _merge_results(results)
+
+    async def close(self) -> None:
+        """
+        Closes the async Document Intelligence client of the running event loop, if it was
+        created.
+        """
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+    @staticmethod
+    def process_invoice(invoice: Document) -> InvoiceRecord:
+        """
+        Processes a single invoice and returns its extracted fields.
+
+        :param invoice: The invoice to process.
+        :return: An InvoiceRecord with the processed data; use `to_dict()` for the nested-dict form.
+        """
+        fields = invoice.fields
+        items_array = fields.get("Items", _EMPTY_FIELD).get("valueArray") or ()
+        return InvoiceRecord(
+            **{
+                field: FieldValue(
+                    (field_data := fields.get(field, _EMPTY_FIELD)).get("content"),
+                    field_data.get("confidence"),
+                )
+                for field in _INVOICE_FIELDS
+            },
+            Items=[
+                InvoiceItem(
+                    *(
+                        FieldValue(
+                            (
+                                item_field_data := value_object.get(
+                                    item_field, _EMPTY_FIELD
+                                )
+                            ).get("content"),
+                            item_field_data.get("confidence"),
+                        )
+                        for item_field in _ITEM_FIELDS
+                    )
                 )
-                item_data[item_field] = {
-                    "content": item_field_data.get("content"),
-                    "confidence": item_field_data.get("confidence"),
-                }
-            items.append(item_data)
-        invoice_data["Items"] = items
-        return invoice_data
+                for value_object in (item.get("valueObject") for item in items_array)
+            ],
+        )
+
+    def process_invoices_batch(
+        self, invoices: List[Document], max_workers: Optional[int] = None
+    ) -> List[InvoiceRecord]:
+        """
+        Processes several invoices in parallel worker processes.
+
+        `process_invoice` is pure-Python, CPU-bound work, so invoices are spread across a
+        process pool to sidestep the GIL. Batches of a single invoice are processed inline.
+
+        :param invoices: The invoices to process.
+        :param max_workers: Number of worker processes. Defaults to the number of CPUs.
+        :return: The processed invoice records, in the same order as `invoices`.
+        """
+        if len(invoices) <= 1:
+            return [self.process_invoice(invoice) for invoice in invoices]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.process_invoice, invoices, chunksize=8))
 
     def _generate_docs_single(self, result: Any) -> Iterator[LangchainDocument]:
         yield LangchainDocument(page_content=result.content, metadata={})
 
     def load(self, result: Any) -> List[LangchainDocument]:
-        """Load given path as pages."""
-        return list(self._generate_docs_single(result))
+        """Load given path as pages.
+
+        Only `result.content` is used, so produce `result` with `text_only=True`.
+        """
+        return [LangchainDocument(page_content=result.content, metadata={})]
@@ -13,6 +13,47 @@ from utils.ml_logging import get_logger
 logger = get_logger()
 
 
+def render_pdf_pages(file_path: str, output_path: str, dpi: int = 144) -> List[str]:
+    """
+    Saves each page of a local PDF file as a PNG image.
+
+    This is a module-level function so it can be run in a process pool, one file per worker.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        output_path (str): Directory where the images will be saved.
+        dpi (int): DPI for the output images. Defaults to 144.
+
+    Returns:
+        List[str]: List of paths to the extracted images.
+    """
+    image_paths = []
+    try:
+        zoom_factor = dpi / 72.0  # 72 DPI is the default resolution
+        mat = fitz.Matrix(zoom_factor, zoom_factor)
+
+        logger.info(f"Opening file: {file_path}")
+        doc = fitz.open(file_path)
+        base_filename = os.path.splitext(os.path.basename(file_path))[0]
+
+        for page_number, page in enumerate(doc):
+            logger.info(f"Processing page {page_number + 1} of '{file_path}'")
+            pix = page.get_pixmap(matrix=mat)
+            output_filename = f"{base_filename}-page-{page_number + 1}.png"
+            full_output_path = os.path.join(output_path, output_filename)
+
+            os.makedirs(os.path.dirname(full_output_path), exist_ok=True)
+
+            pix.save(full_output_path)
+            logger.info(f"Saved image: {full_output_path}")
+            image_paths.append(full_output_path)
+
+    except Exception as e:
+        logger.error(f"Failed to process single PDF '{file_path}': {e}")
+        raise
+    return image_paths
+
+
 class OCRHelper:
     """
     Class for OCR functionalities, particularly extracting images from PDF files.
@@ -222,31 +263,7 @@ class OCRHelper:
         Returns:
             List[str]: List of paths to the extracted images.
         """
-        image_paths = []
-        try:
-            zoom_factor = dpi / 72.0  # 72 DPI is the default resolution
-            mat = fitz.Matrix(zoom_factor, zoom_factor)
-
-            logger.info(f"Opening file: {file_path}")
-            doc = fitz.open(file_path)
-            base_filename = os.path.splitext(os.path.basename(file_path))[0]
-
-            for page_number, page in enumerate(doc):
-                logger.info(f"Processing page {page_number + 1} of '{file_path}'")
-                pix = page.get_pixmap(matrix=mat)
-                output_filename = f"{base_filename}-page-{page_number + 1}.png"
-                full_output_path = os.path.join(output_path, output_filename)
-
-                os.makedirs(os.path.dirname(full_output_path), exist_ok=True)
-
-                pix.save(full_output_path)
-                logger.info(f"Saved image: {full_output_path}")
-                image_paths.append(full_output_path)
-
-        except Exception as e:
-            logger.error(f"Failed to process single PDF '{file_path}': {e}")
-            raise
-        return image_paths
+        return render_pdf_pages(file_path, output_path, dpi)
 
     def _is_url(self, path: str) -> bool:
         """
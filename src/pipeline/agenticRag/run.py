@@ -1,5 +1,7 @@
 import os
-from typing import Any, Dict, List, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 from azure.core.credentials import AzureKeyCredential
 from azure.search.documents import SearchClient
@@ -19,6 +21,13 @@ from src.pipeline.utils import load_config
 from src.storage.blob_helper import AzureBlobManager
 from utils.ml_logging import get_logger
 
+# Formatted search results by (index, query, search parameters), shared by all pipelines
+_SEARCH_CACHE: "OrderedDict[Tuple[Any, ...], Tuple[float, str]]" = OrderedDict()
+# Index fields read by `_format_azure_search_results`
+_SEARCH_SELECT_FIELDS = ["chunk_id", "parent_path", "chunk"]
+# Index fields read by `retrieve_policy_snippets`
+_SNIPPET_SELECT_FIELDS = ["chunk_id", "chunk", "page_number"]
+
 
 class AgenticRAG:
     """
@@ -142,7 +151,7 @@ class AgenticRAG:
             frequency_penalty=frequency_penalty,
             presence_penalty=presence_penalty,
         )
-        return response.get("response", {}).get("optimized_query", "")
+        return response.response.get("optimized_query", "")
 
     def _format_azure_search_results(self, results: list, truncate: int = 2000) -> str:
         """
@@ -232,13 +241,30 @@ class AgenticRAG:
             self.policy_retrieval_config["semantic_configuration_name"]
             or semantic_config
         )
-        vector_field = self.policy_retrieval_config["vector_field"] or vector_field
+        vector_field = vector_field or self.policy_retrieval_config.get(
+            "vector_field", "vector"
+        )
         k_nearest_neighbors = (
             self.policy_retrieval_config["k_nearest_neighbors"] or k_nearest_neighbors
         )
         weight = self.policy_retrieval_config["weight"] or weight
         top = self.policy_retrieval_config["top"] or top
 
+        # Identical expanded queries are common across cases; serve them from a TTL cache
+        cache_key = (
+            getattr(self.search_client, "_index_name", id(self.search_client)),
+            query,
+            k_nearest_neighbors,
+            weight,
+            top,
+            semantic_config,
+            vector_field,
+        )
+        cached = self._get_cached_search(cache_key)
+        if cached is not None:
+            self.logger.info(f"{self.prefix}Search cache hit for expanded query.")
+            return cached
+
         vector_query = VectorizableTextQuery(
             text=query,
             k_nearest_neighbors=k_nearest_neighbors,
@@ -253,8 +279,89 @@ class AgenticRAG:
             query_caption=QueryCaptionType.EXTRACTIVE,
             query_answer=QueryAnswerType.EXTRACTIVE,
             top=top,
+            select=_SEARCH_SELECT_FIELDS,
+        )
+        formatted_results = self._format_azure_search_results(results, truncate=2000)
+        if formatted_results:
+            self._set_cached_search(cache_key, formatted_results)
+        return formatted_results
+
+    def retrieve_policy_snippets(
+        self,
+        policy_path: str,
+        query: str,
+        top: Optional[int] = None,
+        vector_field: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Retrieves the chunks of one policy that are most relevant to the case.
+
+        Args:
+            policy_path (str): The `parent_path` of the policy, as returned by `run`.
+            query (str): Text describing the case, vectorized by the index.
+            top (Optional[int]): Number of chunks to retrieve. Defaults to 5.
+            vector_field (Optional[str]): Field to use for the vector query. Defaults to "vector".
+
+        Returns:
+            List[str]: The chunk texts in document order; empty if none were found.
+        """
+        top = top or self.policy_retrieval_config.get("snippet_top", 5)
+        vector_field = vector_field or self.policy_retrieval_config.get(
+            "vector_field", "vector"
+        )
+        vector_query = VectorizableTextQuery(
+            text=query,
+            k_nearest_neighbors=top,
+            fields=vector_field,
+        )
+        escaped_path = policy_path.replace("'", "''")
+        results = self.search_client.search(
+            search_text=query,
+            vector_queries=[vector_query],
+            filter=f"parent_path eq '{escaped_path}'",
+            top=top,
+            select=_SNIPPET_SELECT_FIELDS,
         )
-        return self._format_azure_search_results(results, truncate=2000)
+        chunks = [
+            (str(result.get("page_number") or ""), result.get("chunk_id", ""), chunk)
+            for result in results
+            if (chunk := result.get("chunk"))
+        ]
+        # Page numbers are strings in the index; sort numerically where possible
+        chunks.sort(key=lambda c: (int(c[0]) if c[0].isdigit() else float("inf"), c[1]))
+        self.logger.info(
+            f"{self.prefix}Retrieved {len(chunks)} policy snippets from {policy_path}"
+        )
+        return [chunk for _, _, chunk in chunks]
+
+    def _get_cached_search(self, cache_key: Tuple[Any, ...]) -> Optional[str]:
+        """
+        Return cached search results for `cache_key` if present and not expired.
+        """
+        entry = _SEARCH_CACHE.get(cache_key)
+        if entry is None:
+            return None
+        expires_at, formatted_results = entry
+        if expires_at < time.monotonic():
+            _SEARCH_CACHE.pop(cache_key, None)
+            return None
+        _SEARCH_CACHE.move_to_end(cache_key)
+        return formatted_results
+
+    def _set_cached_search(
+        self, cache_key: Tuple[Any, ...], formatted_results: str
+    ) -> None:
+        """
+        Cache search results, evicting the least recently used entry when full.
+        """
+        ttl = self.policy_retrieval_config.get("cache_ttl_seconds", 3600)
+        max_size = self.policy_retrieval_config.get("cache_size", 1024)
+        if not ttl or not max_size:
+            return
+        _SEARCH_CACHE[cache_key] = (time.monotonic() + ttl, formatted_results)
+        _SEARCH_CACHE.move_to_end(cache_key)
+        while len(_SEARCH_CACHE) > max_size:
+            _SEARCH_CACHE.popitem(last=False)
 
     async def evaluate_results(
         self,
@@ -318,11 +425,9 @@ class AgenticRAG:
         )
         self.logger.info(
             f"""{self.prefix}/n Evaluation response:
-                         {response.get('response', {})}"""
-        )
-        return response.get(
-            "response", {"policies": [], "reasoning": [], "retry": True}
+                         {response.response}"""
         )
+        return response.response
 
     async def run(self, clinical_info: Any, max_retries: int = 3) -> Dict[str, Any]:
         """
@@ -1,14 +1,51 @@
 # TODO: Improve logic + Add docstrings and type hints
+import asyncio
+import dataclasses
+import json
 import os
-from typing import Any, Callable, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import openai
 from colorama import Fore
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
-from src.aoai.aoai_helper import AzureOpenAIManager
+from src.aoai.aoai_helper import AzureOpenAIManager, LLMResult
+from src.aoai.tokenizer import count_tokens
 from src.pipeline.promptEngineering.prompt_manager import PromptManager
 from src.pipeline.utils import load_config
 from utils.ml_logging import get_logger
 
+# Errors after which the 4o determination is attempted again. This is the only retry
+# layer: the chat helper is called with max_retries=0 and re-raises these
+# (raise_transient=True); 4xx errors other than throttling fail fast
+_RETRYABLE_DETERMINATION_ERRORS = (
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+    asyncio.TimeoutError,
+)
+# Values the extractors fill in when a field is absent from the documents
+_MISSING_VALUES = ("", "not provided", "n/a", "na", "none", "unknown")
+
+
+def _is_provided(value: Any) -> bool:
+    """
+    Whether an extracted field holds actual information. Nested models count as provided
+    when any of their fields is.
+    """
+    if isinstance(value, dict):
+        return any(_is_provided(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_is_provided(v) for v in value)
+    if isinstance(value, str):
+        return value.strip().lower() not in _MISSING_VALUES
+    return value is not None
+
 
 class AutoPADeterminator:
     """
@@ -23,6 +60,10 @@ class AutoPADeterminator:
         azure_openai_client_o1: Optional[AzureOpenAIManager] = None,
         prompt_manager: Optional[PromptManager] = None,
         caseId: Optional[str] = None,
+        azure_openai_client_fast: Optional[AzureOpenAIManager] = None,
+        determination_max_tokens: Optional[int] = None,
+        frequency_penalty: Optional[float] = None,
+        presence_penalty: Optional[float] = None,
     ) -> None:
         """
         Initialize the AutoPADeterminator.
@@ -31,17 +72,53 @@ class AutoPADeterminator:
             azure_openai_client: AzureOpenAIManager for main LLM calls. If None, init from env.
             azure_openai_client_o1: AzureOpenAIManager for O1 model calls. If None, init from env.
             prompt_manager: PromptManager instance for prompt templates. If None, create a new one.
+            azure_openai_client_fast: AzureOpenAIManager for the fast first-pass model. If None,
+                init from AZURE_OPENAI_CHAT_DEPLOYMENT_FAST when routing is enabled and set.
+            determination_max_tokens: Completion cap for the 4o determination. If None, use
+                `4o_autoDetermination.max_tokens` from the config.
+            frequency_penalty: Overrides `4o_autoDetermination.frequency_penalty`.
+            presence_penalty: Overrides `4o_autoDetermination.presence_penalty`.
         """
         self.caseId = caseId
         self.prefix = f"[caseID: {self.caseId}] " if self.caseId else ""
         self.config = load_config(config_file)
         self.run_config = self.config.get("run", {})
-        self.four0_auto_determination_config = self.run_config.get(
-            "4o_auto_determination", {}
+        self.four0_auto_determination_config = self.config.get(
+            "4o_autoDetermination", {}
+        )
+        self.o1_auto_determination_config = self.config.get("o1_autoDetermination", {})
+        self.fast_auto_determination_config = self.config.get(
+            "fast_autoDetermination", {}
+        )
+        self.determination_max_tokens = (
+            determination_max_tokens
+            or self.four0_auto_determination_config.get("max_tokens", 1500)
         )
-        self.o1_auto_determination_config = self.run_config.get(
-            "o1_autoDetermination", {}
+        self.frequency_penalty = (
+            self.four0_auto_determination_config.get("frequency_penalty", 0.0)
+            if frequency_penalty is None
+            else frequency_penalty
         )
+        self.presence_penalty = (
+            self.four0_auto_determination_config.get("presence_penalty", 0.0)
+            if presence_penalty is None
+            else presence_penalty
+        )
+        # Generation settings of the 4o determination, built once and shared by every call
+        self._determination_kwargs: Dict[str, Any] = {
+            "response_format": "text",
+            "max_tokens": self.determination_max_tokens,
+            "top_p": self.four0_auto_determination_config.get("top_p", 0.85),
+            "temperature": self.four0_auto_determination_config.get("temperature", 0.7),
+        }
+        # Zero penalties are the service default; leaving them out keeps the request
+        # identical across cases so Azure prompt caching can apply
+        if self.frequency_penalty:
+            self._determination_kwargs["frequency_penalty"] = self.frequency_penalty
+        if self.presence_penalty:
+            self._determination_kwargs["presence_penalty"] = self.presence_penalty
+        self.token_budget_config = self.config.get("token_budget", {})
+        self.sufficiency_config = self.config.get("sufficiency_check", {})
 
         self.logger = get_logger(
             name=self.run_config["logging"]["name"],
@@ -63,8 +140,256 @@ class AutoPADeterminator:
             azure_openai_client_o1 = AzureOpenAIManager(api_version=api_version)
         self.azure_openai_client_o1 = azure_openai_client_o1
 
+        fast_deployment = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_FAST")
+        if (
+            azure_openai_client_fast is None
+            and fast_deployment
+            and self.fast_auto_determination_config.get("enabled", False)
+        ):
+            azure_openai_client_fast = AzureOpenAIManager(
+                api_key=os.getenv("AZURE_OPENAI_KEY", None),
+                chat_model_name=fast_deployment,
+            )
+        self.azure_openai_client_fast = azure_openai_client_fast
+        # Which model produced the last determination: "fast", "o1" or "4o", or
+        # "insufficient_information" when the case was answered without one
+        self.determination_route: Optional[str] = None
+
         self.prompt_manager = prompt_manager or PromptManager()
 
+    async def generate_fast_determination(self, prompt: str) -> Optional[LLMResult]:
+        """
+        Ask the fast model for a determination with a self-reported confidence.
+
+        Args:
+            prompt: The 4o user prompt for the case.
+
+        Returns:
+            The LLMResult, with the determination text as `response`, when the fast model
+            answered with a well-formed envelope at or above the confidence threshold; None
+            when the case should be escalated.
+        """
+        threshold = self.fast_auto_determination_config.get("confidence_threshold", 0.8)
+        try:
+            api_response = await self.azure_openai_client_fast.generate_chat_response(
+                query=prompt,
+                system_message_content=self.prompt_manager.get_prompt(
+                    self.fast_auto_determination_config.get(
+                        "system_prompt", "prior_auth_fast_system_prompt.jinja"
+                    )
+                ),
+                conversation_history=[],
+                response_format="json_object",
+                max_tokens=self.fast_auto_determination_config.get("max_tokens", 1500),
+                temperature=self.fast_auto_determination_config.get("temperature", 0.0),
+            )
+        except Exception as e:
+            # e.g. context length exceeded; the stronger models handle summarization
+            self.logger.warning(f"{self.prefix}Fast model determination failed: {e}")
+            return None
+
+        envelope = api_response.response if api_response else None
+        if not isinstance(envelope, dict):
+            self.logger.info(f"{self.prefix}Fast model returned no JSON envelope.")
+            return None
+        determination = envelope.get("determination")
+        confidence = envelope.get("confidence")
+        if not isinstance(determination, str) or not determination.strip():
+            self.logger.info(f"{self.prefix}Fast model envelope has no determination.")
+            return None
+        if not isinstance(confidence, (int, float)) or confidence < threshold:
+            self.logger.info(
+                f"{self.prefix}Fast model confidence {confidence} is below {threshold}; escalating."
+            )
+            return None
+        self.logger.info(
+            f"{self.prefix}Fast model determination, confidence {confidence}."
+        )
+        return dataclasses.replace(api_response, response=determination)
+
+    def check_sufficiency(
+        self, clinical_info: Any, policy_text: Optional[str]
+    ) -> Optional[str]:
+        """
+        Check whether the case holds enough information for a model determination.
+
+        Args:
+            clinical_info: Clinical data model.
+            policy_text: The relevant policy text.
+
+        Returns:
+            A deterministic "Needs More Information" determination when the required
+            clinical fields are mostly missing or the policy text is too short; None when
+            the case should go to a model.
+
+        Raises:
+            ValueError: If no policy text was retrieved, which is a retrieval failure
+                rather than a policy too short to assess.
+        """
+        if not self.sufficiency_config.get("enabled", False):
+            return None
+        if not (policy_text or "").strip():
+            raise ValueError("No policy text was retrieved for the case.")
+
+        clinical_data = (
+            clinical_info.model_dump(mode="json")
+            if hasattr(clinical_info, "model_dump")
+            else dict(clinical_info or {})
+        )
+        required_fields = self.sufficiency_config.get("required_fields") or list(
+            clinical_data
+        )
+        missing_fields = [
+            field
+            for field in required_fields
+            if not _is_provided(clinical_data.get(field))
+        ]
+        completeness = 1 - len(missing_fields) / len(required_fields)
+        min_completeness = self.sufficiency_config.get("min_clinical_completeness", 0.3)
+        policy_chars = len(policy_text.strip())
+        min_policy_chars = self.sufficiency_config.get("min_policy_chars", 500)
+
+        reasons = []
+        if completeness < min_completeness:
+            reasons.append(
+                f"Only {len(required_fields) - len(missing_fields)} of "
+                f"{len(required_fields)} required clinical fields were found in the "
+                "submitted documents."
+            )
+        policy_insufficient = policy_chars < min_policy_chars
+        if policy_insufficient:
+            reasons.append(
+                f"The retrieved policy text has {policy_chars} characters, too little to "
+                "assess the request against its criteria."
+            )
+        if not reasons:
+            return None
+
+        self.logger.warning(
+            f"{self.prefix}Skipping model determination: {' '.join(reasons)}",
+            extra={
+                "custom_dimensions": json.dumps(
+                    {
+                        "caseId": self.caseId,
+                        "clinical_completeness": completeness,
+                        "missing_fields": missing_fields,
+                        "policy_chars": policy_chars,
+                    }
+                )
+            },
+        )
+        return self.prompt_manager.get_prompt(
+            self.sufficiency_config.get(
+                "template", "prior_auth_insufficient_information.jinja"
+            ),
+            reasons=reasons,
+            missing_fields=(
+                [field.replace("_", " ").capitalize() for field in missing_fields]
+                if completeness < min_completeness
+                else []
+            ),
+            policy_insufficient=policy_insufficient,
+        )
+
+    def _get_system_prompt(self) -> str:
+        """
+        Render the system prompt for the 4o determination.
+        """
+        return self.prompt_manager.get_prompt(
+            self.four0_auto_determination_config.get(
+                "system_prompt", "prior_auth_system_prompt.jinja"
+            )
+        )
+
+    async def _determine(
+        self, prompt: str, on_token: Optional[Callable[[str], Any]] = None
+    ) -> Optional[LLMResult]:
+        """
+        Request a determination from the 4o model.
+
+        Args:
+            prompt: The user prompt for the case.
+            on_token: If given, the response is streamed and each delta passed to it.
+
+        Returns:
+            The LLMResult, or None if the call failed with a non-transient error.
+
+        Raises:
+            openai.APIError, asyncio.TimeoutError: If the request failed with a transient
+                error, so that `run` can retry the determination.
+        """
+        return await self.azure_openai_client.generate_chat_response(
+            query=prompt,
+            system_message_content=self._get_system_prompt(),
+            conversation_history=[],
+            stream=on_token is not None,
+            on_token=on_token,
+            raise_transient=True,
+            max_retries=0,
+            **self._determination_kwargs,
+        )
+
+    async def _determine_o1(self, prompt: str) -> Optional[LLMResult]:
+        """
+        Request a determination from the o1 model.
+
+        Args:
+            prompt: The o1 user prompt for the case.
+
+        Returns:
+            The LLMResult, or None if the call failed.
+        """
+        return await self.azure_openai_client_o1.generate_chat_response_o1(
+            query=prompt,
+            conversation_history=[],
+            max_completion_tokens=self.o1_auto_determination_config.get(
+                "max_completion_tokens", 15000
+            ),
+        )
+
+    def exceeds_token_budget(
+        self, prompt: str, use_o1: bool, system_prompt: str = ""
+    ) -> bool:
+        """
+        Check whether a prompt leaves too little room for the completion in the model context.
+
+        Args:
+            prompt: The user prompt to send.
+            use_o1: Whether the prompt is for the O1 model.
+            system_prompt: The system message sent with the prompt, if any.
+
+        Returns:
+            True if the prompt is longer than the context window minus the completion and
+            overhead tokens.
+        """
+        if use_o1:
+            context_window = self.token_budget_config.get("o1_context_window", 128000)
+            completion_tokens = self.o1_auto_determination_config.get(
+                "max_completion_tokens", 15000
+            )
+        else:
+            context_window = self.token_budget_config.get("context_window", 128000)
+            completion_tokens = self.determination_max_tokens
+        budget = (
+            context_window
+            - completion_tokens
+            - self.token_budget_config.get("overhead_tokens", 1000)
+        )
+        try:
+            prompt_tokens = count_tokens(
+                system_prompt + prompt, self.token_budget_config.get("model", "gpt-4o")
+            )
+        except Exception as e:
+            # e.g. the encoding files cannot be fetched; rely on the context-length fallback
+            self.logger.warning(f"{self.prefix}Could not count prompt tokens: {e}")
+            return False
+        if prompt_tokens > budget:
+            self.logger.info(
+                f"{self.prefix}Prompt has {prompt_tokens} tokens, over the budget of {budget}."
+            )
+            return True
+        return False
+
     async def run(
         self,
         patient_info: Any,
@@ -74,10 +399,16 @@ class AutoPADeterminator:
         summarize_policy_callback: Callable[[str], Any],
         use_o1: bool = False,
         caseId: Optional[str] = None,
+        on_token: Optional[Callable[[str], Any]] = None,
     ) -> Tuple[str, List[str]]:
         """
-        Generate the final determination for the PA request. If maximum context length is exceeded,
-        attempts to summarize the policy and retry.
+        Generate the final determination for the PA request. If the prompt is over the token
+        budget, the policy is summarized before the first call; if the model still reports that
+        the maximum context length is exceeded, the policy is summarized and the call retried.
+        When a fast model is configured it answers first, and the case is escalated to the o1
+        or 4o model only if its confidence is below the threshold. Cases with too little
+        clinical information or policy text get a "Needs More Information" determination
+        without any model call.
 
         Args:
             caseId: The unique case identifier.
@@ -87,6 +418,8 @@ class AutoPADeterminator:
             policy_text: The relevant policy text.
             summarize_policy_callback: Callback to summarize the policy if needed.
             use_o1: Whether to attempt using the O1 model first.
+            on_token: If given, the 4o determination is streamed and each content delta
+                passed to this callback as it arrives.
 
         Returns:
             A tuple containing the final determination text and the conversation history.
@@ -95,21 +428,52 @@ class AutoPADeterminator:
             self.caseId = caseId
             self.prefix = f"[caseID: {self.caseId}] "
 
+        insufficient_determination = self.check_sufficiency(clinical_info, policy_text)
+        if insufficient_determination is not None:
+            self.determination_route = "insufficient_information"
+            return insufficient_determination, []
+
         user_prompt_pa = self.prompt_manager.create_prompt_pa(
             patient_info, physician_info, clinical_info, policy_text, use_o1
         )
+        # Encoding a long policy takes tens of milliseconds; keep it off the event loop
+        if await asyncio.to_thread(
+            self.exceeds_token_budget,
+            user_prompt_pa,
+            use_o1,
+            "" if use_o1 else self._get_system_prompt(),
+        ):
+            # Summarize up front rather than spending a call on a context-length failure
+            policy_text = await summarize_policy_callback(policy_text)
+            user_prompt_pa = self.prompt_manager.create_prompt_pa(
+                patient_info, physician_info, clinical_info, policy_text, use_o1
+            )
 
         self.logger.info(Fore.CYAN + f"Generating final determination for {caseId}")
         self.logger.info(f"Input clinical information: {user_prompt_pa}")
 
-        async def generate_response_with_model(model_client, prompt, use_o1_flag):
-            try:
-                api_response = await model_client.generate_chat_response_o1(
-                    query=prompt,
-                    conversation_history=[],
-                    max_completion_tokens=15000,
+        api_response_determination = None
+        if self.azure_openai_client_fast is not None:
+            api_response_determination = await self.generate_fast_determination(
+                user_prompt_pa
+                if not use_o1
+                else self.prompt_manager.create_prompt_pa(
+                    patient_info, physician_info, clinical_info, policy_text, False
                 )
-                if api_response == "maximum context length":
+            )
+        if api_response_determination is not None:
+            self.determination_route = "fast"
+            final_response = api_response_determination.response
+            self.logger.info(Fore.MAGENTA + "\nFinal Determination:\n" + final_response)
+            return final_response, api_response_determination.conversation_history
+
+        async def generate_response_with_model(prompt, use_o1_flag):
+            try:
+                try:
+                    api_response = await self._determine_o1(prompt)
+                except openai.BadRequestError as e:
+                    if e.code != "context_length_exceeded":
+                        raise
                     summarized_policy = await summarize_policy_callback(policy_text)
                     summarized_prompt = self.prompt_manager.create_prompt_pa(
                         patient_info,
@@ -118,17 +482,13 @@ class AutoPADeterminator:
                         summarized_policy,
                         use_o1_flag,
                     )
-                    api_response = await model_client.generate_chat_response_o1(
-                        query=summarized_prompt,
-                        conversation_history=[],
-                        max_completion_tokens=self.o1_auto_determination_config.get(
-                            "max_completion_tokens", 15000
-                        ),
-                    )
+                    api_response = await self._determine_o1(summarized_prompt)
+                if api_response is None:
+                    raise ValueError("o1 model returned no response")
                 return api_response
             except Exception as e:
                 self.logger.warning(
-                    f"{model_client.__class__.__name__} model generation failed: {str(e)}"
+                    f"{self.azure_openai_client_o1.__class__.__name__} model generation failed: {str(e)}"
                 )
                 raise e
 
@@ -138,7 +498,7 @@ class AutoPADeterminator:
             )
             try:
                 api_response_determination = await generate_response_with_model(
-                    self.azure_openai_client_o1, user_prompt_pa, use_o1
+                    user_prompt_pa, use_o1
                 )
             except Exception:
                 self.logger.info(
@@ -148,84 +508,55 @@ class AutoPADeterminator:
                 use_o1 = False
 
         if not use_o1:
-            max_retries = 2
-            for attempt in range(1, max_retries + 1):
-                try:
-                    self.logger.info(
-                        Fore.CYAN
-                        + f"Using 4o model for final determination, attempt {attempt} for {caseId}..."
-                    )
-
-                    # Use provided values or default to self attributes
-                    system_message_content = (
-                        system_message_content
-                        or self.prompt_manager.get_prompt(
-                            self.four0_auto_determination_config["system_prompt"]
-                        )
-                    )
-                    max_tokens = self.four0_auto_determination_config["max_tokens"]
-                    top_p = self.four0_auto_determination_config["top_p"]
-                    temperature = self.four0_auto_determination_config["temperature"]
-                    frequency_penalty = self.four0_auto_determination_config[
-                        "frequency_penalty"
-                    ]
-                    presence_penalty = self.four0_auto_determination_config[
-                        "presence_penalty"
-                    ]
-
-                    api_response_determination = (
-                        await self.azure_openai_client.generate_chat_response(
-                            query=user_prompt_pa,
-                            system_message_content=system_message_content,
-                            conversation_history=[],
-                            response_format="text",
-                            max_tokens=max_tokens,
-                            top_p=top_p,
-                            temperature=temperature,
-                            frequency_penalty=frequency_penalty,
-                            presence_penalty=presence_penalty,
-                        )
-                    )
-                    if api_response_determination == "maximum context length":
-                        summarized_policy = await summarize_policy_callback(policy_text)
-                        summarized_prompt = self.prompt_manager.create_prompt_pa(
-                            patient_info,
-                            physician_info,
-                            clinical_info,
-                            summarized_policy,
-                            use_o1,
-                        )
-                        api_response_determination = (
-                            await self.azure_openai_client.generate_chat_response(
-                                query=summarized_prompt,
-                                system_message_content=system_message_content,
-                                conversation_history=[],
-                                response_format="text",
-                                max_tokens=max_tokens,
-                                top_p=top_p,
-                                temperature=temperature,
-                                frequency_penalty=frequency_penalty,
-                                presence_penalty=presence_penalty,
-                            )
-                        )
-                    break
-                except Exception as e:
-                    self.logger.warning(
-                        f"4o model generation failed on attempt {attempt}: {str(e)}"
-                    )
-                    if attempt < max_retries:
+            try:
+                async for attempt in AsyncRetrying(
+                    retry=retry_if_exception_type(_RETRYABLE_DETERMINATION_ERRORS),
+                    wait=wait_exponential_jitter(initial=1, max=30),
+                    stop=stop_after_attempt(
+                        self.four0_auto_determination_config.get("max_attempts", 3)
+                    ),
+                    before_sleep=lambda retry_state: self.logger.info(
+                        Fore.CYAN + f"Retrying 4o model for final determination after: "
+                        f"{retry_state.outcome.exception()!r}"
+                    ),
+                    reraise=True,
+                ):
+                    with attempt:
                         self.logger.info(
-                            Fore.CYAN + "Retrying 4o model for final determination..."
+                            Fore.CYAN
+                            + f"Using 4o model for final determination, attempt {attempt.retry_state.attempt_number} for {caseId}..."
                         )
-                    else:
-                        self.logger.error(
-                            f"All retries for 4o model failed for {caseId}."
-                        )
-                        raise e
 
-        final_response = api_response_determination["response"]
+                        try:
+                            api_response_determination = await self._determine(
+                                user_prompt_pa, on_token
+                            )
+                        except openai.BadRequestError as e:
+                            if e.code != "context_length_exceeded":
+                                raise
+                            summarized_policy = await summarize_policy_callback(
+                                policy_text
+                            )
+                            summarized_prompt = self.prompt_manager.create_prompt_pa(
+                                patient_info,
+                                physician_info,
+                                clinical_info,
+                                summarized_policy,
+                                use_o1,
+                            )
+                            api_response_determination = await self._determine(
+                                summarized_prompt, on_token
+                            )
+                        if api_response_determination is None:
+                            raise ValueError("4o model returned no response")
+            except Exception as e:
+                self.logger.error(
+                    f"4o model final determination failed for {caseId}: {str(e)}"
+                )
+                raise
+
+        self.determination_route = "o1" if use_o1 else "4o"
+        final_response = api_response_determination.response
         self.logger.info(Fore.MAGENTA + "\nFinal Determination:\n" + final_response)
 
-        return final_response, api_response_determination.get(
-            "conversation_history", []
-        )
+        return final_response, api_response_determination.conversation_history
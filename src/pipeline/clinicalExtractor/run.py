@@ -1,16 +1,52 @@
 # clinical_data_extractor.py
 import asyncio
 import os
-from typing import Any, Dict, List, Optional, Type, Union
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Type, Union
 
 from colorama import Fore
 from pydantic import BaseModel, ValidationError
+from pydantic.fields import FieldInfo
 
 from src.aoai.aoai_helper import AzureOpenAIManager
+from src.pipeline.promptEngineering.models import CombinedExtraction
 from src.pipeline.promptEngineering.prompt_manager import PromptManager
 from src.pipeline.utils import load_config
 from utils.ml_logging import get_logger
 
+# Fallback values for fields without a default, keyed by annotation
+_TYPE_DEFAULTS: Dict[Any, Callable[[], Any]] = {
+    str: lambda: "Not provided",
+    int: lambda: 0,
+    float: lambda: 0.0,
+    bool: lambda: False,
+    list: list,
+    dict: dict,
+}
+
+
+def _default_for(model_field: FieldInfo) -> Callable[[], Any]:
+    """
+    Return a factory producing the correction value for a field that failed validation.
+    """
+    if model_field.default_factory is not None:
+        return model_field.default_factory
+    if not model_field.is_required():
+        default = model_field.default
+        return lambda: default
+    return _TYPE_DEFAULTS.get(model_field.annotation, lambda: None)
+
+
+@lru_cache(maxsize=None)
+def _field_defaults(model_class: Type[BaseModel]) -> Dict[str, Callable[[], Any]]:
+    """
+    Map each field's validation alias of `model_class` to its correction-value factory.
+    """
+    return {
+        model_field.alias or field_name: _default_for(model_field)
+        for field_name, model_field in model_class.model_fields.items()
+    }
+
 
 class ClinicalDataExtractor:
     """
@@ -43,6 +79,7 @@ class ClinicalDataExtractor:
         self.patient_extraction_conf = self.config.get("patient_extraction", {})
         self.physician_extraction_conf = self.config.get("physician_extraction", {})
         self.clinical_extraction_conf = self.config.get("clinical_extraction", {})
+        self.combined_extraction_conf = self.config.get("combined_extraction", {})
         self.caseId = caseId
         self.prefix = f"[caseID: {self.caseId}] " if self.caseId else ""
 
@@ -69,12 +106,15 @@ class ClinicalDataExtractor:
 
         self.prompt_manager = prompt_manager or PromptManager()
 
-    async def validate_with_field_level_correction(
+    def validate_with_field_level_correction(
         self, data: Dict[str, Any], model_class: Type[BaseModel]
     ) -> BaseModel:
         """
         Validate a dictionary against a Pydantic model. If validation fails for a field, assign a default value.
 
+        The payload is validated in a single `model_validate` call; only when that fails are the
+        offending top-level fields replaced with their defaults before validating once more.
+
         Args:
             data: The dictionary containing the extracted fields.
             model_class: The Pydantic model class to validate against.
@@ -82,40 +122,21 @@ class ClinicalDataExtractor:
         Returns:
             A validated Pydantic model instance with corrected fields if necessary.
         """
-        validated_data: Dict[str, Any] = {}
-        for field_name, model_field in model_class.model_fields.items():
-            expected_alias = model_field.alias or field_name
-            value = data.get(expected_alias, None)
-
-            try:
-                validated_instance = model_class(**{field_name: value})
-                validated_data[field_name] = getattr(validated_instance, field_name)
-            except ValidationError as e:
-                self.logger.warning(f"Validation error for '{expected_alias}': {e}")
-                if model_field.default is not None:
-                    default_value = model_field.default
-                elif model_field.default_factory is not None:
-                    default_value = model_field.default_factory()
+        try:
+            return model_class.model_validate(data)
+        except ValidationError as e:
+            defaults = _field_defaults(model_class)
+            corrected = dict(data)
+            for error in e.errors():
+                loc = error["loc"][0] if error["loc"] else None
+                self.logger.warning(
+                    f"Validation error for '{loc}': {error['msg']} (input: {error.get('input')!r})"
+                )
+                if loc in defaults:
+                    corrected[loc] = defaults[loc]()
                 else:
-                    field_type = model_field.outer_type_
-                    if field_type == str:
-                        default_value = "Not provided"
-                    elif field_type == int:
-                        default_value = 0
-                    elif field_type == float:
-                        default_value = 0.0
-                    elif field_type == bool:
-                        default_value = False
-                    elif field_type == list:
-                        default_value = []
-                    elif field_type == dict:
-                        default_value = {}
-                    else:
-                        default_value = None
-                validated_data[field_name] = default_value
-
-        instance = model_class(**validated_data)
-        return instance
+                    corrected.pop(loc, None)
+            return model_class.model_validate(corrected)
 
     async def extract_patient_data(
         self, image_files: List[str], PatientInformation: Type[BaseModel]
@@ -160,10 +181,10 @@ class ClinicalDataExtractor:
                     presence_penalty=presence_penalty,
                 )
             )
-            validated_data = await self.validate_with_field_level_correction(
-                api_response_patient["response"], PatientInformation
+            validated_data = self.validate_with_field_level_correction(
+                api_response_patient.response, PatientInformation
             )
-            return validated_data, api_response_patient["conversation_history"]
+            return validated_data, api_response_patient.conversation_history
         except Exception as e:
             self.logger.error(f"Error extracting patient data: {e}")
             return None, []
@@ -210,10 +231,10 @@ class ClinicalDataExtractor:
                     presence_penalty=presence_penalty,
                 )
             )
-            validated_data = await self.validate_with_field_level_correction(
-                api_response_physician["response"], PhysicianInformation
+            validated_data = self.validate_with_field_level_correction(
+                api_response_physician.response, PhysicianInformation
             )
-            return validated_data, api_response_physician["conversation_history"]
+            return validated_data, api_response_physician.conversation_history
         except Exception as e:
             self.logger.error(f"Error extracting physician data: {e}")
             return None, []
@@ -260,14 +281,85 @@ class ClinicalDataExtractor:
                     presence_penalty=presence_penalty,
                 )
             )
-            validated_data = await self.validate_with_field_level_correction(
-                api_response_clinician["response"], ClinicalInformation
+            validated_data = self.validate_with_field_level_correction(
+                api_response_clinician.response, ClinicalInformation
             )
-            return validated_data, api_response_clinician["conversation_history"]
+            return validated_data, api_response_clinician.conversation_history
         except Exception as e:
             self.logger.error(f"Error extracting clinician data: {e}")
             return None, []
 
+    async def extract_all_data(
+        self,
+        image_files: List[str],
+        PatientInformation: Type[BaseModel],
+        PhysicianInformation: Type[BaseModel],
+        ClinicalInformation: Type[BaseModel],
+    ) -> Union[Optional[Dict[str, BaseModel]], List[str]]:
+        """
+        Extract patient, physician, and clinical data with a single LLM call.
+
+        The images and instructions for all three groups are sent once, and the model returns a
+        `CombinedExtraction` envelope (`patient`, `physician`, `clinical`) whose sections are then
+        validated against their own models.
+
+        Args:
+            image_files: A list of image file paths extracted from PDFs.
+            PatientInformation: Pydantic model for patient data.
+            PhysicianInformation: Pydantic model for physician data.
+            ClinicalInformation: Pydantic model for clinical data.
+
+        Returns:
+            A tuple containing a dictionary with the patient, physician, and clinician data models
+            and the conversation history, or (None, []) on failure.
+        """
+        try:
+            self.logger.info(
+                Fore.CYAN
+                + f"{self.prefix}\nExtracting patient, physician and clinical data..."
+            )
+            system_message_content = self.prompt_manager.get_prompt(
+                self.combined_extraction_conf["system_prompt"]
+            )
+            user_prompt = self.prompt_manager.get_prompt(
+                self.combined_extraction_conf["user_prompt"]
+            )
+
+            api_response = await self.azure_openai_client.generate_chat_response(
+                query=user_prompt,
+                system_message_content=system_message_content,
+                image_paths=image_files,
+                conversation_history=[],
+                response_format="json_object",
+                max_tokens=self.combined_extraction_conf["max_tokens"],
+                top_p=self.combined_extraction_conf["top_p"],
+                temperature=self.combined_extraction_conf["temperature"],
+                frequency_penalty=self.combined_extraction_conf["frequency_penalty"],
+                presence_penalty=self.combined_extraction_conf["presence_penalty"],
+            )
+            response = api_response.response
+            sections = {
+                name: response.get(field.alias or name) or {}
+                for name, field in CombinedExtraction.model_fields.items()
+            }
+            patient_data = self.validate_with_field_level_correction(
+                sections["patient"], PatientInformation
+            )
+            physician_data = self.validate_with_field_level_correction(
+                sections["physician"], PhysicianInformation
+            )
+            clinician_data = self.validate_with_field_level_correction(
+                sections["clinical"], ClinicalInformation
+            )
+            return {
+                "patient_data": patient_data,
+                "physician_data": physician_data,
+                "clinician_data": clinician_data,
+            }, api_response.conversation_history
+        except Exception as e:
+            self.logger.error(f"Error extracting combined data: {e}")
+            return None, []
+
     async def run(
         self,
         image_files: List[str],
@@ -276,7 +368,10 @@ class ClinicalDataExtractor:
         ClinicalInformation: Type[BaseModel],
     ) -> Dict[str, Any]:
         """
-        Extract patient, physician, and clinical data concurrently.
+        Extract patient, physician, and clinical data.
+
+        Uses one combined LLM call when `combined_extraction.enabled` is set in the config, and
+        falls back to three concurrent per-entity calls if it is disabled or fails.
 
         Args:
             image_files: A list of image file paths extracted from PDFs.
@@ -288,6 +383,19 @@ class ClinicalDataExtractor:
             A dictionary containing patient, physician, and clinician data along with their conversation histories.
         """
         try:
+            if self.combined_extraction_conf.get("enabled", False):
+                combined_data, _ = await self.extract_all_data(
+                    image_files,
+                    PatientInformation,
+                    PhysicianInformation,
+                    ClinicalInformation,
+                )
+                if combined_data is not None:
+                    return combined_data
+                self.logger.warning(
+                    f"{self.prefix}Combined extraction failed, falling back to per-entity calls."
+                )
+
             patient_data_task = self.extract_patient_data(
                 image_files, PatientInformation
             )
@@ -1,27 +1,41 @@
 # main_pipeline.py
+import asyncio
+import atexit
+import copy
+import hashlib
 import json
+import logging
+import multiprocessing
 import os
-import shutil
 import tempfile
 import time
-from typing import Any, Dict, List, Optional, Union
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from functools import cached_property, partial
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 import dotenv
 import streamlit as st
-import yaml
 from azure.core.credentials import AzureKeyCredential
 from azure.identity import DefaultAzureCredential
 from azure.search.documents import SearchClient
 from colorama import Fore, init
 from opentelemetry import trace
 
-from src.aoai.aoai_helper import AzureOpenAIManager
+from src.aoai.aoai_helper import (
+    PA_AOAI_KEEPALIVE_SECONDS,
+    AzureOpenAIManager,
+    aclose_shared_http_client,
+)
+from src.aoai.batch_helper import AzureOpenAIBatchQueue
 from src.cosmosdb.cosmosmongodb_helper import CosmosDBMongoCoreManager
 from src.documentintelligence.document_intelligence_helper import (
     AzureDocumentIntelligenceManager,
 )
 from src.entraid.generate_id import generate_unique_id
-from src.extractors.pdfhandler import OCRHelper
+from src.extractors.pdfhandler import OCRHelper, render_pdf_pages
 from src.pipeline.agenticRag.run import AgenticRAG
 from src.pipeline.autoDetermination.run import AutoPADeterminator
 from src.pipeline.clinicalExtractor.run import ClinicalDataExtractor
@@ -32,12 +46,96 @@ from src.pipeline.promptEngineering.models import (
     PhysicianInformation,
 )
 from src.pipeline.promptEngineering.prompt_manager import PromptManager
+from src.pipeline.utils import load_config
 from src.storage.blob_helper import AzureBlobManager
 from utils.ml_logging import get_logger
 
 init(autoreset=True)
 dotenv.load_dotenv(".env")
 
+# Files uploaded to Blob Storage at once, and parallel block uploads per file
+BLOB_UPLOAD_CONCURRENCY = int(os.getenv("PA_BLOB_UPLOAD_CONCURRENCY", "32"))
+BLOB_UPLOAD_MAX_CONCURRENCY = 16
+# Queued case results that trigger a bulk Cosmos DB write in `store_output(bulk=True)`
+COSMOS_BULK_FLUSH_THRESHOLD = int(os.getenv("PA_COSMOS_BULK_FLUSH_THRESHOLD", "100"))
+# Policy markdown kept in process, keyed by blob ETag, shared by all pipelines
+POLICY_TEXT_CACHE_SIZE = 256
+_POLICY_TEXT_CACHE: "OrderedDict[str, str]" = OrderedDict()
+# Seconds a policy blob's ETag is trusted before it is read again. Policies change rarely,
+# so cases within the window skip the blob properties round trip; 0 disables the cache
+POLICY_ETAG_TTL_SECONDS = float(os.getenv("PA_POLICY_ETAG_TTL_SECONDS", "600"))
+_POLICY_ETAG_CACHE: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+# Policy summaries, keyed by a hash of the policy text. One summarization per key runs at
+# a time on each event loop, so concurrent cases for a new policy share a single LLM call
+_POLICY_SUMMARY_CACHE: "OrderedDict[str, str]" = OrderedDict()
+# Each lock is stored with the number of cases holding or waiting for it, and dropped
+# once that reaches zero
+_POLICY_SUMMARY_LOCKS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Tuple[asyncio.Lock, int]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Worker processes rendering uploaded PDFs to images, one file per worker; 1 renders the
+# files one after another in a thread
+PDF_RENDER_WORKERS = int(
+    os.getenv("PA_PDF_RENDER_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+_PDF_RENDER_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pdf_render_pool() -> ProcessPoolExecutor:
+    """
+    Return the process pool shared by all pipelines for rendering PDFs, created on first use.
+
+    Workers are spawned rather than forked, as the parent runs logging and HTTP threads.
+    The pool is shut down at interpreter exit, or earlier by `shutdown_pdf_render_pool`.
+    """
+    global _PDF_RENDER_POOL
+    if _PDF_RENDER_POOL is None:
+        _PDF_RENDER_POOL = ProcessPoolExecutor(
+            max_workers=PDF_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        atexit.register(shutdown_pdf_render_pool)
+    return _PDF_RENDER_POOL
+
+
+def shutdown_pdf_render_pool() -> None:
+    """
+    Stop the PDF rendering worker processes, if they were started.
+
+    The pool is shared by every pipeline in the process, so only call this once no
+    pipeline is rendering; the next render starts a new pool.
+    """
+    global _PDF_RENDER_POOL
+    pool, _PDF_RENDER_POOL = _PDF_RENDER_POOL, None
+    if pool is not None:
+        atexit.unregister(shutdown_pdf_render_pool)
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+@asynccontextmanager
+async def _policy_summary_lock(key: str) -> AsyncIterator[None]:
+    """
+    Hold the lock guarding the summarization of `key` on the running event loop.
+
+    The lock is removed once no case holds or waits for it, so locks do not accumulate
+    for every policy ever summarized.
+    """
+    locks = _POLICY_SUMMARY_LOCKS.setdefault(asyncio.get_running_loop(), {})
+    lock, users = locks.get(key, (None, 0))
+    if lock is None:
+        lock = asyncio.Lock()
+    locks[key] = (lock, users + 1)
+    try:
+        async with lock:
+            yield
+    finally:
+        lock, users = locks[key]
+        if users == 1:
+            del locks[key]
+        else:
+            locks[key] = (lock, users - 1)
+
 
 class PAProcessingPipeline:
     """
@@ -68,8 +166,7 @@ class PAProcessingPipeline:
         azure_document_intelligence_key: Optional[str] = None,
         send_cloud_logs: bool = False,
     ) -> None:
-        with open(config_path, "r") as file:
-            config = yaml.safe_load(file)
+        config = load_config(os.path.abspath(config_path))
 
         azure_openai_chat_deployment_id = azure_openai_chat_deployment_id or os.getenv(
             "AZURE_OPENAI_CHAT_DEPLOYMENT_ID"
@@ -106,25 +203,19 @@ class PAProcessingPipeline:
         azure_document_intelligence_key = azure_document_intelligence_key or os.getenv(
             "AZURE_DOCUMENT_INTELLIGENCE_KEY"
         )
-        if azure_search_admin_key is None:
-            self.search_client = SearchClient(
-                endpoint=azure_search_service_endpoint,
-                index_name=azure_search_index_name,
-                credential=DefaultAzureCredential(),
-            )
-        self.azure_openai_client = AzureOpenAIManager(
-            completion_model_name=azure_openai_chat_deployment_id,
-            api_key=azure_openai_key,
-        )
-        self.azure_openai_client_o1 = AzureOpenAIManager(
-            api_version=os.getenv("AZURE_OPENAI_API_VERSION_01") or "2024-09-01-preview"
-        )
 
-        self.search_client = SearchClient(
-            endpoint=azure_search_service_endpoint,
-            index_name=azure_search_index_name,
-            credential=AzureKeyCredential(azure_search_admin_key),
-        )
+        # Raw settings only; the Azure clients below are created on first use
+        self.azure_openai_chat_deployment_id = azure_openai_chat_deployment_id
+        self.azure_openai_key = azure_openai_key
+        self.azure_search_service_endpoint = azure_search_service_endpoint
+        self.azure_search_index_name = azure_search_index_name
+        self.azure_search_admin_key = azure_search_admin_key
+        self.azure_cosmos_db_connection = azure_cosmos_db_connection
+        self.azure_cosmos_db_database_name = azure_cosmos_db_database_name
+        self.azure_cosmos_db_collection_name = azure_cosmos_db_collection_name
+        self.azure_document_intelligence_endpoint = azure_document_intelligence_endpoint
+        self.azure_document_intelligence_key = azure_document_intelligence_key
+
         self.container_name = config["remote_blob_paths"]["container_name"]
         self.remote_dir_base_path = config["remote_blob_paths"]["remote_dir_base"]
         self.raw_uploaded_files = config["remote_blob_paths"]["raw_uploaded_files"]
@@ -132,6 +223,7 @@ class PAProcessingPipeline:
         self.caseId = caseId if caseId else generate_unique_id()
         self.azure_blob_storage_account_name = azure_blob_storage_account_name
         self.azure_blob_storage_account_key = azure_blob_storage_account_key
+        self._blob_base = f"https://{self.azure_blob_storage_account_name}.blob.core.windows.net/{self.container_name}/"
 
         self.temperature = config["azure_openai"]["temperature"]
         self.max_tokens = config["azure_openai"]["max_tokens"]
@@ -139,24 +231,9 @@ class PAProcessingPipeline:
         self.frequency_penalty = config["azure_openai"]["frequency_penalty"]
         self.presence_penalty = config["azure_openai"]["presence_penalty"]
         self.seed = config["azure_openai"]["seed"]
+        self.batch_config = config.get("batch", {})
+        self.policy_snippets_config = config.get("policy_snippets", {})
 
-        self.document_intelligence_client = AzureDocumentIntelligenceManager(
-            azure_endpoint=azure_document_intelligence_endpoint,
-            azure_key=azure_document_intelligence_key,
-            storage_account_name=azure_blob_storage_account_name,
-            container_name=self.container_name,
-            account_key=azure_blob_storage_account_key,
-        )
-        self.blob_manager = AzureBlobManager(
-            storage_account_name=self.azure_blob_storage_account_name,
-            account_key=self.azure_blob_storage_account_key,
-            container_name=self.container_name,
-        )
-        self.cosmos_db_manager = CosmosDBMongoCoreManager(
-            connection_string=azure_cosmos_db_connection,
-            database_name=azure_cosmos_db_database_name,
-            collection_name=azure_cosmos_db_collection_name,
-        )
         self.prompt_manager = PromptManager()
 
         # Prompts loaded exactly as originally implemented, no logic changes
@@ -192,20 +269,82 @@ class PAProcessingPipeline:
         self.remote_dir = f"{self.remote_dir_base_path}/{self.caseId}"
         self.conversation_history: List[Dict[str, Any]] = []
         self.results: Dict[str, Any] = {}
-        self.temp_dir = tempfile.mkdtemp()
+        self._pending_upserts: List[Tuple[Dict[str, Any], Dict[str, str]]] = []
+        # Step-keyed case documents already read from Cosmos DB, by caseId
+        self._history_cache: Dict[str, Dict[str, Any]] = {}
+        self._upload_tasks: List[asyncio.Task] = []
+        self._temp_dir: Optional[tempfile.TemporaryDirectory] = None
         self.local = send_cloud_logs
         self.logger = get_logger(
             name="PAProcessing", level=10, tracing_enabled=self.local
         )
 
-        # Initialize helper classes with all parameters exactly as before
-        self.clinical_data_extractor = ClinicalDataExtractor(
+    @cached_property
+    def search_client(self) -> SearchClient:
+        """
+        Azure AI Search client, using the admin key if given and Entra ID otherwise.
+        """
+        credential = (
+            AzureKeyCredential(self.azure_search_admin_key)
+            if self.azure_search_admin_key
+            else DefaultAzureCredential()
+        )
+        return SearchClient(
+            endpoint=self.azure_search_service_endpoint,
+            index_name=self.azure_search_index_name,
+            credential=credential,
+        )
+
+    @cached_property
+    def azure_openai_client(self) -> AzureOpenAIManager:
+        return AzureOpenAIManager(
+            completion_model_name=self.azure_openai_chat_deployment_id,
+            api_key=self.azure_openai_key,
+        )
+
+    @cached_property
+    def azure_openai_client_o1(self) -> AzureOpenAIManager:
+        return AzureOpenAIManager(
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION_01") or "2024-09-01-preview"
+        )
+
+    @cached_property
+    def document_intelligence_client(self) -> AzureDocumentIntelligenceManager:
+        return AzureDocumentIntelligenceManager(
+            azure_endpoint=self.azure_document_intelligence_endpoint,
+            azure_key=self.azure_document_intelligence_key,
+            storage_account_name=self.azure_blob_storage_account_name,
+            container_name=self.container_name,
+            account_key=self.azure_blob_storage_account_key,
+        )
+
+    @cached_property
+    def blob_manager(self) -> AzureBlobManager:
+        return AzureBlobManager(
+            storage_account_name=self.azure_blob_storage_account_name,
+            account_key=self.azure_blob_storage_account_key,
+            container_name=self.container_name,
+        )
+
+    @cached_property
+    def cosmos_db_manager(self) -> CosmosDBMongoCoreManager:
+        return CosmosDBMongoCoreManager(
+            connection_string=self.azure_cosmos_db_connection,
+            database_name=self.azure_cosmos_db_database_name,
+            collection_name=self.azure_cosmos_db_collection_name,
+        )
+
+    @cached_property
+    def clinical_data_extractor(self) -> ClinicalDataExtractor:
+        return ClinicalDataExtractor(
             azure_openai_client=self.azure_openai_client,
             prompt_manager=self.prompt_manager,
             caseId=self.caseId,
         )
 
-        self.agentic_rag = AgenticRAG(
+    @cached_property
+    def agentic_rag(self) -> AgenticRAG:
+        return AgenticRAG(
             azure_openai_client=self.azure_openai_client,
             prompt_manager=self.prompt_manager,
             search_client=self.search_client,
@@ -214,18 +353,20 @@ class PAProcessingPipeline:
             caseId=self.caseId,
         )
 
-        self.auto_pa_determinator = AutoPADeterminator(
+    @cached_property
+    def auto_pa_determinator(self) -> AutoPADeterminator:
+        return AutoPADeterminator(
             azure_openai_client=self.azure_openai_client,
             azure_openai_client_o1=self.azure_openai_client_o1,
             prompt_manager=self.prompt_manager,
             caseId=self.caseId,
         )
 
-    def upload_files_to_blob(
+    async def upload_files_to_blob(
         self, uploaded_files: Union[str, List[str]], step: str
     ) -> None:
         """
-        Upload the given files to Azure Blob Storage.
+        Upload the given files to Azure Blob Storage concurrently.
 
         Args:
             uploaded_files: A file path or list of file paths to upload.
@@ -234,60 +375,87 @@ class PAProcessingPipeline:
         if isinstance(uploaded_files, str):
             uploaded_files = [uploaded_files]
 
-        remote_files = []
-        for file_path in uploaded_files:
+        semaphore = asyncio.Semaphore(BLOB_UPLOAD_CONCURRENCY)
+        step_prefix = f"{self.remote_dir}/{step}/"
+
+        async def upload(file_path: str) -> Optional[str]:
             if os.path.isdir(file_path):
                 self.logger.warning(
                     f"Skipping directory '{file_path}' as it cannot be uploaded as a file."
                 )
-                continue
-
-            try:
-                if file_path.startswith("http"):
-                    blob_info = self.blob_manager._parse_blob_url(file_path)
-                    destination_blob_path = (
-                        f"{self.remote_dir}/{step}/{blob_info['blob_name']}"
-                    )
-                    self.blob_manager.copy_blob(file_path, destination_blob_path)
-                    full_url = f"https://{self.azure_blob_storage_account_name}.blob.core.windows.net/{self.container_name}/{destination_blob_path}"
-                    self.logger.info(
-                        f"Copied blob from '{file_path}' to '{full_url}' in container '{self.blob_manager.container_name}'."
-                    )
-                    remote_files.append(full_url)
-                else:
-                    file_name = os.path.basename(file_path)
-                    destination_blob_path = f"{self.remote_dir}/{step}/{file_name}"
-                    self.blob_manager.upload_file(
-                        file_path, destination_blob_path, overwrite=True
-                    )
-                    full_url = f"https://{self.azure_blob_storage_account_name}.blob.core.windows.net/{self.container_name}/{destination_blob_path}"
-                    self.logger.info(
-                        f"Uploaded file '{file_path}' to blob '{full_url}' in container '{self.blob_manager.container_name}'."
+                return None
+
+            async with semaphore:
+                try:
+                    if file_path.startswith("http"):
+                        blob_info = self.blob_manager._parse_blob_url(file_path)
+                        destination_blob_path = step_prefix + blob_info["blob_name"]
+                        await asyncio.to_thread(
+                            self.blob_manager.copy_blob,
+                            file_path,
+                            destination_blob_path,
+                        )
+                        full_url = self._blob_base + destination_blob_path
+                    else:
+                        destination_blob_path = step_prefix + os.path.basename(
+                            file_path
+                        )
+                        await self.blob_manager.upload_file_async(
+                            file_path,
+                            destination_blob_path,
+                            overwrite=True,
+                            max_concurrency=BLOB_UPLOAD_MAX_CONCURRENCY,
+                        )
+                        full_url = self._blob_base + destination_blob_path
+                    return full_url
+                except Exception as e:
+                    self.logger.error(
+                        f"Failed to upload or copy file '{file_path}': {e}"
                     )
-                    remote_files.append(full_url)
-            except Exception as e:
-                self.logger.error(f"Failed to upload or copy file '{file_path}': {e}")
+                    return None
+
+        uploaded = await asyncio.gather(*(upload(path) for path in uploaded_files))
+        remote_files = [full_url for full_url in uploaded if full_url]
 
         if self.caseId not in self.results:
             self.results[self.caseId] = {}
         self.results[self.caseId][step] = remote_files
-        self.logger.info(
-            f"All files processed for upload to Azure Blob Storage in container '{self.blob_manager.container_name}'."
-        )
+        # One summary record per step instead of one per file; failures are logged above
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                f"Uploaded {len(remote_files)} of {len(uploaded_files)} files for step '{step}' to container '{self.container_name}'.",
+                extra={
+                    "custom_dimensions": json.dumps(
+                        {
+                            "caseId": self.caseId,
+                            "step": step,
+                            "files": remote_files,
+                        }
+                    )
+                },
+            )
 
-    def process_uploaded_files(
-        self, uploaded_files: Union[str, List[str]]
+    async def process_uploaded_files(
+        self, uploaded_files: Union[str, List[str]], wait_for_uploads: bool = True
     ) -> Union[str, List[str]]:
         """
         Process uploaded files and extract images.
 
+        The raw files are uploaded while images are extracted, and all extracted images are
+        then uploaded together.
+
         Args:
             uploaded_files: A file path or list of file paths representing the uploaded PDFs.
+            wait_for_uploads: Return only once the blob uploads finish. If False, the uploads
+                keep running in the background so later stages can use the local images
+                immediately; await `wait_for_uploads` before the temporary directory is removed.
 
         Returns:
             A tuple containing the temporary directory path and the list of extracted image file paths.
         """
-        self.upload_files_to_blob(uploaded_files, step="raw_uploaded_files")
+        raw_upload = asyncio.create_task(
+            self.upload_files_to_blob(uploaded_files, step="raw_uploaded_files")
+        )
         ocr_helper = OCRHelper(
             storage_account_name=self.azure_blob_storage_account_name,
             container_name=self.container_name,
@@ -295,31 +463,81 @@ class PAProcessingPipeline:
         )
         try:
             image_files: List[str] = []
-            for file_path in uploaded_files:
-                self.logger.info(f"Processing file: {file_path}")
-                output_paths = ocr_helper.extract_images_from_pdf(
-                    input_path=file_path, output_path=self.temp_dir
+            if PDF_RENDER_WORKERS > 1 and len(uploaded_files) > 1:
+                # Each worker process has its own PyMuPDF, so local files render in
+                # parallel across cores
+                loop = asyncio.get_running_loop()
+                pool = _get_pdf_render_pool()
+                rendered = await asyncio.gather(
+                    *(
+                        (
+                            loop.run_in_executor(
+                                pool, render_pdf_pages, file_path, self.temp_dir
+                            )
+                            if os.path.isfile(file_path)
+                            else asyncio.to_thread(
+                                ocr_helper.extract_images_from_pdf,
+                                input_path=file_path,
+                                output_path=self.temp_dir,
+                            )
+                        )
+                        for file_path in uploaded_files
+                    )
                 )
+            else:
+                # PyMuPDF is not thread-safe, so files are rendered one at a time,
+                # off the event loop
+                rendered = [
+                    await asyncio.to_thread(
+                        ocr_helper.extract_images_from_pdf,
+                        input_path=file_path,
+                        output_path=self.temp_dir,
+                    )
+                    for file_path in uploaded_files
+                ]
+            for file_path, output_paths in zip(uploaded_files, rendered):
                 if not output_paths:
                     self.logger.warning(f"No images extracted from file '{file_path}'.")
                     continue
-
-                self.upload_files_to_blob(output_paths, step="processed_images")
                 image_files.extend(output_paths)
-                self.logger.info(f"Images extracted and uploaded from: {self.temp_dir}")
 
-            self.logger.info(
-                f"Files processed and images extracted to: {self.temp_dir}"
+            images_upload = asyncio.create_task(
+                self.upload_files_to_blob(image_files, step="processed_images")
             )
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    f"Extracted {len(image_files)} images from {len(uploaded_files)} files to: {self.temp_dir}"
+                )
+            if wait_for_uploads:
+                await images_upload
+            else:
+                self._upload_tasks.append(images_upload)
             return self.temp_dir, image_files
         except Exception as e:
             self.logger.error(f"Failed to process files: {e}")
             return self.temp_dir, []
+        finally:
+            if wait_for_uploads:
+                await raw_upload
+            else:
+                self._upload_tasks.append(raw_upload)
 
-    def get_policy_text_from_blob(self, blob_url: str) -> str:
+    async def wait_for_uploads(self) -> None:
+        """
+        Wait for blob uploads started by `process_uploaded_files(wait_for_uploads=False)`.
+        """
+        upload_tasks, self._upload_tasks = self._upload_tasks, []
+        for result in await asyncio.gather(*upload_tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                self.logger.error(f"Background blob upload failed: {result}")
+
+    async def get_policy_text_from_blob(self, blob_url: str) -> str:
         """
         Retrieve policy text from the specified blob URL using Document Intelligence.
 
+        The blob is streamed to a temporary file and analyzed in concurrent page ranges, so
+        the whole policy is never buffered in memory as it downloads.
+
         Args:
             blob_url: The URL to the policy blob.
 
@@ -327,40 +545,235 @@ class PAProcessingPipeline:
             The text content of the downloaded policy document.
         """
         try:
-            # blob_content = self.blob_manager.download_blob_to_bytes(blob_url)
-            # if blob_content is None:
-            #     raise Exception(f"Failed to download blob from URL: {blob_url}")
-            # self.logger.info(f"Blob content downloaded successfully from {blob_url}")
-
-            policy_text = self.document_intelligence_client.analyze_document(
-                # document_input=blob_content,
-                document_input=blob_url,
-                model_type="prebuilt-layout",
-                output_format="markdown",
+            etag = await self._get_policy_etag(blob_url)
+            cached_text = await self._get_cached_policy_text(etag)
+            if cached_text is not None:
+                self.logger.info(f"Policy text cache hit for blob {blob_url}")
+                return cached_text
+
+            policy_text = (
+                await self.document_intelligence_client.analyze_large_document_async(
+                    document_input=self.blob_manager.download_blob_to_stream(blob_url),
+                    model_type="prebuilt-layout",
+                    output_format="markdown",
+                )
             )
             self.logger.info(f"Document analyzed successfully for blob {blob_url}")
+            await self._set_cached_policy_text(etag, policy_text.content)
             return policy_text.content
         except Exception as e:
             self.logger.error(f"Failed to get policy text from blob {blob_url}: {e}")
             return ""
 
+    async def get_policy_snippets(
+        self, policy_path: str, clinical_info: ClinicalInformation
+    ) -> Optional[str]:
+        """
+        Compose the policy text for the determination from the chunks of the policy most
+        relevant to the case, instead of the full document.
+
+        Args:
+            policy_path: The policy path returned by the policy search.
+            clinical_info: Clinical data of the case, used as the retrieval query.
+
+        Returns:
+            The relevant chunks in document order, or None when snippets are disabled or
+            none were found, in which case the full policy text should be used.
+        """
+        if not self.policy_snippets_config.get("enabled", False):
+            return None
+        treatment = clinical_info.treatment_request
+        query = "\n".join(
+            value
+            for value in (
+                clinical_info.diagnosis,
+                clinical_info.icd_10_code,
+                treatment.name_of_medication_or_procedure,
+                treatment.code_of_medication_or_procedure,
+                clinical_info.prior_treatments_and_results,
+                clinical_info.specific_drugs_taken_and_failures,
+            )
+            if value and value != "Not provided"
+        )
+        if not query:
+            return None
+        try:
+            # The search client is synchronous
+            snippets = await asyncio.to_thread(
+                self.agentic_rag.retrieve_policy_snippets,
+                policy_path,
+                query,
+                self.policy_snippets_config.get("top_k"),
+            )
+        except Exception as e:
+            # e.g. an index created before `parent_path` was filterable
+            self.logger.warning(
+                f"Policy snippet retrieval failed for {policy_path}: {e}"
+            )
+            return None
+        return "\n\n...\n\n".join(snippets) if snippets else None
+
+    async def get_policy_text(
+        self, policy_path: str, clinical_info: ClinicalInformation
+    ) -> str:
+        """
+        Return the policy text for the determination: the relevant snippets when there
+        are any, and the full policy text from the blob otherwise.
+
+        Args:
+            policy_path: The policy path returned by the policy search.
+            clinical_info: Clinical data of the case, used as the retrieval query.
+
+        Returns:
+            The policy text, or an empty string if neither could be read.
+        """
+        snippets = await self.get_policy_snippets(policy_path, clinical_info)
+        if snippets is not None:
+            return snippets
+        return await self.get_policy_text_from_blob(policy_path)
+
+    async def _get_policy_etag(self, blob_url: str) -> Optional[str]:
+        """
+        Return the ETag of a policy blob, reusing the last one read within
+        `POLICY_ETAG_TTL_SECONDS`.
+
+        Args:
+            blob_url: The URL to the policy blob.
+
+        Returns:
+            The blob ETag, or None if it could not be read.
+        """
+        entry = _POLICY_ETAG_CACHE.get(blob_url)
+        if entry is not None and entry[0] >= time.monotonic():
+            _POLICY_ETAG_CACHE.move_to_end(blob_url)
+            return entry[1]
+        etag = await asyncio.to_thread(self.blob_manager.get_blob_etag, blob_url)
+        if etag and POLICY_ETAG_TTL_SECONDS > 0:
+            _POLICY_ETAG_CACHE[blob_url] = (
+                time.monotonic() + POLICY_ETAG_TTL_SECONDS,
+                etag,
+            )
+            _POLICY_ETAG_CACHE.move_to_end(blob_url)
+            if len(_POLICY_ETAG_CACHE) > POLICY_TEXT_CACHE_SIZE:
+                _POLICY_ETAG_CACHE.popitem(last=False)
+        return etag
+
+    async def _get_cached_policy_text(self, etag: Optional[str]) -> Optional[str]:
+        """
+        Look up extracted policy markdown by blob ETag, in process first and then in Cosmos DB.
+
+        Args:
+            etag: The ETag of the policy blob, or None if it could not be read.
+
+        Returns:
+            The cached markdown, or None on a miss.
+        """
+        return await self._read_policy_cache(
+            _POLICY_TEXT_CACHE, "policy_etag", etag, "markdown"
+        )
+
+    async def _set_cached_policy_text(self, etag: Optional[str], text: str) -> None:
+        """
+        Store extracted policy markdown under its blob ETag, in process and in Cosmos DB.
+
+        Args:
+            etag: The ETag of the policy blob, or None if it could not be read.
+            text: The extracted markdown.
+        """
+        await self._write_policy_cache(
+            _POLICY_TEXT_CACHE, "policy_etag", etag, "markdown", text
+        )
+
+    async def _read_policy_cache(
+        self,
+        cache: "OrderedDict[str, str]",
+        key_field: str,
+        key: Optional[str],
+        value_field: str,
+    ) -> Optional[str]:
+        """
+        Look up a cached policy value, in the given in-process cache first and then in the
+        Cosmos DB document whose `key_field` equals `key`.
+
+        Returns:
+            The cached value, or None on a miss.
+        """
+        if not key:
+            return None
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        try:
+            document = await asyncio.to_thread(
+                self.cosmos_db_manager.read_document,
+                {key_field: key},
+                {"_id": 0, value_field: 1},
+            )
+        except Exception as e:
+            self.logger.warning(f"Policy cache lookup for {key_field} failed: {e}")
+            return None
+        if not document or value_field not in document:
+            return None
+        self._remember_policy_value(cache, key, document[value_field])
+        return document[value_field]
+
+    async def _write_policy_cache(
+        self,
+        cache: "OrderedDict[str, str]",
+        key_field: str,
+        key: Optional[str],
+        value_field: str,
+        value: str,
+    ) -> None:
+        """
+        Store a policy value under `key`, in the given in-process cache and in Cosmos DB.
+        """
+        if not key or not value:
+            return
+        self._remember_policy_value(cache, key, value)
+        try:
+            await asyncio.to_thread(
+                self.cosmos_db_manager.upsert_document,
+                {key_field: key, value_field: value},
+                {key_field: key},
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to cache {value_field} in Cosmos DB: {e}")
+
+    @staticmethod
+    def _remember_policy_value(
+        cache: "OrderedDict[str, str]", key: str, value: str
+    ) -> None:
+        """
+        Add a value to an in-process LRU cache, evicting the oldest entry when full.
+        """
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > POLICY_TEXT_CACHE_SIZE:
+            cache.popitem(last=False)
+
     def get_conversation_history(self) -> Dict[str, Any]:
         """
         Retrieve the conversation history for this case.
 
         Returns:
             A dictionary representing the conversation history retrieved from memory or CosmosDB.
+            Cosmos DB is only queried the first time a case is requested; later steps logged by
+            `log_output` are merged into the in-memory copy.
         """
         if self.local:
             return self.conversation_history
         else:
+            if self.caseId in self._history_cache:
+                return self._history_cache[self.caseId]
             if self.cosmos_db_manager:
-                query = f"SELECT * FROM c WHERE c.caseId = '{self.caseId}'"
-                results = self.cosmos_db_manager.execute_query(query)
-                if results:
-                    return {item["step"]: item["data"] for item in results}
-                else:
-                    return {}
+                # The case document is keyed by step (see `store_output`); the filter is sent
+                # as a BSON value, never interpolated into query text
+                document = self.cosmos_db_manager.read_document(
+                    {"caseId": self.caseId}, projection={"_id": 0, "caseId": 0}
+                )
+                history = self._history_cache[self.caseId] = document or {}
+                return history
             else:
                 self.logger.error("CosmosDBManager is not initialized.")
                 return {}
@@ -380,10 +793,14 @@ class PAProcessingPipeline:
             step: The step or stage of the pipeline.
         """
         try:
-            if self.caseId not in self.results:
-                self.results[self.caseId] = {}
-
-            self.results[self.caseId].update(data)
+            case_results = self.results.setdefault(self.caseId, {})
+            if len(data) == 1:
+                ((key, value),) = data.items()
+                case_results[key] = value
+            else:
+                case_results.update(data)
+            if self.caseId in self._history_cache:
+                self._history_cache[self.caseId].update(data)
 
             if conversation_history:
                 self.conversation_history.append(conversation_history)
@@ -394,20 +811,36 @@ class PAProcessingPipeline:
                 f"Failed to log output for case '{self.caseId}', step '{step}': {e}"
             )
 
-    def store_output(self) -> None:
+    def store_output(
+        self, bulk: bool = False, flush_threshold: int = COSMOS_BULK_FLUSH_THRESHOLD
+    ) -> None:
         """
         Store the results into Cosmos DB, using the caseId as the unique identifier for upserts.
+
+        Args:
+            bulk: Queue the upsert instead of writing it immediately. Queued upserts are written
+                in one bulk write once `flush_threshold` cases are pending, or on
+                `flush_pending_upserts`/`close`.
+            flush_threshold: Number of queued cases that triggers a bulk write.
         """
         try:
             if self.cosmos_db_manager:
                 case_data = self.results.get(self.caseId, {})
                 if case_data:
-                    data_item = case_data.copy()
-                    data_item["caseId"] = self.caseId
-
+                    # The upsert copies the caseId equality filter into inserted documents,
+                    # so the results dict is written as-is instead of a copy with caseId added
                     query = {"caseId": self.caseId}
 
-                    self.cosmos_db_manager.upsert_document(data_item, query)
+                    if bulk:
+                        self._pending_upserts.append((case_data, query))
+                        self.logger.info(
+                            f"Results queued for Cosmos DB for caseId {self.caseId}"
+                        )
+                        if len(self._pending_upserts) >= flush_threshold:
+                            self.flush_pending_upserts()
+                        return
+
+                    self.cosmos_db_manager.upsert_document(case_data, query)
                     self.logger.info(
                         f"Results stored in Cosmos DB for caseId {self.caseId}"
                     )
@@ -418,22 +851,80 @@ class PAProcessingPipeline:
         except Exception as e:
             self.logger.error(f"Failed to store results in Cosmos DB: {e}")
 
+    def flush_pending_upserts(self) -> None:
+        """
+        Write all upserts queued by `store_output(bulk=True)` to Cosmos DB in one bulk write.
+        """
+        if not self._pending_upserts:
+            return
+        operations, self._pending_upserts = self._pending_upserts, []
+        try:
+            self.cosmos_db_manager.bulk_upsert_documents(operations)
+            self.logger.info(f"Flushed {len(operations)} case results to Cosmos DB")
+        except Exception as e:
+            self.logger.error(f"Failed to flush results to Cosmos DB: {e}")
+
+    def close(self) -> None:
+        """
+        Flush queued Cosmos DB upserts and close the Cosmos DB connection, if it was opened.
+        """
+        self.flush_pending_upserts()
+        cosmos_db_manager = self.__dict__.pop("cosmos_db_manager", None)
+        if cosmos_db_manager is not None:
+            cosmos_db_manager.close_connection()
+
+    @cached_property
+    def temp_dir(self) -> str:
+        """
+        Temporary directory for extracted images, created on first use.
+        """
+        self._temp_dir = tempfile.TemporaryDirectory()
+        return self._temp_dir.name
+
     def cleanup_temp_dir(self) -> None:
         """
         Cleans up the temporary directory used for processing files.
+
+        A new directory is created on the next access to `temp_dir`.
         """
+        if self._temp_dir is None:
+            return
+        temp_dir, self._temp_dir = self._temp_dir, None
+        self.__dict__.pop("temp_dir", None)
         try:
-            if os.path.exists(self.temp_dir):
-                shutil.rmtree(self.temp_dir)
-                self.logger.info(f"Cleaned up temporary directory: {self.temp_dir}")
+            temp_dir.cleanup()
+            self.logger.info(f"Cleaned up temporary directory: {temp_dir.name}")
         except Exception as e:
             self.logger.error(
-                f"Failed to clean up temporary directory '{self.temp_dir}': {e}"
+                f"Failed to clean up temporary directory '{temp_dir.name}': {e}"
             )
 
+    async def aclose(self) -> None:
+        """
+        Release everything `close` does, plus the keep-alive pings and the Azure OpenAI
+        connection pool shared on the running event loop.
+        """
+        await self.wait_for_uploads()
+        await asyncio.to_thread(self.close)
+        azure_openai_client = self.__dict__.get("azure_openai_client")
+        if azure_openai_client is not None:
+            await azure_openai_client.aclose()
+        await aclose_shared_http_client()
+
+    async def __aenter__(self) -> "PAProcessingPipeline":
+        # Keeps the chat deployment warm between cases when PA_AOAI_KEEPALIVE_SECONDS is set
+        if PA_AOAI_KEEPALIVE_SECONDS > 0:
+            self.azure_openai_client.start_keepalive()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await asyncio.to_thread(self.cleanup_temp_dir)
+        await self.aclose()
+
     async def summarize_policy(self, policy_text: str) -> str:
         """
-        Summarize a given policy text using the LLM.
+        Summarize a given policy text using the LLM, reusing a cached summary of the same
+        text when one exists.
 
         Args:
             policy_text: The full text of the policy document.
@@ -441,6 +932,33 @@ class PAProcessingPipeline:
         Returns:
             A summarized version of the policy text.
         """
+        key = hashlib.blake2b(policy_text.encode("utf-8"), digest_size=16).hexdigest()
+        summary = await self._read_policy_cache(
+            _POLICY_SUMMARY_CACHE, "policy_summary_hash", key, "summary"
+        )
+        if summary is not None:
+            self.logger.info(f"Policy summary cache hit for {key}")
+            return summary
+        async with _policy_summary_lock(key):
+            # Another case may have summarized the policy while this one waited
+            summary = await self._read_policy_cache(
+                _POLICY_SUMMARY_CACHE, "policy_summary_hash", key, "summary"
+            )
+            if summary is None:
+                summary = await self._generate_policy_summary(policy_text)
+                await self._write_policy_cache(
+                    _POLICY_SUMMARY_CACHE,
+                    "policy_summary_hash",
+                    key,
+                    "summary",
+                    summary,
+                )
+        return summary
+
+    async def _generate_policy_summary(self, policy_text: str) -> str:
+        """
+        Summarize a given policy text using the LLM.
+        """
         self.logger.info(Fore.CYAN + "Summarizing Policy...")
         system_message_content = self.prompt_manager.get_prompt(
             "summarize_policy_system.jinja"
@@ -459,7 +977,46 @@ class PAProcessingPipeline:
             frequency_penalty=self.frequency_penalty,
             presence_penalty=self.presence_penalty,
         )
-        return api_response_query["response"]
+        return api_response_query.response
+
+    @asynccontextmanager
+    async def _case_span(
+        self, logger_name: str
+    ) -> AsyncIterator[Tuple[trace.Span, float]]:
+        """
+        Trace and time the processing of the current case.
+
+        The elapsed time is measured with a monotonic clock and is recorded on the span and
+        in the completion log once the block exits, whether or not it raised.
+
+        Args:
+            logger_name: Name of the tracer and prefix of the span name.
+
+        Yields:
+            The span and the monotonic start time of the case. The start is kept local to
+            the call, since pipelines forked by `run_batch` process cases concurrently.
+        """
+        tracer = trace.get_tracer(logger_name)
+        with tracer.start_as_current_span(f"{logger_name}.run") as span:
+            span.set_attribute("caseId", self.caseId)
+            self.logger.info(
+                f"PAProcessing started {self.caseId}.",
+                extra={"custom_dimensions": json.dumps({"caseId": self.caseId})},
+            )
+            started_at = time.monotonic()
+            try:
+                yield span, started_at
+            finally:
+                execution_time = time.monotonic() - started_at
+                span.set_attribute("execution_time_s", execution_time)
+                self.logger.info(
+                    f"PAprocessing completed for {self.caseId}. Execution time: {execution_time:.2f} seconds.",
+                    extra={
+                        "custom_dimensions": json.dumps(
+                            {"caseId": self.caseId, "execution_time": execution_time}
+                        )
+                    },
+                )
 
     async def run(
         self,
@@ -467,6 +1024,7 @@ class PAProcessingPipeline:
         streamlit: bool = False,
         caseId: str = None,
         use_o1: bool = False,
+        bulk_store: bool = False,
     ) -> None:
         """
         Process documents as per the pipeline flow and store the outputs.
@@ -484,6 +1042,8 @@ class PAProcessingPipeline:
             streamlit: Whether to update a Streamlit UI during processing.
             caseId: Optional case ID.
             use_o1: Whether to attempt using O1 model first for final determination.
+            bulk_store: Queue the Cosmos DB write of the results for a bulk write (see
+                `store_output`) instead of writing them when the case finishes.
         """
         dynamic_logger_name = f"Case_{caseId}" if caseId else "PaProcessing"
 
@@ -496,28 +1056,31 @@ class PAProcessingPipeline:
         if caseId:
             self.caseId = caseId
 
-        tracer = trace.get_tracer(dynamic_logger_name)
-        start_time = time.time()
-        with tracer.start_as_current_span(f"{dynamic_logger_name}.run") as span:
-            span.set_attribute("caseId", self.caseId)
+        async with self._case_span(dynamic_logger_name) as (span, started_at):
             span.set_attribute("uploaded_files", len(uploaded_files))
-            self.logger.info(
-                f"PAProcessing started {self.caseId}.",
-                extra={"custom_dimensions": json.dumps({"caseId": self.caseId})},
-            )
-            try:
-                temp_dir, image_files = self.process_uploaded_files(uploaded_files)
-                image_files = find_all_files(temp_dir, ["png"])
+            # Widget updates are queued and applied by a separate task, so the stages
+            # below never wait on Streamlit
+            ui_events: Optional[asyncio.Queue] = None
+            ui_task: Optional[asyncio.Task] = None
+            if streamlit:
+                ui_events = asyncio.Queue()
+                ui_task = asyncio.create_task(
+                    self._drain_ui(ui_events, st.progress(0), st.empty(), st.empty())
+                )
 
-                if streamlit:
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
-                    progress = 0
-                    total_steps = 4
+            def report(kind: str, value: Any) -> None:
+                if ui_events is not None:
+                    ui_events.put_nowait((kind, value))
 
-                    status_text.write("🔍 **Analyzing clinical information...**")
-                    progress += 1
-                    progress_bar.progress(progress / total_steps)
+            try:
+                # Blob uploads of the case files overlap with data extraction, which
+                # only needs the local images
+                temp_dir, image_files = await self.process_uploaded_files(
+                    uploaded_files, wait_for_uploads=False
+                )
+                image_files = await asyncio.to_thread(find_all_files, temp_dir, ["png"])
+
+                report("stage", ("🔍 **Analyzing clinical information...**", 1 / 4))
 
                 api_response_ner = await self.clinical_data_extractor.run(
                     image_files,
@@ -541,12 +1104,10 @@ class PAProcessingPipeline:
                     step="ocr_ner_extraction",
                 )
 
-                if streamlit:
-                    status_text.write(
-                        "🔎 **Expanding query and searching for policy...**"
-                    )
-                    progress += 1
-                    progress_bar.progress(progress / total_steps)
+                report(
+                    "stage",
+                    ("🔎 **Expanding query and searching for policy...**", 2 / 4),
+                )
 
                 agenticrag_results = await self.agentic_rag.run(
                     clinical_info, max_retries=3
@@ -563,10 +1124,10 @@ class PAProcessingPipeline:
                 policy_text = None
                 if policies:
                     policy = policies[0]
-                    policy_text = self.get_policy_text_from_blob(policy)
-                    if policy_text is None:
+                    policy_text = await self.get_policy_text(policy, clinical_info)
+                    if not policy_text:
                         raise ValueError(
-                            f"Policy text extraction returned None for policy: {policy}"
+                            f"Policy text extraction returned no text for policy: {policy}"
                         )
                     policy_texts.append(policy_text)
                 else:
@@ -588,10 +1149,7 @@ class PAProcessingPipeline:
                     )
                     return summary
 
-                if streamlit:
-                    status_text.write("📝 **Generating final determination...**")
-                    progress += 1
-                    progress_bar.progress(progress / total_steps)
+                report("stage", ("📝 **Generating final determination...**", 3 / 4))
 
                 (
                     final_determination,
@@ -604,39 +1162,195 @@ class PAProcessingPipeline:
                     policy_text=policy_text,
                     summarize_policy_callback=summarize_policy_callback,
                     use_o1=use_o1,
+                    on_token=partial(report, "token") if streamlit else None,
                 )
 
+                # Replaces any partial text streamed by a failed attempt
+                report("determination", final_determination)
+
                 self.log_output(
-                    {"pa_determination_results": final_determination},
+                    {
+                        "pa_determination_results": final_determination,
+                        "determination_route": self.auto_pa_determinator.determination_route,
+                    },
                     final_conv_history,
                     step="llm_determination",
                 )
 
                 if streamlit:
-                    end_time = time.time()
-                    execution_time = end_time - start_time
-                    status_text.success(
-                        f"✅ **PA {self.caseId} Processing completed in {execution_time:.2f} seconds!**"
+                    execution_time = time.monotonic() - started_at
+                    report(
+                        "success",
+                        f"✅ **PA {self.caseId} Processing completed in {execution_time:.2f} seconds!**",
                     )
-                    progress_bar.progress(1.0)
 
             except Exception as e:
                 self.logger.error(
                     f"PAprocessing failed for {self.caseId}: {e}",
                     extra={"custom_dimensions": json.dumps({"caseId": self.caseId})},
                 )
-                if streamlit:
-                    st.error(f"PAprocessing failed for {self.caseId}: {e}")
+                report("error", f"PAprocessing failed for {self.caseId}: {e}")
             finally:
-                self.cleanup_temp_dir()
-                self.store_output()
-                end_time = time.time()
-                execution_time = end_time - start_time
-                self.logger.info(
-                    f"PAprocessing completed for {self.caseId}. Execution time: {execution_time:.2f} seconds.",
-                    extra={
-                        "custom_dimensions": json.dumps(
-                            {"caseId": self.caseId, "execution_time": execution_time}
-                        )
-                    },
+                if ui_task is not None:
+                    # Let the final messages render before the case is closed out
+                    ui_events.put_nowait(None)
+                    await ui_task
+                await self.wait_for_uploads()
+                # Directory removal and the Cosmos DB write block; keep them off the loop
+                await asyncio.to_thread(self.cleanup_temp_dir)
+                await asyncio.to_thread(self.store_output, bulk=bulk_store)
+
+    async def _drain_ui(
+        self,
+        events: asyncio.Queue,
+        progress_bar: Any,
+        status_text: Any,
+        determination_text: Any,
+    ) -> None:
+        """
+        Apply the UI events queued by `run` to its Streamlit widgets until None is received.
+
+        Events that queue up while the task waits are applied together, so a burst of
+        streamed tokens becomes one markdown update.
+
+        Args:
+            events: Queue of `(kind, value)` events. Kinds are "stage" (message, progress),
+                "token", "determination", "success" and "error".
+            progress_bar: Progress bar of the case.
+            status_text: Placeholder for the current stage.
+            determination_text: Placeholder for the streamed determination.
+        """
+        tokens: List[str] = []
+        done = False
+        while not done:
+            batch = [await events.get()]
+            while not events.empty():
+                batch.append(events.get_nowait())
+            stage = success = None
+            errors: List[str] = []
+            render_determination = False
+            for event in batch:
+                if event is None:
+                    done = True
+                    break
+                kind, value = event
+                if kind == "stage":
+                    stage = value
+                elif kind == "token":
+                    tokens.append(value)
+                    render_determination = True
+                elif kind == "determination":
+                    tokens = [value]
+                    render_determination = True
+                elif kind == "success":
+                    success = value
+                elif kind == "error":
+                    errors.append(value)
+            try:
+                if stage is not None:
+                    status_text.write(stage[0])
+                    progress_bar.progress(stage[1])
+                if render_determination:
+                    determination_text.markdown("".join(tokens))
+                if success is not None:
+                    status_text.success(success)
+                    progress_bar.progress(1.0)
+                for error in errors:
+                    st.error(error)
+            except Exception as e:
+                # A failed widget update must not fail the case
+                self.logger.warning(f"Streamlit update failed: {e}")
+
+    def _fork_for_case(
+        self, caseId: str, azure_openai_client: Optional[AzureOpenAIManager] = None
+    ) -> "PAProcessingPipeline":
+        """
+        Copy of this pipeline for processing one case alongside others.
+
+        The Azure clients are shared; per-case state and the components bound to a caseId are
+        created afresh.
+
+        Args:
+            caseId: The case the copy processes.
+            azure_openai_client: Chat client to use instead of this pipeline's.
+        """
+        pipeline = copy.copy(self)
+        for name in (
+            "clinical_data_extractor",
+            "agentic_rag",
+            "auto_pa_determinator",
+            "temp_dir",
+        ):
+            pipeline.__dict__.pop(name, None)
+        if azure_openai_client is not None:
+            pipeline.__dict__["azure_openai_client"] = azure_openai_client
+        pipeline.caseId = caseId
+        pipeline.remote_dir = f"{self.remote_dir_base_path}/{caseId}"
+        pipeline.conversation_history = []
+        pipeline.results = {}
+        pipeline._pending_upserts = []
+        pipeline._history_cache = {}
+        pipeline._upload_tasks = []
+        pipeline._temp_dir = None
+        return pipeline
+
+    async def run_batch(
+        self, cases: Dict[str, List[str]], use_o1: bool = False
+    ) -> None:
+        """
+        Process many cases concurrently, sending their chat completions through the Azure
+        OpenAI Batch API instead of one request at a time.
+
+        The cases run their stages side by side, so the NER, policy search and determination
+        calls of all cases are each submitted as one batch job. Batch jobs can take minutes to
+        hours; use `run` for interactive and Streamlit processing. Streaming and o1 calls are
+        still sent interactively. The case results are written to Cosmos DB in one bulk write
+        once every case has finished.
+
+        Args:
+            cases: The PDF file paths to process, keyed by case ID.
+            use_o1: Whether to attempt using O1 model first for final determination.
+        """
+        # Create the shared clients up front, so the per-case copies reuse them
+        for name in (
+            "search_client",
+            "blob_manager",
+            "cosmos_db_manager",
+            "document_intelligence_client",
+            "azure_openai_client_o1",
+        ):
+            getattr(self, name)
+        # The cases get their own copy of the chat client that queues for the Batch API,
+        # so interactive calls made through this pipeline meanwhile are not batched
+        batch_client = copy.copy(self.azure_openai_client)
+        batch_client._keepalive_task = None
+        batch_api_version = self.batch_config.get("api_version", "2024-10-21")
+        batch_client.batch_queue = AzureOpenAIBatchQueue(
+            lambda: batch_client.get_async_azure_openai_client(
+                api_version=batch_api_version
+            ),
+            deployment=os.getenv("AZURE_OPENAI_BATCH_DEPLOYMENT_ID"),
+            window=self.batch_config.get("window_seconds", 10),
+            poll_initial=self.batch_config.get("poll_initial_seconds", 30),
+            poll_max=self.batch_config.get("poll_max_seconds", 600),
+        )
+        self.logger.info(f"Batch processing {len(cases)} cases.")
+        pipelines = [self._fork_for_case(caseId, batch_client) for caseId in cases]
+        try:
+            await asyncio.gather(
+                *(
+                    pipeline.run(
+                        uploaded_files, caseId=caseId, use_o1=use_o1, bulk_store=True
+                    )
+                    for pipeline, (caseId, uploaded_files) in zip(
+                        pipelines, cases.items()
+                    )
                 )
+            )
+        finally:
+            # The cases queue their results; write them to Cosmos DB together
+            for pipeline in pipelines:
+                self.results.update(pipeline.results)
+                self._pending_upserts.extend(pipeline._pending_upserts)
+                pipeline._pending_upserts = []
+            await asyncio.to_thread(self.flush_pending_upserts)
@@ -122,6 +122,9 @@ class PolicyIndexingPipeline:
         self.remote_document_path: str = config["azure_search_indexer_settings"][
             "remote_document_path"
         ]
+        self.indexer_batch_size: Optional[int] = config[
+            "azure_search_indexer_settings"
+        ].get("batch_size")
 
         self.vector_search_config: Dict[str, Any] = config["vector_search"]
         self.skills_config: Dict[str, Any] = config["skills"]
@@ -214,9 +217,11 @@ class PolicyIndexingPipeline:
                     name="title",
                     type=SearchFieldDataType.String,
                 ),
+                # Filterable so the determination can retrieve chunks of one policy
                 SearchField(
                     name="parent_path",
                     type=SearchFieldDataType.String,
+                    filterable=True,
                 ),
                 SearchField(
                     name="chunk_id",
@@ -547,16 +552,18 @@ class PolicyIndexingPipeline:
         try:
             if self.use_ocr:
                 indexer_parameters = IndexingParameters(
+                    batch_size=self.indexer_batch_size,
                     configuration=IndexingParametersConfiguration(
                         image_action=BlobIndexerImageAction.GENERATE_NORMALIZED_IMAGE_PER_PAGE,
                         query_timeout=None,
-                    )
+                    ),
                 )
             else:
                 indexer_parameters = IndexingParameters(
+                    batch_size=self.indexer_batch_size,
                     configuration=IndexingParametersConfiguration(
                         parsing_mode="default", indexing_storage_metadata=True
-                    )
+                    ),
                 )
 
             indexer = SearchIndexer(
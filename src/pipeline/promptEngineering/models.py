@@ -89,3 +89,19 @@ class ClinicalInformation(BaseModel):
     treatment_request: TreatmentRequest = Field(
         default_factory=TreatmentRequest, alias="treatment_request"
     )
+
+
+class CombinedExtraction(BaseModel):
+    """
+    Represents the envelope returned by the combined patient/physician/clinical NER call.
+    """
+
+    patient: PatientInformation = Field(
+        default_factory=PatientInformation, alias="patient"
+    )
+    physician: PhysicianInformation = Field(
+        default_factory=PhysicianInformation, alias="physician"
+    )
+    clinical: ClinicalInformation = Field(
+        default_factory=ClinicalInformation, alias="clinical"
+    )
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from typing import Any, Dict, List
 
 from jinja2 import Environment, FileSystemLoader
@@ -9,6 +10,29 @@ from utils.ml_logging import get_logger
 logger = get_logger()
 
 
+@lru_cache(maxsize=None)
+def _get_environment(template_path: str) -> Environment:
+    """
+    Return the Jinja2 environment for `template_path`, shared by every PromptManager.
+
+    Sharing the environment means each template is read and compiled once per process
+    instead of once per PromptManager instance.
+    """
+    env = Environment(
+        loader=FileSystemLoader(searchpath=template_path), autoescape=False
+    )
+    logger.info(f"Templates found: {env.list_templates()}")
+    return env
+
+
+@lru_cache(maxsize=None)
+def _render_static(template_path: str, template_name: str) -> str:
+    """
+    Render a template that takes no context variables, caching the result.
+    """
+    return _get_environment(template_path).get_template(template_name).render()
+
+
 class PromptManager:
     def __init__(self, template_dir: str = "templates"):
         """
@@ -18,19 +42,16 @@ class PromptManager:
             template_dir (str): The directory containing the Jinja2 templates.
         """
         current_dir = os.path.dirname(os.path.abspath(__file__))
-        template_path = os.path.join(current_dir, template_dir)
-
-        self.env = Environment(
-            loader=FileSystemLoader(searchpath=template_path), autoescape=False
-        )
-
-        templates = self.env.list_templates()
-        print(f"Templates found: {templates}")
+        self.template_path = os.path.join(current_dir, template_dir)
+        self.env = _get_environment(self.template_path)
 
     def get_prompt(self, template_name: str, **kwargs) -> str:
         """
         Render a template with the given context.
 
+        Templates rendered without context (e.g. system prompts) are cached after the first
+        render; call `PromptManager.clear_cache()` after editing templates on disk.
+
         Args:
             template_name (str): The name of the template file.
             **kwargs: The context variables to render the template with.
@@ -39,11 +60,21 @@ class PromptManager:
             str: The rendered template as a string.
         """
         try:
+            if not kwargs:
+                return _render_static(self.template_path, template_name)
             template = self.env.get_template(template_name)
             return template.render(**kwargs)
         except Exception as e:
             raise ValueError(f"Error rendering template '{template_name}': {e}")
 
+    @staticmethod
+    def clear_cache() -> None:
+        """
+        Drop cached environments and rendered prompts so templates are reloaded from disk.
+        """
+        _render_static.cache_clear()
+        _get_environment.cache_clear()
+
     def create_prompt_pa(
         self,
         patient_info: BaseModel,
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from typing import Any, Dict
 
 import yaml
@@ -8,11 +9,17 @@ from utils.ml_logging import get_logger
 # Set up logging
 logger = get_logger()
 
+# libyaml-backed loader when PyYAML was built with it, several times faster to parse
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def load_config(config_file: str = "config.yaml") -> Dict[str, Any]:
     """
     Safely loads the YAML configuration file.
 
+    Each file is parsed once per process; later calls return the same dictionary, which
+    callers must treat as read-only.
+
     Args:
         config_file (str): Relative or absolute path to the YAML configuration file.
                            Defaults to "config.yaml".
@@ -25,13 +32,21 @@ def load_config(config_file: str = "config.yaml") -> Dict[str, Any]:
         base_dir = os.path.dirname(__file__)
         config_file = os.path.abspath(os.path.join(base_dir, config_file))
 
+    return _load_config_file(config_file)
+
+
+@lru_cache(maxsize=8)
+def _load_config_file(config_file: str) -> Dict[str, Any]:
+    """
+    Parse the YAML configuration file at the absolute path `config_file`.
+    """
     if not os.path.exists(config_file):
         logger.error(f"Configuration file not found: {config_file}")
         return {}
 
     try:
         with open(config_file, "r", encoding="utf-8") as file:
-            data = yaml.safe_load(file)
+            data = yaml.load(file, Loader=_YAML_LOADER)
             if not data:
                 logger.warning(
                     f"Configuration file is empty or invalid YAML: {config_file}"
@@ -1,5 +1,6 @@
+import asyncio
 import os
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from urllib.parse import urlparse
 
 from azure.core.credentials import AzureNamedKeyCredential
@@ -159,6 +160,7 @@ class AzureBlobManager:
         remote_blob_path: str,
         overwrite: bool = False,
         extension: Optional[str] = None,
+        max_concurrency: int = 1,
     ) -> None:
         """
         Uploads a single file or all files with a specific extension to Azure Blob Storage.
@@ -168,6 +170,7 @@ class AzureBlobManager:
             remote_blob_path (str): The destination path in the blob storage.
             overwrite (bool, optional): Whether to overwrite existing blobs. Defaults to False.
             extension (Optional[str], optional): File extension to filter files for upload. If provided, all files with this extension in the directory will be uploaded.
+            max_concurrency (int, optional): Parallel block uploads per file. Defaults to 1.
         """
         if not self.container_client:
             logger.error("Container client is not initialized.")
@@ -175,13 +178,46 @@ class AzureBlobManager:
 
         if extension:
             self._upload_files_with_extension(
-                local_file_path, remote_blob_path, extension, overwrite
+                local_file_path, remote_blob_path, extension, overwrite, max_concurrency
             )
         else:
-            self._upload_single_file(local_file_path, remote_blob_path, overwrite)
+            self._upload_single_file(
+                local_file_path, remote_blob_path, overwrite, max_concurrency
+            )
+
+    async def upload_file_async(
+        self,
+        local_file_path: str,
+        remote_blob_path: str,
+        overwrite: bool = False,
+        extension: Optional[str] = None,
+        max_concurrency: int = 16,
+    ) -> None:
+        """
+        Asynchronous counterpart of `upload_file`, run in a worker thread so uploads overlap.
+
+        Args:
+            local_file_path (str): Path to the local file or directory to upload.
+            remote_blob_path (str): The destination path in the blob storage.
+            overwrite (bool, optional): Whether to overwrite existing blobs. Defaults to False.
+            extension (Optional[str], optional): File extension to filter files for upload.
+            max_concurrency (int, optional): Parallel block uploads per file. Defaults to 16.
+        """
+        await asyncio.to_thread(
+            self.upload_file,
+            local_file_path,
+            remote_blob_path,
+            overwrite=overwrite,
+            extension=extension,
+            max_concurrency=max_concurrency,
+        )
 
     def _upload_single_file(
-        self, local_file_path: str, remote_blob_path: str, overwrite: bool
+        self,
+        local_file_path: str,
+        remote_blob_path: str,
+        overwrite: bool,
+        max_concurrency: int = 1,
     ) -> None:
         """
         Uploads a single file to Azure Blob Storage.
@@ -190,6 +226,7 @@ class AzureBlobManager:
             local_file_path (str): Path to the local file to upload.
             remote_blob_path (str): The destination path in the blob storage.
             overwrite (bool): Whether to overwrite existing blobs.
+            max_concurrency (int): Parallel block uploads for the file.
         """
         if not self._check_file_exists_and_permissions(local_file_path):
             return
@@ -197,7 +234,9 @@ class AzureBlobManager:
         try:
             blob_client = self.container_client.get_blob_client(remote_blob_path)
             with open(local_file_path, "rb") as data:
-                blob_client.upload_blob(data, overwrite=overwrite)
+                blob_client.upload_blob(
+                    data, overwrite=overwrite, max_concurrency=max_concurrency
+                )
             logger.info(
                 f"File '{local_file_path}' uploaded to blob '{remote_blob_path}' successfully."
             )
@@ -213,6 +252,7 @@ class AzureBlobManager:
         remote_blob_path: str,
         extension: str,
         overwrite: bool,
+        max_concurrency: int = 1,
     ) -> None:
         """
         Uploads all files with a specific extension from a directory to Azure Blob Storage.
@@ -222,6 +262,7 @@ class AzureBlobManager:
             remote_blob_path (str): The destination path in the blob storage.
             extension (str): File extension to filter files for upload.
             overwrite (bool): Whether to overwrite existing blobs.
+            max_concurrency (int): Parallel block uploads per file.
         """
         if not os.path.isdir(directory_path):
             logger.error(f"Directory '{directory_path}' does not exist.")
@@ -241,7 +282,11 @@ class AzureBlobManager:
                     try:
                         blob_client = self.container_client.get_blob_client(blob_path)
                         with open(file_path, "rb") as data:
-                            blob_client.upload_blob(data, overwrite=overwrite)
+                            blob_client.upload_blob(
+                                data,
+                                overwrite=overwrite,
+                                max_concurrency=max_concurrency,
+                            )
                         logger.info(
                             f"File '{file_path}' uploaded to blob '{blob_path}' successfully."
                         )
@@ -314,6 +359,47 @@ class AzureBlobManager:
             logger.error(f"Failed to download blob '{remote_blob_path}': {e}")
             return None
 
+    def get_blob_etag(self, remote_blob_path: str) -> Optional[str]:
+        """
+        Gets the ETag of a blob, which changes whenever the blob content is rewritten.
+
+        Args:
+            remote_blob_path (str): The path to the blob in the container or the full blob URL.
+
+        Returns:
+            Optional[str]: The blob ETag, or None if an error occurred.
+        """
+        try:
+            blob_client = self._get_blob_client(remote_blob_path)
+            return blob_client.get_blob_properties().etag
+        except Exception as e:
+            logger.error(f"Failed to get properties of blob '{remote_blob_path}': {e}")
+            return None
+
+    async def download_blob_to_stream(
+        self, remote_blob_path: str, max_concurrency: int = 16
+    ) -> AsyncIterator[bytes]:
+        """
+        Downloads a blob from Azure Blob Storage as a stream of byte chunks.
+
+        Only one chunk is held in memory at a time; the sync client runs in a worker thread.
+
+        Args:
+            remote_blob_path (str): The path to the blob in the container or the full blob URL.
+            max_concurrency (int, optional): Parallel range requests for the download. Defaults to 16.
+
+        Yields:
+            bytes: Successive chunks of the blob content.
+        """
+        blob_client = self._get_blob_client(remote_blob_path)
+        downloader = await asyncio.to_thread(
+            blob_client.download_blob, max_concurrency=max_concurrency
+        )
+        chunks = downloader.chunks()
+        while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+            yield chunk
+        logger.info(f"Streamed blob '{blob_client.blob_name}'.")
+
     def _get_blob_client(self, remote_blob_path: str) -> BlobClient:
         """
         Gets a BlobClient for the specified blob path or URL.
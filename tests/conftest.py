@@ -6,9 +6,41 @@ In VSCode, Code Coverage is recorded in config.xml. Delete this file to reset re
 
 from __future__ import annotations
 
+import importlib
+import logging
+
 import pytest
 from _pytest.nodes import Item
 
+# Azure client and credential constructors each module calls when it is not given a client
+AZURE_CLIENT_FACTORIES = {
+    "src.documentintelligence.document_intelligence_helper": ["AzureBlobManager"],
+    "src.pipeline.agenticRag.run": [
+        "AzureKeyCredential",
+        "AzureOpenAIManager",
+        "SearchClient",
+        "AzureBlobManager",
+        "AzureDocumentIntelligenceManager",
+    ],
+    "src.pipeline.autoDetermination.run": ["AzureOpenAIManager"],
+    "src.pipeline.clinicalExtractor.run": ["AzureOpenAIManager"],
+    "src.pipeline.paprocessing.run": [
+        "AzureOpenAIManager",
+        "SearchClient",
+        "AzureBlobManager",
+        "AzureDocumentIntelligenceManager",
+        "CosmosDBMongoCoreManager",
+    ],
+}
+
+
+class FakeAzureClient:
+    """Stands in for an Azure client, recording the arguments it was built with."""
+
+    def __init__(self, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+
 
 def pytest_collection_modifyitems(items: list[Item]):
     for item in items:
@@ -22,3 +54,22 @@ def pytest_collection_modifyitems(items: list[Item]):
 def unit_test_mocks(monkeypatch: None):
     """Include Mocks here to execute all commands offline and fast."""
     pass
+
+
+@pytest.fixture
+def offline_azure(monkeypatch):
+    """
+    Lets components be built through `__init__` without tracing or Azure connections.
+
+    `get_logger` and the Azure client constructors are replaced in every module that
+    calls them, so a component keeps its real configuration wiring and gets a
+    FakeAzureClient for each client it is not given.
+    """
+    logger = logging.getLogger("tests")
+    for module_name, factory_names in AZURE_CLIENT_FACTORIES.items():
+        module = importlib.import_module(module_name)
+        monkeypatch.setattr(module, "get_logger", lambda *args, **kwargs: logger)
+        for factory_name in factory_names:
+            monkeypatch.setattr(module, factory_name, FakeAzureClient)
+    monkeypatch.delenv("AZURE_OPENAI_CHAT_DEPLOYMENT_FAST", raising=False)
+    return FakeAzureClient
@@ -0,0 +1,82 @@
+import asyncio
+
+from src.aoai.aoai_helper import AIMDLimiter
+
+
+def test_acquire_and_release_track_in_flight():
+    async def scenario():
+        limiter = AIMDLimiter(initial_limit=2)
+        await limiter.acquire()
+        await limiter.acquire()
+        assert (limiter.in_flight, limiter.headroom) == (2, 0)
+        await limiter.release(ok=True)
+        assert limiter.in_flight == 1
+        assert limiter.last_acquired > 0
+
+    asyncio.run(scenario())
+
+
+def test_acquire_waits_for_a_free_slot():
+    async def scenario():
+        limiter = AIMDLimiter(initial_limit=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        await limiter.release(ok=True)
+        await asyncio.wait_for(waiter, timeout=1)
+        assert limiter.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_success_increases_limit_additively():
+    async def scenario():
+        limiter = AIMDLimiter(initial_limit=2, max_limit=10, alpha=1.0)
+        for _ in range(4):
+            await limiter.acquire()
+            await limiter.release(ok=True)
+        assert limiter.limit == 3
+
+    asyncio.run(scenario())
+
+
+def test_throttling_decreases_limit_multiplicatively():
+    async def scenario():
+        limiter = AIMDLimiter(initial_limit=8, beta=0.5)
+        await limiter.acquire()
+        await limiter.release(ok=False)
+        assert limiter.limit == 4
+        for _ in range(5):
+            await limiter.acquire()
+            await limiter.release(ok=False)
+        assert limiter.limit == limiter.min_limit
+
+    asyncio.run(scenario())
+
+
+def test_remaining_requests_header_caps_limit():
+    async def scenario():
+        limiter = AIMDLimiter(initial_limit=10)
+        await limiter.acquire()
+        await limiter.release(ok=True, headers={"x-ratelimit-remaining-requests": "3"})
+        assert limiter.limit == 3
+
+    asyncio.run(scenario())
+
+
+def test_exhausted_or_invalid_remaining_requests_header():
+    async def scenario():
+        limiter = AIMDLimiter(initial_limit=10)
+        await limiter.acquire()
+        await limiter.release(ok=True, headers={"x-ratelimit-remaining-requests": "0"})
+        assert limiter.limit == limiter.min_limit
+
+        limiter = AIMDLimiter(initial_limit=10, alpha=0.0)
+        await limiter.acquire()
+        await limiter.release(
+            ok=True, headers={"x-ratelimit-remaining-requests": "unknown"}
+        )
+        assert limiter.limit == 10
+
+    asyncio.run(scenario())
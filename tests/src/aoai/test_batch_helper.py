@@ -0,0 +1,204 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.aoai.batch_helper import AzureOpenAIBatchQueue
+
+
+def completion_body(content):
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content},
+            }
+        ],
+    }
+
+
+def make_queue(results_for, **kwargs):
+    """
+    Queue whose jobs are answered by `results_for(requests)` instead of the Batch API.
+    """
+    queue = AzureOpenAIBatchQueue(client_factory=None, window=0.01, **kwargs)
+    queue.jobs = []
+
+    async def execute(requests):
+        queue.jobs.append(requests)
+        return results_for(requests)
+
+    queue._execute = execute
+    return queue
+
+
+def succeed_all(requests):
+    return {
+        custom_id: {
+            "custom_id": custom_id,
+            "response": {
+                "status_code": 200,
+                "body": completion_body(body["messages"][0]["content"]),
+            },
+        }
+        for custom_id, body, _ in requests
+    }
+
+
+def ask(queue, content, **kwargs):
+    return queue.submit(
+        "gpt-4o", messages=[{"role": "user", "content": content}], **kwargs
+    )
+
+
+def test_requests_within_the_window_share_one_job():
+    queue = make_queue(succeed_all)
+
+    async def scenario():
+        return await asyncio.gather(*(ask(queue, str(i)) for i in range(3)))
+
+    completions = asyncio.run(scenario())
+
+    assert [c.choices[0].message.content for c in completions] == ["0", "1", "2"]
+    assert len(queue.jobs) == 1
+    assert len(queue.jobs[0]) == 3
+
+
+def test_requests_after_the_window_start_a_new_job():
+    queue = make_queue(succeed_all)
+
+    async def scenario():
+        await ask(queue, "first")
+        await ask(queue, "second")
+
+    asyncio.run(scenario())
+
+    assert len(queue.jobs) == 2
+
+
+def test_max_requests_submits_without_waiting_for_the_window():
+    queue = make_queue(succeed_all, max_requests=2)
+    queue.window = 60
+
+    async def scenario():
+        return await asyncio.wait_for(
+            asyncio.gather(ask(queue, "a"), ask(queue, "b")), timeout=1
+        )
+
+    assert len(asyncio.run(scenario())) == 2
+
+
+def test_request_body_drops_stream_and_none_values():
+    queue = make_queue(succeed_all, deployment="gpt-4o-batch")
+
+    asyncio.run(ask(queue, "hi", stream=False, tools=None, temperature=0))
+
+    _, body, _ = queue.jobs[0][0]
+    assert body == {
+        "model": "gpt-4o-batch",
+        "messages": [{"role": "user", "content": "hi"}],
+        "temperature": 0,
+    }
+
+
+def test_failed_and_missing_records_raise():
+    def fail_first(requests):
+        custom_id = requests[0][0]
+        return {
+            custom_id: {
+                "custom_id": custom_id,
+                "response": {"status_code": 400, "body": {"error": "bad request"}},
+            }
+        }
+
+    queue = make_queue(fail_first)
+
+    async def scenario():
+        return await asyncio.gather(
+            ask(queue, "a"), ask(queue, "b"), return_exceptions=True
+        )
+
+    failed, missing = asyncio.run(scenario())
+
+    assert isinstance(failed, RuntimeError) and "bad request" in str(failed)
+    assert isinstance(missing, RuntimeError)
+
+
+def test_job_failure_fails_every_request():
+    def raise_error(requests):
+        raise RuntimeError("job expired")
+
+    queue = make_queue(raise_error)
+
+    async def scenario():
+        return await asyncio.gather(
+            ask(queue, "a"), ask(queue, "b"), return_exceptions=True
+        )
+
+    assert [str(e) for e in asyncio.run(scenario())] == ["job expired"] * 2
+
+
+def test_execute_uploads_polls_and_collects_results():
+    uploaded = {}
+    statuses = iter(["in_progress", "completed"])
+
+    async def create_file(file, purpose):
+        uploaded["lines"] = [json.loads(line) for line in file[1].splitlines()]
+        return SimpleNamespace(id="file-in")
+
+    def batch(status):
+        return SimpleNamespace(
+            id="batch-1",
+            status=status,
+            output_file_id="file-out",
+            error_file_id=None,
+            errors=None,
+        )
+
+    async def create_batch(**kwargs):
+        return batch("validating")
+
+    async def retrieve_batch(batch_id):
+        return batch(next(statuses))
+
+    async def file_content(file_id):
+        lines = [
+            json.dumps({"custom_id": line["custom_id"], "response": {}})
+            for line in uploaded["lines"]
+        ]
+        return SimpleNamespace(text="\n".join(lines) + "\n")
+
+    client = SimpleNamespace(
+        files=SimpleNamespace(create=create_file, content=file_content),
+        batches=SimpleNamespace(create=create_batch, retrieve=retrieve_batch),
+    )
+    queue = AzureOpenAIBatchQueue(lambda: client, poll_initial=0, poll_max=0)
+    requests = [("req-1", {"model": "gpt-4o"}, None)]
+
+    results = asyncio.run(queue._execute(requests))
+
+    assert uploaded["lines"][0]["url"] == "/chat/completions"
+    assert list(results) == ["req-1"]
+
+
+def test_execute_raises_when_the_job_fails():
+    async def create_batch(**kwargs):
+        return SimpleNamespace(id="batch-1", status="failed", errors="quota")
+
+    async def create_file(file, purpose):
+        return SimpleNamespace(id="file-in")
+
+    client = SimpleNamespace(
+        files=SimpleNamespace(create=create_file),
+        batches=SimpleNamespace(create=create_batch),
+    )
+    queue = AzureOpenAIBatchQueue(lambda: client)
+
+    with pytest.raises(RuntimeError, match="failed"):
+        asyncio.run(queue._execute([("req-1", {"model": "gpt-4o"}, None)]))
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from src.aoai.aoai_helper import AzureOpenAIManager
+
+ENDPOINTS = ["https://east.openai.azure.com", "https://west.openai.azure.com"]
+
+
+def make_manager(**kwargs):
+    return AzureOpenAIManager(
+        api_version="2024-10-21",
+        azure_endpoints=ENDPOINTS,
+        chat_model_name="gpt-4o",
+        **kwargs,
+    )
+
+
+def client_keys(manager):
+    async def scenario():
+        return [
+            manager.get_async_azure_openai_client(endpoint).api_key
+            for endpoint in ENDPOINTS
+        ]
+
+    return asyncio.run(scenario())
+
+
+def test_each_endpoint_uses_its_own_key():
+    manager = make_manager(api_keys=["east-key", "west-key"])
+
+    assert client_keys(manager) == ["east-key", "west-key"]
+    assert manager.openai_client.api_key == "east-key"
+
+
+def test_shared_key_is_used_without_endpoint_keys():
+    manager = make_manager(api_key="shared-key")
+
+    assert client_keys(manager) == ["shared-key", "shared-key"]
+
+
+def test_key_count_must_match_the_endpoints():
+    with pytest.raises(ValueError):
+        make_manager(api_keys=["east-key"])
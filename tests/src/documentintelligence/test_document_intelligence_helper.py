@@ -0,0 +1,147 @@
+import io
+import json
+
+import pytest
+from azure.ai.documentintelligence import models
+
+from src.documentintelligence.document_intelligence_helper import (
+    AzureDocumentIntelligenceManager,
+    _merge_results,
+    _page_ranges,
+    _parse_analyze_result_stream,
+)
+
+
+@pytest.fixture
+def manager(offline_azure, tmp_path):
+    return AzureDocumentIntelligenceManager(
+        azure_endpoint="https://example.cognitiveservices.azure.com",
+        azure_key="key",
+        cache_dir=str(tmp_path),
+    )
+
+
+def test_page_ranges_splits_into_slices():
+    assert _page_ranges(101, 50) == ["1-50", "51-100", "101"]
+
+
+def test_page_ranges_single_slice():
+    assert _page_ranges(3, 50) == ["1-3"]
+
+
+def test_merge_results_joins_content_and_concatenates_items():
+    results = [
+        models.AnalyzeResult({"content": "first", "pages": [{"pageNumber": 1}]}),
+        models.AnalyzeResult({"content": "second", "pages": [{"pageNumber": 1}]}),
+        models.AnalyzeResult({"content": None}),
+    ]
+
+    merged = _merge_results(results)
+
+    assert merged.content == "first\nsecond\n"
+    assert len(merged.pages) == 2
+    assert merged.tables is None
+
+
+def test_parse_analyze_result_stream_keeps_content_and_fields():
+    body = {
+        "status": "succeeded",
+        "analyzeResult": {
+            "content": "Invoice 42",
+            "pages": [{"pageNumber": 1, "words": [{"content": "Invoice"}]}],
+            "documents": [
+                {"fields": {"InvoiceId": {"content": "42", "confidence": 0.9}}},
+                {"fields": {"InvoiceId": {"content": "43", "confidence": 0.8}}},
+            ],
+        },
+    }
+
+    status, content, documents_fields = _parse_analyze_result_stream(
+        io.BytesIO(json.dumps(body).encode())
+    )
+
+    assert status == "succeeded"
+    assert content == "Invoice 42"
+    assert [fields["InvoiceId"]["content"] for fields in documents_fields] == [
+        "42",
+        "43",
+    ]
+
+
+def test_parse_analyze_result_stream_stops_while_running():
+    body = {"status": "running", "analyzeResult": {"content": "partial"}}
+
+    status, content, documents_fields = _parse_analyze_result_stream(
+        io.BytesIO(json.dumps(body).encode())
+    )
+
+    assert (status, content, documents_fields) == ("running", None, [])
+
+
+def test_cache_key_disabled_without_cache_dir(manager):
+    manager.cache_dir = None
+
+    assert manager._cache_key(b"pdf", "prebuilt-layout", None, None, None) is None
+
+
+def test_cache_key_depends_on_every_option(manager):
+    base = manager._cache_key(b"pdf", "prebuilt-layout", None, None, None)
+    variants = [
+        manager._cache_key(b"other", "prebuilt-layout", None, None, None),
+        manager._cache_key(b"pdf", "prebuilt-read", None, None, None),
+        manager._cache_key(b"pdf", "prebuilt-layout", ["BARCODES"], None, None),
+        manager._cache_key(b"pdf", "prebuilt-layout", None, "1-2", None),
+        manager._cache_key(b"pdf", "prebuilt-layout", None, None, "markdown"),
+        manager._cache_key(b"pdf", "prebuilt-layout", None, None, None, locale="en-US"),
+        manager._cache_key(
+            b"pdf",
+            "prebuilt-layout",
+            None,
+            None,
+            None,
+            string_index_type="UTF16_CODE_UNIT",
+        ),
+        manager._cache_key(
+            b"pdf", "prebuilt-layout", None, None, None, query_fields=["Total"]
+        ),
+        manager._cache_key(
+            b"pdf",
+            "prebuilt-layout",
+            None,
+            None,
+            None,
+            extra_options={"model_version": "1"},
+        ),
+    ]
+
+    assert len({base, *variants}) == len(variants) + 1
+
+
+def test_cache_key_ignores_query_field_order(manager):
+    assert manager._cache_key(
+        b"pdf", "prebuilt-layout", None, None, None, query_fields=["A", "B"]
+    ) == manager._cache_key(
+        b"pdf", "prebuilt-layout", None, None, None, query_fields=["B", "A"]
+    )
+
+
+def test_cache_round_trip(manager):
+    cache_key = manager._cache_key(b"pdf", "prebuilt-layout", None, None, None)
+    manager._write_cache(cache_key, models.AnalyzeResult({"content": "cached"}))
+
+    assert manager._read_cache(cache_key).content == "cached"
+
+
+@pytest.mark.parametrize("polling_interval, expected", [(None, 7), (0, 0), (2, 2)])
+def test_polling_interval_defaults_only_when_unset(
+    offline_azure, monkeypatch, polling_interval, expected
+):
+    monkeypatch.setenv("AZURE_DI_POLL_INTERVAL", "7")
+
+    manager = AzureDocumentIntelligenceManager(
+        azure_endpoint="https://example.cognitiveservices.azure.com",
+        azure_key="key",
+        polling_interval=polling_interval,
+    )
+
+    assert manager.polling_interval == expected
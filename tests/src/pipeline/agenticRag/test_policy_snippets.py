@@ -0,0 +1,59 @@
+import pytest
+
+from src.pipeline.agenticRag.run import AgenticRAG
+
+
+class FakeSearchClient:
+    def __init__(self, results):
+        self.results = results
+        self.searches = []
+
+    def search(self, **kwargs):
+        self.searches.append(kwargs)
+        return iter(self.results)
+
+
+@pytest.fixture
+def search_client():
+    return FakeSearchClient([])
+
+
+@pytest.fixture
+def rag(offline_azure, search_client):
+    return AgenticRAG(search_client=search_client)
+
+
+def test_policy_path_quotes_are_escaped_in_the_filter(rag, search_client):
+    rag.retrieve_policy_snippets("policies/o'neil's policy.pdf", "query")
+
+    assert (
+        search_client.searches[0]["filter"]
+        == "parent_path eq 'policies/o''neil''s policy.pdf'"
+    )
+
+
+def test_snippets_are_returned_in_page_order(rag, search_client):
+    search_client.results = [
+        {"page_number": "10", "chunk_id": "a", "chunk": "page ten"},
+        {"page_number": None, "chunk_id": "a", "chunk": "no page"},
+        {"page_number": "2", "chunk_id": "b", "chunk": "page two, second chunk"},
+        {"page_number": "2", "chunk_id": "a", "chunk": "page two, first chunk"},
+        {"page_number": "3", "chunk_id": "a", "chunk": ""},
+    ]
+
+    snippets = rag.retrieve_policy_snippets("policy.pdf", "query")
+
+    assert snippets == [
+        "page two, first chunk",
+        "page two, second chunk",
+        "page ten",
+        "no page",
+    ]
+
+
+def test_explicit_vector_field_overrides_the_config(rag, search_client):
+    rag.retrieve_policy_snippets("policy.pdf", "query", top=2, vector_field="embedding")
+    search = search_client.searches[0]
+
+    assert search["top"] == 2
+    assert search["vector_queries"][0].fields == "embedding"
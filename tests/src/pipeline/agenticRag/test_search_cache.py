@@ -0,0 +1,52 @@
+import pytest
+
+from src.pipeline.agenticRag import run as agentic_rag
+from src.pipeline.agenticRag.run import AgenticRAG
+
+
+@pytest.fixture
+def rag(offline_azure, monkeypatch):
+    monkeypatch.setattr(agentic_rag, "_SEARCH_CACHE", agentic_rag.OrderedDict())
+    rag = AgenticRAG()
+    monkeypatch.setitem(rag.policy_retrieval_config, "cache_ttl_seconds", 60)
+    monkeypatch.setitem(rag.policy_retrieval_config, "cache_size", 2)
+    return rag
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(agentic_rag.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_cached_results_are_returned(rag, clock):
+    rag._set_cached_search(("query",), "results")
+
+    assert rag._get_cached_search(("query",)) == "results"
+    assert rag._get_cached_search(("other",)) is None
+
+
+def test_expired_results_are_dropped(rag, clock):
+    rag._set_cached_search(("query",), "results")
+    clock[0] += 61
+
+    assert rag._get_cached_search(("query",)) is None
+    assert ("query",) not in agentic_rag._SEARCH_CACHE
+
+
+def test_least_recently_used_entry_is_evicted(rag, clock):
+    rag._set_cached_search(("first",), "1")
+    rag._set_cached_search(("second",), "2")
+    rag._get_cached_search(("first",))
+    rag._set_cached_search(("third",), "3")
+
+    assert list(agentic_rag._SEARCH_CACHE) == [("first",), ("third",)]
+
+
+@pytest.mark.parametrize("setting", ["cache_ttl_seconds", "cache_size"])
+def test_zero_setting_disables_the_cache(rag, clock, monkeypatch, setting):
+    monkeypatch.setitem(rag.policy_retrieval_config, setting, 0)
+    rag._set_cached_search(("query",), "results")
+
+    assert rag._get_cached_search(("query",)) is None
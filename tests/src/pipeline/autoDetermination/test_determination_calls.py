@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from src.aoai.aoai_helper import LLMResult
+from src.pipeline.autoDetermination.run import AutoPADeterminator
+
+
+class FakeChatClient:
+    def __init__(self):
+        self.calls = []
+
+    async def generate_chat_response(self, **kwargs):
+        self.calls.append(kwargs)
+        return LLMResult("Approved", [])
+
+
+pytestmark = pytest.mark.usefixtures("offline_azure")
+
+
+def make_determinator(**kwargs):
+    return AutoPADeterminator(
+        azure_openai_client=FakeChatClient(),
+        azure_openai_client_o1=FakeChatClient(),
+        caseId="001",
+        **kwargs,
+    )
+
+
+def test_zero_penalties_are_left_out_of_the_request():
+    determinator = make_determinator(frequency_penalty=0.0, presence_penalty=0.0)
+
+    assert "frequency_penalty" not in determinator._determination_kwargs
+    assert "presence_penalty" not in determinator._determination_kwargs
+
+
+def test_penalty_overrides_are_sent():
+    determinator = make_determinator(
+        frequency_penalty=0.4, determination_max_tokens=800
+    )
+
+    assert determinator._determination_kwargs["frequency_penalty"] == 0.4
+    assert determinator._determination_kwargs["max_tokens"] == 800
+
+
+def test_determine_sends_the_shared_settings():
+    determinator = make_determinator()
+
+    async def scenario():
+        await determinator._determine("prompt one")
+        await determinator._determine("prompt two", on_token=print)
+
+    asyncio.run(scenario())
+    first, second = determinator.azure_openai_client.calls
+
+    assert first["query"] == "prompt one"
+    assert first["stream"] is False and second["stream"] is True
+    assert second["on_token"] is print
+    assert first["raise_transient"] is True
+    assert first["max_retries"] == 0
+    for name, value in determinator._determination_kwargs.items():
+        assert first[name] == second[name] == value
+    assert first["conversation_history"] == []
+    assert first["conversation_history"] is not second["conversation_history"]
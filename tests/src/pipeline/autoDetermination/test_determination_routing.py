@@ -0,0 +1,243 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+from tenacity import wait_none
+
+from src.aoai.aoai_helper import LLMResult
+from src.pipeline.autoDetermination import run as auto_determination
+from src.pipeline.autoDetermination.run import AutoPADeterminator
+from src.pipeline.promptEngineering.models import (
+    ClinicalInformation,
+    PatientInformation,
+    PhysicianInformation,
+)
+
+REQUEST = httpx.Request("POST", "https://example.openai.azure.com")
+POLICY_TEXT = "Coverage criteria. " * 50
+CLINICAL_INFO = ClinicalInformation(
+    diagnosis="Crohn's disease",
+    icd_10_code="K50.90",
+    prior_treatments_and_results="Failed mesalamine",
+)
+
+
+def connection_error():
+    return openai.APIConnectionError(request=REQUEST)
+
+
+def context_length_error():
+    return openai.BadRequestError(
+        "maximum context length exceeded",
+        response=httpx.Response(400, request=REQUEST),
+        body={"code": "context_length_exceeded"},
+    )
+
+
+class ScriptedChatClient:
+    """Returns, or raises, the next scripted outcome on each call."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    async def generate_chat_response(self, **kwargs):
+        self.calls.append(kwargs)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    generate_chat_response_o1 = generate_chat_response
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(offline_azure, monkeypatch):
+    monkeypatch.setattr(
+        auto_determination, "wait_exponential_jitter", lambda **kwargs: wait_none()
+    )
+
+
+def make_determinator(monkeypatch, four_o=(), o1=(), fast=None):
+    determinator = AutoPADeterminator(
+        azure_openai_client=ScriptedChatClient(*four_o),
+        azure_openai_client_o1=ScriptedChatClient(*o1),
+        azure_openai_client_fast=(
+            ScriptedChatClient(*fast) if fast is not None else None
+        ),
+        caseId="001",
+    )
+    monkeypatch.setattr(determinator, "exceeds_token_budget", lambda *args: False)
+    return determinator
+
+
+def run_determination(determinator, clinical_info=CLINICAL_INFO, use_o1=False):
+    summarized = []
+
+    async def summarize_policy(policy_text):
+        summarized.append(policy_text)
+        return "Summarized criteria."
+
+    determination, _ = asyncio.run(
+        determinator.run(
+            PatientInformation(),
+            PhysicianInformation(),
+            clinical_info,
+            POLICY_TEXT,
+            summarize_policy,
+            use_o1=use_o1,
+        )
+    )
+    return determination, summarized
+
+
+@pytest.mark.parametrize(
+    "outcome",
+    [
+        None,
+        LLMResult("Approved", []),
+        LLMResult({"confidence": 0.95}, []),
+        LLMResult({"determination": "  ", "confidence": 0.95}, []),
+        LLMResult({"determination": "Approved", "confidence": 0.79}, []),
+        LLMResult({"determination": "Approved", "confidence": "high"}, []),
+        RuntimeError("model unavailable"),
+    ],
+    ids=[
+        "no-response",
+        "not-a-dict",
+        "missing-determination",
+        "blank-determination",
+        "below-threshold",
+        "non-numeric-confidence",
+        "exception",
+    ],
+)
+def test_fast_determination_escalates(monkeypatch, outcome):
+    determinator = make_determinator(monkeypatch, fast=[outcome])
+
+    assert asyncio.run(determinator.generate_fast_determination("prompt")) is None
+
+
+def test_fast_determination_at_the_threshold_is_kept(monkeypatch):
+    determinator = make_determinator(
+        monkeypatch,
+        fast=[LLMResult({"determination": "Approved", "confidence": 0.8}, [])],
+    )
+
+    result = asyncio.run(determinator.generate_fast_determination("prompt"))
+
+    assert result.response == "Approved"
+
+
+def test_insufficient_case_is_answered_without_a_model(monkeypatch):
+    determinator = make_determinator(monkeypatch)
+
+    determination, _ = run_determination(determinator, ClinicalInformation())
+
+    assert "Needs More Information" in determination
+    assert determinator.determination_route == "insufficient_information"
+    assert determinator.azure_openai_client.calls == []
+
+
+def test_confident_fast_model_answers_the_case(monkeypatch):
+    determinator = make_determinator(
+        monkeypatch,
+        fast=[LLMResult({"determination": "Approved", "confidence": 0.9}, [])],
+    )
+
+    determination, _ = run_determination(determinator)
+
+    assert determination == "Approved"
+    assert determinator.determination_route == "fast"
+    assert determinator.azure_openai_client.calls == []
+
+
+def test_unsure_fast_model_escalates_to_4o(monkeypatch):
+    determinator = make_determinator(
+        monkeypatch,
+        four_o=[LLMResult("Denied", [])],
+        fast=[LLMResult({"determination": "Approved", "confidence": 0.4}, [])],
+    )
+
+    determination, _ = run_determination(determinator)
+
+    assert determination == "Denied"
+    assert determinator.determination_route == "4o"
+
+
+def test_o1_answers_when_requested(monkeypatch):
+    determinator = make_determinator(monkeypatch, o1=[LLMResult("Approved", [])])
+
+    determination, _ = run_determination(determinator, use_o1=True)
+
+    assert determination == "Approved"
+    assert determinator.determination_route == "o1"
+    assert determinator.azure_openai_client.calls == []
+
+
+def test_failed_o1_falls_back_to_4o(monkeypatch):
+    determinator = make_determinator(
+        monkeypatch,
+        four_o=[LLMResult("Denied", [])],
+        o1=[RuntimeError("o1 unavailable")],
+    )
+
+    determination, _ = run_determination(determinator, use_o1=True)
+
+    assert determination == "Denied"
+    assert determinator.determination_route == "4o"
+
+
+def test_transient_4o_errors_are_retried(monkeypatch):
+    determinator = make_determinator(
+        monkeypatch,
+        four_o=[connection_error(), connection_error(), LLMResult("Approved", [])],
+    )
+
+    determination, _ = run_determination(determinator)
+
+    assert determination == "Approved"
+    assert len(determinator.azure_openai_client.calls) == 3
+
+
+def test_4o_retries_stop_after_max_attempts(monkeypatch):
+    determinator = make_determinator(
+        monkeypatch, four_o=[connection_error() for _ in range(5)]
+    )
+
+    with pytest.raises(openai.APIConnectionError):
+        run_determination(determinator)
+    assert len(determinator.azure_openai_client.calls) == 3
+    assert determinator.azure_openai_client.calls[0]["max_retries"] == 0
+
+
+def test_other_4o_errors_are_not_retried(monkeypatch):
+    determinator = make_determinator(
+        monkeypatch, four_o=[ValueError("bad request"), LLMResult("Approved", [])]
+    )
+
+    with pytest.raises(ValueError):
+        run_determination(determinator)
+    assert len(determinator.azure_openai_client.calls) == 1
+
+
+@pytest.mark.parametrize("use_o1", [False, True])
+def test_context_length_error_summarizes_the_policy(monkeypatch, use_o1):
+    outcomes = [context_length_error(), LLMResult("Approved", [])]
+    determinator = make_determinator(
+        monkeypatch, **({"o1": outcomes} if use_o1 else {"four_o": outcomes})
+    )
+    client = (
+        determinator.azure_openai_client_o1
+        if use_o1
+        else determinator.azure_openai_client
+    )
+
+    determination, summarized = run_determination(determinator, use_o1=use_o1)
+
+    assert determination == "Approved"
+    assert summarized == [POLICY_TEXT]
+    first, second = client.calls
+    assert "Summarized criteria." not in first["query"]
+    assert "Summarized criteria." in second["query"]
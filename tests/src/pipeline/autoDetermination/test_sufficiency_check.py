@@ -0,0 +1,79 @@
+import pytest
+
+from src.pipeline.autoDetermination.run import AutoPADeterminator, _is_provided
+
+REQUIRED_FIELDS = ["diagnosis", "icd_10_code", "prior_treatments_and_results"]
+POLICY_TEXT = "Coverage criteria. " * 50
+
+
+@pytest.fixture
+def determinator(offline_azure, monkeypatch):
+    determinator = AutoPADeterminator(caseId="001")
+    monkeypatch.setitem(
+        determinator.sufficiency_config, "required_fields", REQUIRED_FIELDS
+    )
+    monkeypatch.setitem(
+        determinator.sufficiency_config, "min_clinical_completeness", 0.5
+    )
+    return determinator
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("Crohn's disease", True),
+        ("  Not Provided ", False),
+        ("N/A", False),
+        ("", False),
+        (None, False),
+        (0, True),
+        (["", "unknown"], False),
+        (["none", "MRI"], True),
+        ({"lab": "n/a", "imaging": {"result": "normal"}}, True),
+        ({"lab": "n/a", "imaging": {"result": ""}}, False),
+    ],
+)
+def test_is_provided(value, expected):
+    assert _is_provided(value) is expected
+
+
+def test_complete_case_goes_to_a_model(determinator):
+    clinical_info = {field: "documented" for field in REQUIRED_FIELDS}
+
+    assert determinator.check_sufficiency(clinical_info, POLICY_TEXT) is None
+
+
+def test_disabled_check_goes_to_a_model(determinator, monkeypatch):
+    monkeypatch.setitem(determinator.sufficiency_config, "enabled", False)
+
+    assert determinator.check_sufficiency({}, "") is None
+
+
+def test_missing_clinical_fields_need_more_information(determinator):
+    clinical_info = {"diagnosis": "documented", "icd_10_code": "Not provided"}
+
+    determination = determinator.check_sufficiency(clinical_info, POLICY_TEXT)
+
+    assert "Needs More Information" in determination
+    assert "- Icd 10 code" in determination
+    assert "- Prior treatments and results" in determination
+    assert "- Diagnosis" not in determination
+    assert "full text of the applicable policy" not in determination
+
+
+def test_short_policy_needs_more_information(determinator):
+    clinical_info = {field: "documented" for field in REQUIRED_FIELDS}
+
+    determination = determinator.check_sufficiency(clinical_info, "Covered.")
+
+    assert "Needs More Information" in determination
+    assert "The retrieved policy text has 8 characters" in determination
+    assert "full text of the applicable policy" in determination
+
+
+@pytest.mark.parametrize("policy_text", ["", "   ", None])
+def test_missing_policy_text_is_an_error(determinator, policy_text):
+    clinical_info = {field: "documented" for field in REQUIRED_FIELDS}
+
+    with pytest.raises(ValueError):
+        determinator.check_sufficiency(clinical_info, policy_text)
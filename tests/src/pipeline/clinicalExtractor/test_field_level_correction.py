@@ -0,0 +1,69 @@
+from typing import List
+
+import pytest
+from pydantic import BaseModel, Field
+
+from src.pipeline.clinicalExtractor.run import ClinicalDataExtractor
+
+
+class Patient(BaseModel):
+    name: str
+    age: int
+    allergies: List[str] = Field(default_factory=list)
+    insurer: str = "Unknown"
+    member_id: str = Field(alias="Member ID")
+
+
+@pytest.fixture
+def extractor(offline_azure):
+    return ClinicalDataExtractor()
+
+
+def test_valid_data_is_returned_unchanged(extractor):
+    data = {
+        "name": "Jane Doe",
+        "age": 42,
+        "allergies": ["penicillin"],
+        "insurer": "Contoso",
+        "Member ID": "A1",
+    }
+
+    patient = extractor.validate_with_field_level_correction(data, Patient)
+
+    assert patient.model_dump(by_alias=True) == data
+
+
+def test_invalid_fields_are_replaced_with_defaults(extractor):
+    data = {
+        "name": None,
+        "age": "forty-two",
+        "allergies": "penicillin",
+        "insurer": ["Contoso"],
+        "Member ID": 7,
+    }
+
+    patient = extractor.validate_with_field_level_correction(data, Patient)
+
+    assert patient.name == "Not provided"
+    assert patient.age == 0
+    assert patient.allergies == []
+    assert patient.insurer == "Unknown"
+    assert patient.member_id == "Not provided"
+
+
+def test_missing_required_fields_are_filled(extractor):
+    patient = extractor.validate_with_field_level_correction({"age": 30}, Patient)
+
+    assert (patient.name, patient.age, patient.member_id) == (
+        "Not provided",
+        30,
+        "Not provided",
+    )
+
+
+def test_input_is_not_modified(extractor):
+    data = {"name": "Jane Doe", "age": "unknown", "Member ID": "A1"}
+
+    extractor.validate_with_field_level_correction(data, Patient)
+
+    assert data["age"] == "unknown"
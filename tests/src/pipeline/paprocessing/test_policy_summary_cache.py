@@ -0,0 +1,81 @@
+import asyncio
+from collections import OrderedDict
+
+import pytest
+
+from src.pipeline.paprocessing import run as paprocessing
+from src.pipeline.paprocessing.run import PAProcessingPipeline
+
+
+class FakeCosmosDBManager:
+    def __init__(self):
+        self.upserts = []
+
+    def read_document(self, query, projection):
+        return None
+
+    def upsert_document(self, document, query):
+        self.upserts.append(document)
+
+
+@pytest.fixture
+def pipeline(offline_azure, monkeypatch):
+    monkeypatch.setattr(paprocessing, "_POLICY_SUMMARY_CACHE", OrderedDict())
+    pipeline = PAProcessingPipeline(caseId="001")
+    pipeline.cosmos_db_manager = FakeCosmosDBManager()
+    pipeline.summary_calls = []
+
+    async def generate_policy_summary(policy_text):
+        pipeline.summary_calls.append(policy_text)
+        await asyncio.sleep(0.01)
+        return f"summary of {policy_text}"
+
+    pipeline._generate_policy_summary = generate_policy_summary
+    return pipeline
+
+
+def test_concurrent_cases_share_one_summarization(pipeline):
+    async def scenario():
+        return await asyncio.gather(
+            *(pipeline.summarize_policy("policy") for _ in range(5))
+        )
+
+    summaries = asyncio.run(scenario())
+
+    assert summaries == ["summary of policy"] * 5
+    assert pipeline.summary_calls == ["policy"]
+    assert len(pipeline.cosmos_db_manager.upserts) == 1
+
+
+def test_cached_summary_skips_the_model(pipeline):
+    async def scenario():
+        await pipeline.summarize_policy("policy")
+        return await pipeline.summarize_policy("policy")
+
+    assert asyncio.run(scenario()) == "summary of policy"
+    assert pipeline.summary_calls == ["policy"]
+
+
+def test_summary_locks_are_released(pipeline):
+    async def scenario():
+        await asyncio.gather(
+            pipeline.summarize_policy("first"), pipeline.summarize_policy("second")
+        )
+        return paprocessing._POLICY_SUMMARY_LOCKS[asyncio.get_running_loop()]
+
+    assert asyncio.run(scenario()) == {}
+    assert pipeline.summary_calls == ["first", "second"]
+
+
+def test_failed_summarization_does_not_keep_the_lock(pipeline):
+    async def failing_summary(policy_text):
+        raise RuntimeError("model unavailable")
+
+    pipeline._generate_policy_summary = failing_summary
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await pipeline.summarize_policy("policy")
+        return paprocessing._POLICY_SUMMARY_LOCKS[asyncio.get_running_loop()]
+
+    assert asyncio.run(scenario()) == {}
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from src.pipeline.paprocessing.run import PAProcessingPipeline
+from src.pipeline.promptEngineering.models import ClinicalInformation
+
+CLINICAL_INFO = ClinicalInformation(diagnosis="Crohn's disease", icd_10_code="K50.90")
+
+
+class FakeAgenticRAG:
+    def __init__(self, snippets=None, error=None):
+        self.snippets = snippets or []
+        self.error = error
+        self.calls = []
+
+    def retrieve_policy_snippets(self, policy_path, query, top=None):
+        self.calls.append((policy_path, query, top))
+        if self.error:
+            raise self.error
+        return self.snippets
+
+
+@pytest.fixture
+def pipeline(offline_azure):
+    pipeline = PAProcessingPipeline(caseId="001")
+    pipeline.blob_reads = []
+
+    async def get_policy_text_from_blob(blob_url):
+        pipeline.blob_reads.append(blob_url)
+        return "full policy"
+
+    pipeline.get_policy_text_from_blob = get_policy_text_from_blob
+    return pipeline
+
+
+def test_snippets_replace_the_full_policy(pipeline):
+    pipeline.agentic_rag = FakeAgenticRAG(snippets=["first", "second"])
+
+    policy_text = asyncio.run(pipeline.get_policy_text("policy.pdf", CLINICAL_INFO))
+
+    assert policy_text == "first\n\n...\n\nsecond"
+    assert pipeline.blob_reads == []
+    assert pipeline.agentic_rag.calls == [("policy.pdf", "Crohn's disease\nK50.90", 5)]
+
+
+@pytest.mark.parametrize(
+    "agentic_rag",
+    [
+        FakeAgenticRAG(),
+        FakeAgenticRAG(error=RuntimeError("parent_path not filterable")),
+    ],
+)
+def test_full_policy_is_used_without_snippets(pipeline, agentic_rag):
+    pipeline.agentic_rag = agentic_rag
+
+    policy_text = asyncio.run(pipeline.get_policy_text("policy.pdf", CLINICAL_INFO))
+
+    assert policy_text == "full policy"
+    assert pipeline.blob_reads == ["policy.pdf"]
+
+
+def test_full_policy_is_used_without_a_query(pipeline):
+    pipeline.agentic_rag = FakeAgenticRAG(snippets=["first"])
+
+    policy_text = asyncio.run(
+        pipeline.get_policy_text("policy.pdf", ClinicalInformation())
+    )
+
+    assert policy_text == "full policy"
+    assert pipeline.agentic_rag.calls == []
+
+
+def test_full_policy_is_used_when_snippets_are_disabled(pipeline, monkeypatch):
+    monkeypatch.setitem(pipeline.policy_snippets_config, "enabled", False)
+    pipeline.agentic_rag = FakeAgenticRAG(snippets=["first"])
+
+    policy_text = asyncio.run(pipeline.get_policy_text("policy.pdf", CLINICAL_INFO))
+
+    assert policy_text == "full policy"
+    assert pipeline.agentic_rag.calls == []
@@ -0,0 +1,55 @@
+import asyncio
+
+from src.aoai.aoai_helper import AzureOpenAIManager
+from src.pipeline.paprocessing.run import PAProcessingPipeline
+
+
+class FakeCosmosDBManager:
+    def __init__(self):
+        self.upserts = []
+        self.bulk_writes = []
+
+    def upsert_document(self, document, query):
+        self.upserts.append((document, query))
+
+    def bulk_upsert_documents(self, operations):
+        self.bulk_writes.append(operations)
+        return len(operations)
+
+
+def test_run_batch_queues_through_a_copy_of_the_chat_client(offline_azure, monkeypatch):
+    azure_openai_client = AzureOpenAIManager(
+        api_key="key",
+        api_version="2024-10-21",
+        azure_endpoint="https://example.openai.azure.com",
+        chat_model_name="gpt-4o",
+    )
+    cosmos_db_manager = FakeCosmosDBManager()
+    pipeline = PAProcessingPipeline()
+    pipeline.azure_openai_client = azure_openai_client
+    pipeline.cosmos_db_manager = cosmos_db_manager
+    clients = []
+
+    async def run(self, uploaded_files, caseId, use_o1, bulk_store):
+        clients.append(self.azure_openai_client)
+        self.results[caseId] = {"files": uploaded_files}
+        self.store_output(bulk=bulk_store)
+
+    monkeypatch.setattr(PAProcessingPipeline, "run", run)
+
+    asyncio.run(pipeline.run_batch({"001": ["a.pdf"], "002": ["b.pdf"]}))
+
+    assert pipeline.results == {
+        "001": {"files": ["a.pdf"]},
+        "002": {"files": ["b.pdf"]},
+    }
+    assert azure_openai_client.batch_queue is None
+    assert clients[0] is clients[1] is not azure_openai_client
+    assert clients[0].batch_queue is not None
+    assert cosmos_db_manager.upserts == []
+    assert cosmos_db_manager.bulk_writes == [
+        [
+            ({"files": ["a.pdf"]}, {"caseId": "001"}),
+            ({"files": ["b.pdf"]}, {"caseId": "002"}),
+        ]
+    ]
@@ -1,6 +1,10 @@
+import atexit
+import copy
 import functools
 import logging
+import logging.handlers
 import os
+import queue
 import time
 from threading import Lock
 from typing import Callable, Optional
@@ -15,6 +19,10 @@ from opentelemetry.sdk.trace.export import BatchSpanProcessor
 _cloud_logging_configured = False
 _logger_cache = {}
 _logger_cache_lock = Lock()
+# Records waiting for a background thread to run their console handlers
+_log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+_log_listener: Optional["_QueueDispatcher"] = None
+_log_listener_lock = Lock()
 
 # Define a custom logging level
 KEYINFO_LEVEL_NUM = 25
@@ -36,6 +44,56 @@ class CustomFormatter(logging.Formatter):
         return super().format(record)
 
 
+class _QueueDispatcher(logging.handlers.QueueListener):
+    """
+    Background thread that hands each queued record to the handler it was queued for.
+    """
+
+    def handle(self, item) -> None:
+        handler, record = item
+        if record.levelno >= handler.level:
+            handler.handle(record)
+
+
+class _QueuedHandler(logging.handlers.QueueHandler):
+    """
+    Queues records for `handler` so that formatting and I/O happen off the calling thread
+    (e.g. the event loop).
+    """
+
+    def __init__(self, handler: logging.Handler):
+        super().__init__(_log_queue)
+        self.handler = handler
+        self.setLevel(handler.level)
+        _start_log_listener()
+
+    def prepare(self, record: logging.LogRecord):
+        # Merge the arguments now, since they may change before the record is handled
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return self.handler, record
+
+
+def _start_log_listener() -> None:
+    """
+    Start the thread that runs queued handlers, and stop it at exit once the queue drains.
+    """
+    global _log_listener
+    with _log_listener_lock:
+        if _log_listener is None:
+            _log_listener = _QueueDispatcher(_log_queue)
+            _log_listener.start()
+            atexit.register(_log_listener.stop)
+
+
+def _has_stream_handler(logger: logging.Logger) -> bool:
+    return any(
+        isinstance(getattr(h, "handler", h), logging.StreamHandler)
+        for h in logger.handlers
+    )
+
+
 def initialize_azure_monitor():
     global _cloud_logging_configured
     if not _cloud_logging_configured:
@@ -45,6 +103,8 @@ def initialize_azure_monitor():
             tracing_exporter_enabled=True,
             metrics_exporter_enabled=True,
         )
+        # The Azure Monitor log handler stays on the calling thread so records pick up
+        # the active span context; its BatchLogRecordProcessor already exports off-thread
         if not isinstance(trace.get_tracer_provider(), TracerProvider):
             tracer_provider = TracerProvider()
             trace.set_tracer_provider(tracer_provider)
@@ -78,12 +138,10 @@ def get_logger(
         if level is not None or logger.level == 0:
             logger.setLevel(level or logging.INFO)
 
-        if include_stream_handler and not any(
-            isinstance(h, logging.StreamHandler) for h in logger.handlers
-        ):
+        if include_stream_handler and not _has_stream_handler(logger):
             sh = logging.StreamHandler()
             sh.setFormatter(formatter)
-            logger.addHandler(sh)
+            logger.addHandler(_QueuedHandler(sh))
 
         if tracing_enabled:
             initialize_azure_monitor()